@@ -0,0 +1,74 @@
+import time
+
+import numpy as np
+
+from kapylan.core.quality_indicator import HyperVolume, WFGHyperVolume
+
+
+def random_front(generator, number_of_points: int, number_of_objectives: int):
+    # points on the unit sphere are non-dominated
+    points = generator.random((number_of_points, number_of_objectives))
+    return points / np.linalg.norm(points, axis=1, keepdims=True)
+
+
+def tied_front(generator, number_of_points: int, number_of_objectives: int):
+    # few distinct values per objective, so there are many ties and duplicates
+    return generator.integers(0, 4, (number_of_points, number_of_objectives)) / 4.0
+
+
+def flat_front(generator, number_of_points: int, number_of_objectives: int):
+    # every objective but two is constant
+    points = random_front(generator, number_of_points, number_of_objectives)
+    points[:, 2:] = 0.5
+    return points
+
+
+def measure(compute, front, repetitions: int = 3):
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        value = compute(front)
+
+    return value, (time.perf_counter() - start) / repetitions
+
+
+if __name__ == "__main__":
+    generator = np.random.default_rng(1)
+
+    print(
+        "{:<8}{:>4}{:>6}{:>14}{:>14}{:>12}{:>12}".format(
+            "front", "M", "N", "Fonseca", "WFG", "Fonseca (s)", "WFG (s)"
+        )
+    )
+
+    for name, create_front in [
+        ("random", random_front),
+        ("tied", tied_front),
+        ("flat", flat_front),
+    ]:
+        for number_of_objectives, number_of_points in [
+            (4, 100),
+            (5, 100),
+            (6, 60),
+            (7, 40),
+            (8, 30),
+        ]:
+            front = create_front(generator, number_of_points, number_of_objectives)
+            reference_point = [1.1] * number_of_objectives
+
+            # HyperVolume computes fronts of five or more objectives with WFG, so the recursive algorithm is called directly
+            fonseca, fonseca_time = measure(
+                HyperVolume(reference_point)._compute_recursive, front
+            )
+            wfg, wfg_time = measure(WFGHyperVolume(reference_point).compute, front)
+
+            print(
+                "{:<8}{:>4}{:>6}{:>14.8f}{:>14.8f}{:>12.4f}{:>12.4f}".format(
+                    name,
+                    number_of_objectives,
+                    number_of_points,
+                    fonseca,
+                    wfg,
+                    fonseca_time,
+                    wfg_time,
+                )
+            )
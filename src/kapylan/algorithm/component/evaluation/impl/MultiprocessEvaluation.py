@@ -0,0 +1,56 @@
+import rdflib
+from rdflib import XSD
+
+from kapylan.annotation.component_annotation import EvaluationComponent
+from kapylan.annotation.decorator import merge_component
+from kapylan.annotation.ontology import ontology
+from kapylan.core.problem import Problem
+from kapylan.algorithm.component.evaluation.evaluation import Evaluation
+from kapylan.util.evaluator import CachedEvaluator, MultiprocessEvaluator
+
+BIGOWL = ontology(uri="http://www.ontologies.khaos.uma.es/bigowl/")
+TITAN = ontology(uri="http://www.ontologies.khaos.uma.es/titan-kaplan/")
+
+MultiprocessEvaluationComponent = merge_component(
+    EvaluationComponent,
+    {"hasParameterNumber": BIGOWL.namespace.hasParameter},
+    {"hasParameterNumber": TITAN.namespace.parameter_number_of_processes},
+)
+
+
+@MultiprocessEvaluationComponent(
+    hasImplementation=TITAN.namespace.ImplementationMultiprocessEvaluation,
+    label=rdflib.Literal("Multiprocess Evaluation", datatype=XSD.string),
+)
+class MultiprocessEvaluation(Evaluation):
+    def __init__(self, problem: Problem, processes: int = None, cache_size: int = 0):
+        """
+        :param problem: Problem to evaluate.
+        :param processes: Number of worker processes (by default, the number of CPUs).
+        :param cache_size: Number of evaluations to remember to avoid evaluating again the same solutions (0 to
+            evaluate every solution).
+        """
+        super(MultiprocessEvaluation, self).__init__()
+        self.evaluator = MultiprocessEvaluator(processes)
+
+        if cache_size > 0:
+            self.evaluator = CachedEvaluator(self.evaluator, cache_size)
+
+        self.problem = problem
+
+    def evaluate(self, solution_list: list) -> list:
+        return self.evaluator.evaluate(solution_list, self.problem)
+
+    def get_problem(self) -> Problem:
+        return self.problem
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        evaluator = self.evaluator
+        if isinstance(evaluator, CachedEvaluator):
+            evaluator = evaluator.evaluator
+
+        evaluator.close()
+
+    def get_name(self):
+        return "Multiprocess evaluation"
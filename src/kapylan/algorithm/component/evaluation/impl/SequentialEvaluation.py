@@ -5,7 +5,7 @@ from kapylan.annotation.component_annotation import EvaluationComponent
 from kapylan.annotation.ontology import ontology
 from kapylan.core.problem import Problem
 from kapylan.algorithm.component.evaluation.evaluation import Evaluation
-from kapylan.util.evaluator import SequentialEvaluator
+from kapylan.util.evaluator import CachedEvaluator, SequentialEvaluator
 
 TITAN = ontology(uri="http://www.ontologies.khaos.uma.es/titan-kaplan/")
 
@@ -15,9 +15,18 @@ TITAN = ontology(uri="http://www.ontologies.khaos.uma.es/titan-kaplan/")
     label=rdflib.Literal("Sequential Evaluation", datatype=XSD.string),
 )
 class SequentialEvaluation(Evaluation):
-    def __init__(self, problem: Problem):
+    def __init__(self, problem: Problem, cache_size: int = 0):
+        """
+        :param problem: Problem to evaluate.
+        :param cache_size: Number of evaluations to remember to avoid evaluating again the same solutions (0 to
+            evaluate every solution).
+        """
         super(SequentialEvaluation, self).__init__()
         self.evaluator = SequentialEvaluator()
+
+        if cache_size > 0:
+            self.evaluator = CachedEvaluator(self.evaluator, cache_size)
+
         self.problem = problem
 
     def evaluate(self, solution_list: list) -> list:
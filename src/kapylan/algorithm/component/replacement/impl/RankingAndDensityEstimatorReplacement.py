@@ -76,14 +76,9 @@ class RankingAndDensityEstimatorReplacement(Replacement):
                 )
             )
         else:
-            for solution in current_ranked_solutions:
-                result_list.append(solution)
-
-            while len(result_list) > size_of_the_result_list:
-                self.density_estimator.sort(result_list)
-
-                del result_list[-1]
-                self.density_estimator.compute_density_estimator(result_list)
+            result_list = self.density_estimator.truncate(
+                current_ranked_solutions, size_of_the_result_list
+            )
 
         return result_list
 
@@ -73,7 +73,7 @@ class SPXMSACrossover(Crossover):
                 offspring[0].remove_full_of_gaps_columns()
                 offspring[1].remove_full_of_gaps_columns()
         else:
-            offspring = copy.deepcopy(parents)
+            offspring = [copy.copy(parents[0]), copy.copy(parents[1])]
             self.has_solution_been_crossed = False
 
         return offspring
@@ -85,8 +85,13 @@ class SPXMSACrossover(Crossover):
         cutting_points_in_first_parent: list,
         column_positions_in_second_parent: list,
     ) -> List[MSASolution]:
-        offspring_1 = copy.deepcopy(parents[0])
-        offspring_2 = copy.deepcopy(parents[1])
+        offspring_1 = copy.copy(parents[0])
+        offspring_2 = copy.copy(parents[1])
+
+        offspring_1.invalidate_column_scores()
+        offspring_2.invalidate_column_scores()
+        offspring_1.invalidate_gaps_index()
+        offspring_2.invalidate_gaps_index()
 
         for i in range(offspring_1.number_of_variables):
             new_gap_group_list = []
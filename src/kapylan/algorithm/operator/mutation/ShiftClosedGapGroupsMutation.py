@@ -51,6 +51,13 @@ class ShiftClosedGapGroupsMutation(Mutation):
                             - gaps_group[random_gaps_group]
                         )
 
+                        if diff != 0:
+                            solution.mark_dirty_columns(
+                                gaps_group[random_gaps_group],
+                                gaps_group[random_gaps_group + 3],
+                            )
+                            solution.invalidate_gaps_index(i)
+
                         if diff < 0:
                             # diff < 0 means that gaps group 2 is shorter than gaps group 1, thus we need to decrease
                             # the length of the gaps group 1
@@ -46,6 +46,13 @@ class TwoRandomAdjacentGapGroupMutation(Mutation):
                 right_is_closest = False
 
                 if not right_is_closest:
+                    # the chars between both groups are shifted to the right
+                    solution.mark_dirty_columns(
+                        gaps_group[random_gaps_group + 1] + 1,
+                        gaps_group[random_gaps_group + 3],
+                    )
+                    solution.invalidate_gaps_index(seq)
+
                     to_add = (
                         gaps_group[random_gaps_group + 3]
                         - gaps_group[random_gaps_group + 2]
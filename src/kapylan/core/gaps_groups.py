@@ -0,0 +1,139 @@
+import itertools
+
+import numpy as np
+
+
+class GapsGroupsArray:
+    """Compact representation of the gaps groups of an alignment. The groups of all the sequences are stored in
+    two arrays (`starts` and `ends`), with the groups of sequence `i` in the slice `offsets[i]:offsets[i + 1]`
+    (CSR-style). It allows querying the gaps of every sequence, and removing columns from all of them, at once.
+    Solutions keep their gaps groups as lists, which the operators edit one gap at a time; the array is a
+    snapshot of them for these batch operations (see `MSASolution.get_gaps_groups_array`).
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, offsets: np.ndarray):
+        self.starts = starts
+        self.ends = ends
+        self.offsets = offsets
+
+    @classmethod
+    def from_lists(cls, gaps_groups: list) -> "GapsGroupsArray":
+        """Create the array from a list of flat gaps groups (e.g. [[1, 2, 5, 6], []])."""
+        sizes = [len(gaps_group) // 2 for gaps_group in gaps_groups]
+        offsets = np.zeros(len(gaps_groups) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+
+        bounds = np.array(
+            list(
+                itertools.chain.from_iterable(
+                    gaps_group if len(gaps_group) % 2 == 0 else gaps_group[:-1]
+                    for gaps_group in gaps_groups
+                )
+            ),
+            dtype=np.int32,
+        )
+
+        return cls(bounds[0::2].copy(), bounds[1::2].copy(), offsets)
+
+    def to_lists(self) -> list:
+        bounds = np.empty(2 * len(self.starts), dtype=np.int32)
+        bounds[0::2] = self.starts
+        bounds[1::2] = self.ends
+        bounds = bounds.tolist()
+
+        return [
+            bounds[2 * self.offsets[i] : 2 * self.offsets[i + 1]]
+            for i in range(self.get_number_of_sequences())
+        ]
+
+    def get_number_of_sequences(self) -> int:
+        return len(self.offsets) - 1
+
+    def get_sequence_indexes(self) -> np.ndarray:
+        """Index of the sequence of each group."""
+        return np.repeat(
+            np.arange(self.get_number_of_sequences()), np.diff(self.offsets)
+        )
+
+    def get_number_of_gaps(self) -> np.ndarray:
+        """Number of gaps of each sequence."""
+        return np.bincount(
+            self.get_sequence_indexes(),
+            weights=self.ends - self.starts + 1,
+            minlength=self.get_number_of_sequences(),
+        ).astype(np.int64)
+
+    def get_gaps_mask(self, length: int) -> np.ndarray:
+        """Compute which positions of the alignment are covered by a gaps group.
+
+        :param length: Length of the alignment.
+        :return: Boolean array of shape (number of sequences, length).
+        """
+        number_of_sequences = self.get_number_of_sequences()
+        sequences = self.get_sequence_indexes()
+
+        # empty groups (end < start) cover no position
+        is_valid = (self.starts <= self.ends) & (self.starts < length)
+        sequences = sequences[is_valid]
+        starts = self.starts[is_valid]
+        ends = np.minimum(self.ends[is_valid] + 1, length)
+
+        size = number_of_sequences * (length + 1)
+        coverage = np.bincount(
+            sequences * (length + 1) + starts, minlength=size
+        ) - np.bincount(sequences * (length + 1) + ends, minlength=size)
+
+        return (
+            coverage.reshape(number_of_sequences, length + 1)[:, :length].cumsum(axis=1)
+            > 0
+        )
+
+    def get_gap_columns(self, length: int) -> np.ndarray:
+        """Indexes of the columns of the alignment that only contain gaps."""
+        if not self.is_sorted():
+            return np.flatnonzero(self.get_gaps_mask(length).all(axis=0))
+
+        # the groups of a sequence do not overlap, so the number of groups covering a column is the number of
+        # sequences with a gap on it (a single sweep over all the groups)
+        is_valid = self.starts < length
+        coverage = np.bincount(
+            self.starts[is_valid], minlength=length + 1
+        ) - np.bincount(
+            np.minimum(self.ends[is_valid] + 1, length), minlength=length + 1
+        )
+
+        return np.flatnonzero(
+            coverage[:length].cumsum() == self.get_number_of_sequences()
+        )
+
+    def is_sorted(self) -> bool:
+        """Check if the groups of each sequence are ordered and do not overlap (as after merging them)."""
+        sequences = self.get_sequence_indexes()
+        follows = self.starts[1:] > self.ends[:-1]
+        same_sequence = sequences[1:] == sequences[:-1]
+
+        return bool(
+            (follows | ~same_sequence).all() and (self.starts <= self.ends).all()
+        )
+
+    def remove_columns(self, columns: np.ndarray) -> "GapsGroupsArray":
+        """Remove the given columns, which must be full of gaps, from every sequence. Groups must be sorted.
+
+        :param columns: Sorted array with the indexes of the columns.
+        """
+        starts = self.starts - np.searchsorted(columns, self.starts, side="left")
+        ends = self.ends - np.searchsorted(columns, self.ends, side="right")
+
+        is_kept = starts <= ends
+        offsets = np.zeros_like(self.offsets)
+        np.cumsum(
+            np.bincount(
+                self.get_sequence_indexes()[is_kept],
+                minlength=self.get_number_of_sequences(),
+            ),
+            out=offsets[1:],
+        )
+
+        return GapsGroupsArray(
+            starts[is_kept].astype(np.int32), ends[is_kept].astype(np.int32), offsets
+        )
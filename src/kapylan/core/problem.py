@@ -41,6 +41,16 @@ class Problem(Generic[S], ABC):
         :return: Evaluated solution."""
         pass
 
+    def evaluate_batch(self, solutions: List[S]) -> List[S]:
+        """Evaluate a list of solutions. By default, each solution is evaluated with `evaluate`; problems that can
+        evaluate many solutions at once (e.g. with array operations) should replace this method.
+
+        :return: Evaluated solutions."""
+        for solution in solutions:
+            self.evaluate(solution)
+
+        return solutions
+
     @abstractmethod
     def get_name(self) -> str:
         pass
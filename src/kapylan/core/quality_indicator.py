@@ -1,8 +1,9 @@
+import bisect
 from abc import ABC, abstractmethod
 from typing import List
 
 import numpy as np
-from scipy import spatial
+from scipy import spatial, stats
 
 
 class QualityIndicator(ABC):
@@ -27,11 +28,141 @@ class QualityIndicator(ABC):
         pass
 
 
+class ReferenceFrontIndicator(QualityIndicator):
+    """Base class of the indicators measuring a front against a reference front. The reference front is indexed
+    in a KD-tree built once and reused in every computation.
+    """
+
+    def __init__(self, reference_front: np.array = None):
+        super(ReferenceFrontIndicator, self).__init__(is_minimization=True)
+        self.reference_front = reference_front
+
+    @property
+    def reference_front(self) -> np.ndarray:
+        return self.__reference_front
+
+    @reference_front.setter
+    def reference_front(self, reference_front: np.array):
+        self.__reference_front = (
+            None
+            if reference_front is None
+            else np.asarray(reference_front, dtype=float)
+        )
+        self.__tree = None
+
+    def get_tree(self) -> spatial.cKDTree:
+        if self.__tree is None:
+            self.__tree = spatial.cKDTree(self.reference_front)
+
+        return self.__tree
+
+    def reduce_by_blocks(self, solutions: np.ndarray, function, block_size: int = 256):
+        """Apply a function to blocks of reference points and all the solutions, so the memory used by the
+        (reference points, solutions, objectives) arrays is bounded.
+
+        :return: Concatenated results of the blocks.
+        """
+        return np.concatenate(
+            [
+                function(self.reference_front[start : start + block_size], solutions)
+                for start in range(0, len(self.reference_front), block_size)
+            ]
+        )
+
+
+class GenerationalDistance(ReferenceFrontIndicator):
+    """Mean Euclidean distance from each point of the front to the nearest point of the reference front."""
+
+    def compute(self, solutions: np.array):
+        distances, _ = self.get_tree().query(np.asarray(solutions, dtype=float))
+
+        return float(np.mean(distances))
+
+    def get_short_name(self) -> str:
+        return "GD"
+
+    def get_name(self) -> str:
+        return "Generational Distance"
+
+
+class InvertedGenerationalDistance(ReferenceFrontIndicator):
+    """Mean Euclidean distance from each point of the reference front to the nearest point of the front. The
+    nearest points are searched in a KD-tree over the front, which is usually smaller than the reference one.
+    """
+
+    def compute(self, solutions: np.array):
+        distances, _ = spatial.cKDTree(np.asarray(solutions, dtype=float)).query(
+            self.reference_front
+        )
+
+        return float(np.mean(distances))
+
+    def get_short_name(self) -> str:
+        return "IGD"
+
+    def get_name(self) -> str:
+        return "Inverted Generational Distance"
+
+
+class InvertedGenerationalDistancePlus(ReferenceFrontIndicator):
+    """Mean, over the points of the reference front, of the distance to the nearest point of the front
+    counting only the objectives in which the front is worse (IGD+), see [Ishibuchi2015]_.
+    """
+
+    def compute(self, solutions: np.array):
+        def get_distances(reference_points, points):
+            differences = np.maximum(
+                points[None, :, :] - reference_points[:, None, :], 0
+            )
+            return np.sqrt((differences**2).sum(axis=2)).min(axis=1)
+
+        return float(
+            np.mean(
+                self.reduce_by_blocks(np.asarray(solutions, dtype=float), get_distances)
+            )
+        )
+
+    def get_short_name(self) -> str:
+        return "IGD+"
+
+    def get_name(self) -> str:
+        return "Inverted Generational Distance Plus"
+
+
+class EpsilonIndicator(ReferenceFrontIndicator):
+    """Additive epsilon indicator: minimum amount that the front has to be shifted to weakly dominate every
+    point of the reference front.
+    """
+
+    def compute(self, solutions: np.array):
+        def get_epsilons(reference_points, points):
+            return (
+                (points[None, :, :] - reference_points[:, None, :])
+                .max(axis=2)
+                .min(axis=1)
+            )
+
+        return float(
+            np.max(
+                self.reduce_by_blocks(np.asarray(solutions, dtype=float), get_epsilons)
+            )
+        )
+
+    def get_short_name(self) -> str:
+        return "EP"
+
+    def get_name(self) -> str:
+        return "Additive Epsilon"
+
+
 class HyperVolume(QualityIndicator):
     """Hypervolume computation based on variant 3 of the algorithm in the paper:
     * C. M. Fonseca, L. Paquete, and M. Lopez-Ibanez. An improved dimension-sweep
       algorithm for the hypervolume indicator. In IEEE Congress on Evolutionary
       Computation, pages 1157-1163, Vancouver, Canada, July 2006.
+    Fronts with two or three objectives are computed with O(n log n) sweeps instead, and fronts with five or more
+    objectives with :class:`WFGHyperVolume`, which is faster there (examples/hypervolume_benchmark.py, 100 random
+    points: 0.50s against 0.13s with 5 objectives, and 0.035s against 0.042s with 4 objectives).
     Minimization is implicitly assumed here!
     """
 
@@ -44,6 +175,25 @@ class HyperVolume(QualityIndicator):
         """Before the HV computation, front and reference point are translated, so that the reference point is [0, ..., 0].
         :return: The hypervolume that is dominated by a non-dominated front.
         """
+        dimensions = len(self.referencePoint)
+        if dimensions in (2, 3):
+            points = np.asarray(solutions, dtype=float).reshape(-1, dimensions)
+            reference_point = np.asarray(self.referencePoint, dtype=float)
+
+            # only consider points that dominate the reference point
+            points = points[(points <= reference_point).all(axis=1)]
+
+            if dimensions == 2:
+                return self._hv_2d(points, reference_point)
+            return self._hv_3d(points, reference_point)
+
+        elif dimensions > 4:
+            return WFGHyperVolume(self.referencePoint).compute(solutions)
+
+        return self._compute_recursive(solutions)
+
+    def _compute_recursive(self, solutions: np.array):
+        """Hypervolume computed with the recursive algorithm of Fonseca et al. for any number of objectives."""
         front = solutions
 
         def weakly_dominates(point, other):
@@ -73,6 +223,64 @@ class HyperVolume(QualityIndicator):
 
         return self._hv_recursive(dimensions - 1, len(relevant_points), bounds)
 
+    @staticmethod
+    def _hv_2d(points: np.ndarray, reference_point: np.ndarray) -> float:
+        """Area dominated by a bi-objective front, sweeping the points sorted by the first objective."""
+        if len(points) == 0:
+            return 0.0
+
+        points = points[np.lexsort((points[:, 1], points[:, 0]))]
+
+        # each point adds the strip between its second objective and the lowest one of the previous points
+        lowest = np.minimum.accumulate(points[:, 1])
+        previous_lowest = np.concatenate(([reference_point[1]], lowest[:-1]))
+
+        return float(
+            np.sum((reference_point[0] - points[:, 0]) * (previous_lowest - lowest))
+        )
+
+    @staticmethod
+    def _hv_3d(points: np.ndarray, reference_point: np.ndarray) -> float:
+        """Volume dominated by a three-objective front. Points are swept by the third objective, keeping the
+        area dominated by the projection of the visited ones onto the first two objectives, see [Beume2009]_.
+        """
+        if len(points) == 0:
+            return 0.0
+
+        points = points[np.argsort(points[:, 2], kind="stable")].tolist()
+        reference_x, reference_y, reference_z = reference_point.tolist()
+
+        # non-dominated projections sorted by the first objective (so the second one decreases)
+        xs = []
+        ys = []
+        area = 0.0
+        volume = 0.0
+
+        for i, (x, y, z) in enumerate(points):
+            index = bisect.bisect_right(xs, x)
+            if index == 0 or ys[index - 1] > y:
+                start = bisect.bisect_left(xs, x)
+                end = start
+                while end < len(ys) and ys[end] >= y:
+                    end += 1
+
+                # strips of the new box that were not dominated yet: up to each point it dominates
+                left = x
+                level = ys[start - 1] if start > 0 else reference_y
+                for k in range(start, end):
+                    area += (xs[k] - left) * (level - y)
+                    left, level = xs[k], ys[k]
+                right = xs[end] if end < len(xs) else reference_x
+                area += (right - left) * (level - y)
+
+                xs[start:end] = [x]
+                ys[start:end] = [y]
+
+            next_z = points[i + 1][2] if i + 1 < len(points) else reference_z
+            volume += area * (next_z - z)
+
+        return volume
+
     def _hv_recursive(self, dim_index: int, length: int, bounds: list):
         """Recursive call to hypervolume calculation.
         In contrast to the paper, the code assumes that the reference point
@@ -168,12 +376,13 @@ class HyperVolume(QualityIndicator):
 
     def _sort_by_dimension(self, nodes, i):
         """Sorts the list of nodes by the i-th value of the contained points."""
-        # build a list of tuples of (point[i], node)
-        decorated = [(node.cargo[i], node) for node in nodes]
-        # sort by this value
-        decorated.sort(key=lambda n: n[0])
+        # build a list of tuples of (point[i], point, node)
+        decorated = [(node.cargo[i], list(node.cargo), node) for node in nodes]
+        # sort by this value, and ties by the whole point, as the recursion
+        # is wrong on tied values otherwise
+        decorated.sort(key=lambda n: n[:2])
         # write back to original list
-        nodes[:] = [node for (_, node) in decorated]
+        nodes[:] = [node for (_, _, node) in decorated]
 
     def get_short_name(self) -> str:
         return "HV"
@@ -182,6 +391,199 @@ class HyperVolume(QualityIndicator):
         return "Hypervolume (Fonseca et al. implementation)"
 
 
+class WFGHyperVolume(QualityIndicator):
+    """Exact hypervolume computed with the WFG algorithm:
+    * L. While, L. Bradstreet and L. Barone. A Fast Way of Calculating Exact Hypervolumes. IEEE Transactions
+      on Evolutionary Computation, 16(1):86-95, 2012.
+    The hypervolume is the sum of the exclusive contributions of the points, each of them being its box minus
+    the hypervolume of the limit set (the rest of points bounded by it). Points are sorted by decreasing last
+    objective, so the limit sets lie on a hyperplane and are computed with one objective less, down to the
+    sweeps of :class:`HyperVolume` for three objectives. Minimization is implicitly assumed here!
+    """
+
+    def __init__(self, reference_point: List[float] = None):
+        super(WFGHyperVolume, self).__init__(is_minimization=False)
+        self.referencePoint = reference_point
+
+    def compute(self, solutions: np.array):
+        """
+        :return: The hypervolume that is dominated by the front.
+        """
+        reference_point = np.asarray(self.referencePoint, dtype=float)
+        points = np.asarray(solutions, dtype=float).reshape(-1, len(reference_point))
+
+        # only consider points that dominate the reference point
+        points = points[(points <= reference_point).all(axis=1)]
+
+        return float(self._wfg(get_non_dominated_points(points), reference_point))
+
+    def _wfg(self, points: np.ndarray, reference_point: np.ndarray) -> float:
+        number_of_points, dimensions = points.shape
+
+        if number_of_points == 0:
+            return 0.0
+        elif number_of_points == 1:
+            return float(np.prod(reference_point - points[0]))
+        elif dimensions == 1:
+            return float(reference_point[0] - points[:, 0].min())
+        elif dimensions == 2:
+            return HyperVolume._hv_2d(points, reference_point)
+        elif dimensions == 3:
+            return HyperVolume._hv_3d(points, reference_point)
+
+        points = points[np.argsort(-points[:, -1], kind="stable")]
+        heights = reference_point[-1] - points[:, -1]
+        projection = points[:, :-1]
+        projected_reference_point = reference_point[:-1]
+
+        volume = 0.0
+        for k in range(number_of_points):
+            exclusive = np.prod(projected_reference_point - projection[k])
+            if k + 1 < number_of_points:
+                limit_set = np.maximum(projection[k + 1 :], projection[k])
+                exclusive -= self._wfg(
+                    get_non_dominated_points(limit_set), projected_reference_point
+                )
+
+            volume += heights[k] * exclusive
+
+        return volume
+
+    def get_short_name(self) -> str:
+        return "HV"
+
+    def get_name(self) -> str:
+        return "Hypervolume (WFG implementation)"
+
+
+class MonteCarloHyperVolume(QualityIndicator):
+    """Hypervolume estimated by sampling points uniformly in the box between the ideal point of the front and
+    the reference point: the estimate is the volume of the box times the fraction of samples dominated by the
+    front. Samples are drawn and checked in batches until the sample budget is spent or, if given, the
+    confidence interval is narrower than the target. Minimization is implicitly assumed here!
+    """
+
+    def __init__(
+        self,
+        reference_point: List[float] = None,
+        number_of_samples: int = 100000,
+        confidence_interval: float = None,
+        confidence_level: float = 0.95,
+        batch_size: int = 10000,
+        seed: int = 0,
+    ):
+        """
+        :param number_of_samples: Maximum number of samples.
+        :param confidence_interval: Target half-width of the confidence interval (sampling stops once reached).
+        :param confidence_level: Confidence level of the interval.
+        :param batch_size: Number of samples drawn and checked at once.
+        :param seed: Seed of the random generator, so that estimates are reproducible (each call to `compute`
+        draws the same samples).
+        """
+        super(MonteCarloHyperVolume, self).__init__(is_minimization=False)
+        self.referencePoint = reference_point
+        self.number_of_samples = number_of_samples
+        self.confidence_interval = confidence_interval
+        self.confidence_level = confidence_level
+        self.batch_size = batch_size
+        self.seed = seed
+        self.standard_error = 0.0
+        self.samples = 0
+
+    def compute(self, solutions: np.array):
+        """
+        :return: The estimated hypervolume (its standard error is left in `standard_error`).
+        """
+        return self.compute_with_error(solutions)[0]
+
+    def compute_with_error(self, solutions: np.array) -> tuple:
+        """
+        :return: The estimated hypervolume and its standard error.
+        """
+        reference_point = np.asarray(self.referencePoint, dtype=float)
+        points = np.asarray(solutions, dtype=float).reshape(-1, len(reference_point))
+
+        # only consider points that dominate the reference point
+        points = get_non_dominated_points(
+            points[(points <= reference_point).all(axis=1)]
+        )
+
+        self.standard_error = 0.0
+        self.samples = 0
+
+        if len(points) == 0:
+            return 0.0, 0.0
+
+        ideal_point = points.min(axis=0)
+        box_volume = float(np.prod(reference_point - ideal_point))
+        if box_volume == 0:
+            return 0.0, 0.0
+
+        generator = np.random.default_rng(self.seed)
+        z = stats.norm.ppf(0.5 + self.confidence_level / 2.0)
+
+        # bound the size of the (samples, points) comparison of each batch
+        batch_size = max(1, min(self.batch_size, 2**24 // len(points)))
+
+        hits = 0
+        while self.samples < self.number_of_samples:
+            size = min(batch_size, self.number_of_samples - self.samples)
+            samples = generator.uniform(
+                ideal_point, reference_point, (size, len(ideal_point))
+            )
+
+            # objective by objective, which avoids a (samples, points, objectives) array
+            is_dominated = points[:, 0] <= samples[:, 0, None]
+            for i in range(1, points.shape[1]):
+                is_dominated &= points[:, i] <= samples[:, i, None]
+
+            hits += int(is_dominated.any(axis=1).sum())
+            self.samples += size
+
+            fraction = hits / self.samples
+            self.standard_error = box_volume * np.sqrt(
+                fraction * (1.0 - fraction) / self.samples
+            )
+
+            if (
+                self.confidence_interval is not None
+                and z * self.standard_error <= self.confidence_interval
+            ):
+                break
+
+        return box_volume * hits / self.samples, float(self.standard_error)
+
+    def get_short_name(self) -> str:
+        return "HV"
+
+    def get_name(self) -> str:
+        return "Hypervolume (Monte Carlo estimation)"
+
+
+def get_non_dominated_points(points: np.ndarray, block_size: int = 256) -> np.ndarray:
+    """Remove the points weakly dominated by another one (keeping the first one of duplicated points).
+
+    :param points: [m, n] array of points to minimize.
+    :param block_size: Number of points compared with the rest at once, which bounds the memory used.
+    """
+    is_dominated = np.zeros(len(points), dtype=bool)
+    indexes = np.arange(len(points))
+
+    for start in range(0, len(points), block_size):
+        block = points[start : start + block_size]
+
+        # [i, j] is True if point j is not worse than point i of the block in any objective
+        not_worse = (points[None, :, :] <= block[:, None, :]).all(axis=2)
+        is_better = (points[None, :, :] < block[:, None, :]).any(axis=2)
+        is_earlier = indexes[None, :] < indexes[start : start + block_size, None]
+
+        is_dominated[start : start + block_size] = (
+            not_worse & (is_better | is_earlier)
+        ).any(axis=1)
+
+    return points[~is_dominated]
+
+
 class MultiList:
     """A special front structure needed by FonsecaHyperVolume.
     It consists of several doubly linked lists that share common nodes. So,
@@ -1,6 +1,10 @@
+import bisect
 from abc import ABC
 from typing import List
 
+import numpy as np
+
+from kapylan.core.gaps_groups import GapsGroupsArray
 from kapylan.util.checking import Check
 
 
@@ -217,9 +221,133 @@ class MSASolution(Solution):
         self.sequences_names = problem.identifiers
         self.gaps_groups = [[] for _ in range(self.number_of_variables)]
 
+        # contribution of each column to the scores of the last evaluation (see `MSA`) and ranges of columns
+        # modified since then; code changing `gaps_groups` in place must call `mark_dirty_columns` or
+        # `invalidate_column_scores`, and `invalidate_gaps_index`
+        self.column_scores = None
+        self.column_scores_key = None
+        self.dirty_columns = []
+
         self.encode_alignment(list(pair[1] for pair in msa))
 
+    def __copy__(self):
+        new_solution = MSASolution.__new__(MSASolution)
+        new_solution.number_of_variables = self.number_of_variables
+        new_solution.number_of_objectives = self.number_of_objectives
+        new_solution.number_of_constraints = self.number_of_constraints
+
+        # the ungapped sequences (str) and the names are immutable, so they are shared with the copy
+        new_solution.variables = self.variables[:]
+        new_solution.sequences_names = self.sequences_names
+        new_solution.gaps_groups = [gaps_group[:] for gaps_group in self.gaps_groups]
+
+        new_solution.objectives = self.objectives[:]
+        new_solution.constraints = self.constraints[:]
+        new_solution.attributes = self.attributes.copy()
+
+        # the cached column scores and gaps indexes are never modified in place
+        new_solution.column_scores = self.column_scores
+        new_solution.column_scores_key = self.column_scores_key
+        new_solution.dirty_columns = self.dirty_columns[:]
+        new_solution.__gaps_index = self.__gaps_index.copy()
+
+        return new_solution
+
+    @classmethod
+    def from_encoding(
+        cls, problem, sequences: List[str], gaps_groups: List[List[int]]
+    ) -> "MSASolution":
+        """Create a solution from its ungapped sequences and gaps groups, skipping the encoding of an alignment.
+
+        :param problem: MSA problem.
+        :param sequences: Ungapped sequences.
+        :param gaps_groups: Flat gaps groups of each sequence (e.g. [[1, 2, 5, 6], []]).
+        :return: New solution.
+        """
+        new_solution = cls.__new__(cls)
+        Solution.__init__(
+            new_solution,
+            number_of_variables=problem.number_of_variables,
+            number_of_objectives=problem.number_of_objectives,
+        )
+
+        new_solution.sequences_names = problem.identifiers
+        new_solution.variables = list(sequences)
+        new_solution.gaps_groups = [list(gaps_group) for gaps_group in gaps_groups]
+
+        new_solution.column_scores = None
+        new_solution.column_scores_key = None
+        new_solution.dirty_columns = []
+
+        return new_solution
+
+    @property
+    def gaps_groups(self) -> List[List[int]]:
+        return self.__gaps_groups
+
+    @gaps_groups.setter
+    def gaps_groups(self, gaps_groups: List[List[int]]) -> None:
+        self.__gaps_groups = gaps_groups
+        # cumulative lengths of the gaps groups of each sequence, built on demand (see `invalidate_gaps_index`)
+        self.__gaps_index = {}
+
+    def set_column_scores(self, column_scores, key: str) -> None:
+        self.column_scores = column_scores
+        self.column_scores_key = key
+        self.dirty_columns = []
+
+    def invalidate_column_scores(self) -> None:
+        self.column_scores = None
+        self.column_scores_key = None
+        self.dirty_columns = []
+
+    def invalidate_gaps_index(self, seq_index: int = None) -> None:
+        """Forget the index of the gaps groups of a sequence, or of all of them by default. It must be called
+        after changing the gaps groups in place.
+        """
+        if seq_index is None:
+            self.__gaps_index = {}
+        else:
+            self.__gaps_index.pop(seq_index, None)
+
+    def mark_dirty_columns(self, start: int, end: int) -> None:
+        """Mark the columns in [start, end] of the alignment as modified since the last evaluation."""
+        if self.column_scores is not None and start <= end:
+            self.dirty_columns.append((start, end))
+
+    def get_dirty_columns(self) -> list:
+        length_of_alignment = self.column_scores.shape[1]
+        dirty_columns = set()
+
+        for start, end in self.dirty_columns:
+            dirty_columns.update(
+                range(max(start, 0), min(end, length_of_alignment - 1) + 1)
+            )
+
+        return sorted(dirty_columns)
+
+    def __discard_columns(self, columns: list) -> None:
+        """Keep the cached column scores in step with the alignment once `columns` have been removed from it."""
+        if self.column_scores is None:
+            return
+
+        columns = sorted(columns)
+        self.column_scores = np.delete(self.column_scores, columns, axis=1)
+
+        dirty_columns = []
+        for start, end in self.dirty_columns:
+            start -= bisect.bisect_left(columns, start)
+            end -= bisect.bisect_right(columns, end)
+
+            if start <= end:
+                dirty_columns.append((start, end))
+
+        self.dirty_columns = dirty_columns
+
     def encode_alignment(self, aligned_sequences: list):
+        self.invalidate_column_scores()
+        self.invalidate_gaps_index()
+
         # for each bb3_aligned sequence
         for index, seq in enumerate(aligned_sequences):
             # get gaps groups
@@ -249,7 +377,68 @@ class MSASolution(Solution):
 
         return list_of_pairs
 
+    def decode_alignment_as_matrix(self, out: np.ndarray = None) -> np.ndarray:
+        """Decode the alignment as a matrix of bytes (one row per sequence, with the latin-1 code of each char),
+        without building the aligned sequences.
+
+        :param out: Optional preallocated uint8 matrix of shape (number of sequences, length of the alignment).
+        :return: Alignment matrix.
+        """
+        number_of_sequences = self.number_of_variables
+        length_of_alignment = self.get_length_of_alignment()
+
+        if out is None:
+            out = np.empty((number_of_sequences, length_of_alignment), dtype=np.uint8)
+        elif out.shape != (number_of_sequences, length_of_alignment):
+            raise Exception(
+                "The matrix shape {0} does not match the alignment ({1}, {2})".format(
+                    out.shape, number_of_sequences, length_of_alignment
+                )
+            )
+
+        gaps_groups_array = self.get_gaps_groups_array()
+        is_gap = gaps_groups_array.get_gaps_mask(length_of_alignment)
+        is_valid = gaps_groups_array.is_sorted() and all(
+            len(sequence) == length_of_alignment - number_of_gaps
+            for sequence, number_of_gaps in zip(
+                self.variables, gaps_groups_array.get_number_of_gaps()
+            )
+        )
+
+        if is_valid:
+            out[is_gap] = ord(self.GAP_IDENTIFIER)
+            out[~is_gap] = np.frombuffer(
+                "".join(self.variables).encode("latin-1"), dtype=np.uint8
+            )
+        else:
+            for i, sequence in enumerate(self.decode_alignment_as_list_of_sequences()):
+                out[i] = np.frombuffer(sequence.encode("latin-1"), dtype=np.uint8)
+
+        return out
+
     def __decode(self, encoded_sequence: str, gaps_group: list) -> str:
+        pieces = []
+        number_of_chars = 0
+        length = 0
+
+        # join the chars between gaps groups with the runs of gaps
+        for a, b in zip(gaps_group[0::2], gaps_group[1::2]):
+            if a < length or b < a:
+                return self.__decode_by_insertion(encoded_sequence, gaps_group)
+
+            pieces.append(
+                encoded_sequence[number_of_chars : number_of_chars + a - length]
+            )
+            pieces.append(self.GAP_IDENTIFIER * (b - a + 1))
+
+            number_of_chars += a - length
+            length = b + 1
+
+        pieces.append(encoded_sequence[number_of_chars:])
+
+        return "".join(pieces)
+
+    def __decode_by_insertion(self, encoded_sequence: str, gaps_group: list) -> str:
         aligned_sequence = list(encoded_sequence)
 
         # insert gap groups
@@ -267,11 +456,15 @@ class MSASolution(Solution):
             j = 1
             while j <= len(gaps_group) - 2:
                 if gaps_group[j] == gaps_group[j + 1]:
+                    # overlapping groups: the merge changes the alignment
+                    self.invalidate_column_scores()
+                    self.invalidate_gaps_index(i)
                     gaps_group[j] = gaps_group[j + 2]
                     del gaps_group[j + 1]
                     del gaps_group[j + 1]
                     j -= 2
                 elif gaps_group[j] + 1 == gaps_group[j + 1]:
+                    self.invalidate_gaps_index(i)
                     gaps_group[j] = gaps_group[j + 2]
                     del gaps_group[j + 1]
                     del gaps_group[j + 1]
@@ -279,6 +472,8 @@ class MSASolution(Solution):
                 j += 2
 
     def add_gap_to_sequence_at_index(self, seq_index: int, gap_position: int):
+        self.invalidate_column_scores()
+
         new_gaps_group = self.gaps_groups[seq_index]
         length_of_alignment = self.get_length_of_alignment()
 
@@ -291,6 +486,10 @@ class MSASolution(Solution):
         elif gap_position >= length_of_alignment:
             new_gaps_group.append(length_of_alignment)
             new_gaps_group.append(length_of_alignment)
+        elif self.__get_gaps_index(seq_index) is not None:
+            # sorted and disjoint groups: the index is updated instead of being rebuilt on the next query
+            self.__add_gap_to_sorted_gaps_group(seq_index, gap_position)
+            return
         elif self.is_gap_char_at_sequence(seq_index, gap_position):
             # increments gaps group size
             gap_added = False
@@ -320,6 +519,37 @@ class MSASolution(Solution):
             new_gaps_group.sort()
 
         self.gaps_groups[seq_index] = new_gaps_group
+        self.invalidate_gaps_index(seq_index)
+
+    def __add_gap_to_sorted_gaps_group(self, seq_index: int, gap_position: int):
+        """Add a gap to a sequence with sorted and disjoint gaps groups, updating the gaps groups and their index
+        as `add_gap_to_sequence_at_index` does.
+        """
+        is_gap = self.is_gap_char_at_sequence(seq_index, gap_position)
+        starts, ends, lengths, chars = self.__get_gaps_index(seq_index)
+        j = bisect.bisect_right(starts, gap_position) - 1
+
+        gaps_group = self.gaps_groups[seq_index]
+
+        # the lists of the index can be shared with copies, so new lists are built
+        if is_gap:
+            # increments the size of the group j, the next groups are shifted
+            gaps_group[2 * j + 1 :] = [x + 1 for x in gaps_group[2 * j + 1 :]]
+            starts = starts[: j + 1] + [a + 1 for a in starts[j + 1 :]]
+            ends = ends[:j] + [b + 1 for b in ends[j:]]
+            lengths = lengths[: j + 1] + [length + 1 for length in lengths[j + 1 :]]
+        else:
+            # new group after the group j, the next groups are shifted
+            j += 1
+            gaps_group[2 * j :] = [gap_position, gap_position] + [
+                x + 1 for x in gaps_group[2 * j :]
+            ]
+            chars = chars[:j] + [gap_position - lengths[j]] + chars[j:]
+            starts = starts[:j] + [gap_position] + [a + 1 for a in starts[j:]]
+            ends = ends[:j] + [gap_position] + [b + 1 for b in ends[j:]]
+            lengths = lengths[: j + 1] + [length + 1 for length in lengths[j:]]
+
+        self.__gaps_index[seq_index] = (starts, ends, lengths, chars)
 
     def split_gap_column(self, column: int) -> None:
         # for each sequence
@@ -331,19 +561,34 @@ class MSASolution(Solution):
                 if gaps_group[j] <= column < gaps_group[j + 1]:
                     gaps_group.insert(j + 1, column + 1)
                     gaps_group.insert(j + 1, column)
+                    self.invalidate_gaps_index(i)
 
     def remove_full_of_gaps_columns(self) -> None:
-        gap_columns = self.get_gap_columns_from_alignment()
-        gap_columns.sort(reverse=True)
+        gaps_groups_array = self.get_gaps_groups_array()
+        gap_columns = gaps_groups_array.get_gap_columns(self.get_length_of_alignment())
+
+        if len(gap_columns) == 0:
+            return
+
+        if gaps_groups_array.is_sorted() and all(
+            len(gaps_group) % 2 == 0 for gaps_group in self.gaps_groups
+        ):
+            self.set_gaps_groups_array(gaps_groups_array.remove_columns(gap_columns))
+        else:
+            # overlapping or unordered groups: remove the columns one at a time
+            for col in reversed(gap_columns.tolist()):
+                for seq_index in range(self.number_of_variables):
+                    self.remove_gap_from_sequence(seq_index, col)
 
-        for col in gap_columns:
-            for seq_index in range(self.number_of_variables):
-                self.remove_gap_from_sequence(seq_index, col)
+        self.__discard_columns(gap_columns.tolist())
 
     def remove_gap_column(self, column: int) -> None:
         if not self.is_gap_column(column):
             raise Exception("No gap group in position {0}".format(column))
         else:
+            self.invalidate_column_scores()
+            self.invalidate_gaps_index()
+
             for i in range(self.number_of_variables):
                 gaps_group = self.gaps_groups[i]
 
@@ -369,6 +614,8 @@ class MSASolution(Solution):
                 )
             )
         else:
+            self.invalidate_column_scores()
+            self.invalidate_gaps_index(seq_index)
             gaps_group = self.gaps_groups[seq_index]
 
             for j in range(0, len(gaps_group) - 1, 2):
@@ -406,6 +653,8 @@ class MSASolution(Solution):
                     new_gaps_group[j + 2 :] = [x - 1 for x in new_gaps_group[j + 2 :]]
                     break
 
+            self.invalidate_gaps_index(seq_index)
+
         self.gaps_groups[seq_index] = new_gaps_group
 
     def is_gap_column(self, column: int) -> bool:
@@ -428,6 +677,38 @@ class MSASolution(Solution):
 
         return True
 
+    def __get_gaps_index(self, seq_index: int):
+        """Get the index of the gaps groups of a sequence: the starts and ends of the groups, the total length of
+        the groups before each one and the number of chars before each one. The index is kept until the groups
+        are changed (see `invalidate_gaps_index`).
+
+        :return: Tuple (starts, ends, lengths, chars), or None if the groups are not sorted and disjoint.
+        """
+        if seq_index in self.__gaps_index:
+            return self.__gaps_index[seq_index]
+
+        gaps_group = self.gaps_groups[seq_index]
+        gaps_index = None
+
+        starts, ends = gaps_group[0::2], gaps_group[1::2]
+        is_sorted = (
+            len(starts) == len(ends)
+            and all(a <= b for a, b in zip(starts, ends))
+            and all(b < a for a, b in zip(starts[1:], ends))
+        )
+
+        if is_sorted:
+            lengths = [0]
+            for a, b in zip(starts, ends):
+                lengths.append(lengths[-1] + b - a + 1)
+
+            chars = [a - length for a, length in zip(starts, lengths)]
+            gaps_index = (starts, ends, lengths, chars)
+
+        self.__gaps_index[seq_index] = gaps_index
+
+        return gaps_index
+
     def is_gap_char_at_sequence(self, seq_index: int, index: int) -> bool:
         assert (
             seq_index <= self.number_of_variables - 1
@@ -442,6 +723,14 @@ class MSASolution(Solution):
                 )
             )
 
+        gaps_index = self.__get_gaps_index(seq_index)
+
+        if gaps_index is not None:
+            starts, ends, _, _ = gaps_index
+            j = bisect.bisect_right(starts, index) - 1
+
+            return j >= 0 and index <= ends[j]
+
         gaps_group = self.gaps_groups[seq_index]
 
         for a, b in zip(*[iter(gaps_group)] * 2):
@@ -451,6 +740,14 @@ class MSASolution(Solution):
         return False
 
     def get_char_position_in_original_sequence(self, seq_index: int, position: int):
+        gaps_index = self.__get_gaps_index(seq_index)
+
+        if gaps_index is not None:
+            # remove the gaps of the groups ending at or before the position
+            _, ends, lengths, _ = gaps_index
+
+            return position - lengths[bisect.bisect_right(ends, position)]
+
         gaps_group = self.gaps_groups[seq_index]
         gaps_on_the_left = []
 
@@ -476,11 +773,17 @@ class MSASolution(Solution):
             raise Exception("Symbol in position {0} is not a gap!".format(gap_position))
 
         position = -1
-        gaps_group = self.gaps_groups[seq_index]
+        gaps_index = self.__get_gaps_index(seq_index)
 
-        for j in range(0, len(gaps_group) - 1, 2):
-            if gaps_group[j] <= gap_position <= gaps_group[j + 1]:
-                position = gaps_group[j + 1] + 1
+        if gaps_index is not None:
+            starts, ends, _, _ = gaps_index
+            position = ends[bisect.bisect_right(starts, gap_position) - 1] + 1
+        else:
+            gaps_group = self.gaps_groups[seq_index]
+
+            for j in range(0, len(gaps_group) - 1, 2):
+                if gaps_group[j] <= gap_position <= gaps_group[j + 1]:
+                    position = gaps_group[j + 1] + 1
 
         if position == self.get_length_of_sequence(seq_index):
             position = -1
@@ -493,8 +796,17 @@ class MSASolution(Solution):
         symbol_position = 0
         found_symbols = 0
 
+        gaps_index = self.__get_gaps_index(seq_index)
+
         if position < 0:
             symbol_position = -1
+        elif gaps_index is not None:
+            # skip the gaps of the groups placed before the char
+            _, _, lengths, chars = gaps_index
+            symbol_position = position + lengths[bisect.bisect_right(chars, position)]
+
+            # as the column-wise search, return the length of the alignment if the char does not exist
+            symbol_position = min(symbol_position, self.get_length_of_alignment())
         else:
             found = False
             while symbol_position < self.get_length_of_alignment() and not found:
@@ -510,6 +822,11 @@ class MSASolution(Solution):
         return symbol_position
 
     def get_length_of_gaps(self, seq_index: int) -> int:
+        gaps_index = self.__get_gaps_index(seq_index)
+
+        if gaps_index is not None:
+            return gaps_index[2][-1]
+
         if not self.gaps_groups[seq_index]:
             length_of_gaps = 0
         else:
@@ -550,15 +867,21 @@ class MSASolution(Solution):
     def get_number_of_gaps_groups_of_sequence(self, seq_index: int) -> float:
         return len(self.gaps_groups[seq_index]) / 2
 
-    def get_gap_columns_from_alignment(self) -> list:
-        gap_columns_index = []
-        alignment_length = self.get_length_of_alignment()
+    def get_gaps_groups_array(self) -> GapsGroupsArray:
+        """Get the gaps groups of all the sequences as a :class:`GapsGroupsArray`. The array is a snapshot:
+        changes to it are not reflected on the solution until `set_gaps_groups_array` is called.
+        """
+        return GapsGroupsArray.from_lists(self.gaps_groups)
 
-        for j in range(alignment_length):
-            if self.is_gap_column(j):
-                gap_columns_index.append(j)
+    def set_gaps_groups_array(self, gaps_groups_array: GapsGroupsArray) -> None:
+        self.gaps_groups = gaps_groups_array.to_lists()
 
-        return gap_columns_index
+    def get_gap_columns_from_alignment(self) -> list:
+        return (
+            self.get_gaps_groups_array()
+            .get_gap_columns(self.get_length_of_alignment())
+            .tolist()
+        )
 
     def get_total_number_of_gaps(self) -> int:
         number_of_gaps = 0
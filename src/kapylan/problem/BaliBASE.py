@@ -1,13 +1,19 @@
+import hashlib
 import logging
 import os
 import random
+import tempfile
+import zipfile
 from os import listdir
 from typing import List
 
+import numpy as np
+
 from kapylan.algorithm.operator.crossover.SPXMSACrossover import SPXMSACrossover
 from kapylan.algorithm.operator.mutation.TwoRandomAdjacentGapGroupMutation import (
     TwoRandomAdjacentGapGroupMutation,
 )
+from kapylan.core.gaps_groups import GapsGroupsArray
 from kapylan.core.solution import MSASolution
 from kapylan.problem.msa import MSA
 from kapylan.problem.msa_problem.fasta import read_fasta_file_as_list_of_pairs
@@ -28,12 +34,16 @@ class BAliBASE(MSA):
         "tfa_fsa",
     ]
 
+    # bumped whenever the layout of the cache files changes
+    CACHE_VERSION = 2
+
     def __init__(
         self,
         instance: str,
         path: str,
         score_list: List[Score],
         auto_import: bool = True,
+        cache_path: str = None,
     ) -> None:
         """
         Creates a new problem based on an instance of BAliBASE.
@@ -41,10 +51,14 @@ class BAliBASE(MSA):
         :param path: Path containing two directories: `bb3_aligned`, with the pre-computed alignments and
         `bb3_release`, with the original sequences.
         :param score_list: List of score functions.
+        :param cache_path: Directory where the pre-processed instance (sequences, gaps groups and objectives of the
+        pre-computed alignments) is stored, so that it is not parsed and evaluated again. The cache is invalidated
+        if the instance files or the scores change. If None, the instance is always imported from its files.
         """
         super(BAliBASE, self).__init__(score_list)
         self.instance = instance
         self.path = path
+        self.cache_path = cache_path
 
         if auto_import:
             self.import_instance()
@@ -68,28 +82,42 @@ class BAliBASE(MSA):
         bb3_release_path = self._compute_path("bb3_release")
         assert os.path.isdir(bb3_release_path), "Instance not found"
 
-        msa = read_fasta_file_as_list_of_pairs(
-            f"{bb3_release_path}/{self.instance}.tfa"
-        )
-        self.identifiers = list(pair[0] for pair in msa)
-        self.number_of_variables = len(self.identifiers)
+        release_file = f"{bb3_release_path}/{self.instance}.tfa"
 
         bb3_aligned_path = self._compute_path("bb3_aligned")
         assert os.path.isdir(bb3_aligned_path), "Instance not found"
 
-        multiple_alignments = []
+        aligned_files = []
         for file in listdir(bb3_aligned_path):
             name, fmt = file.split(".")
 
             if name == self.instance and fmt in self.DATA_FILES:
-                msa = read_fasta_file_as_list_of_pairs(f"{bb3_aligned_path}/{file}")
-                multiple_alignments.append(msa)
+                aligned_files.append(f"{bb3_aligned_path}/{file}")
 
-        if len(multiple_alignments) < 2:
+        if len(aligned_files) < 2:
             raise Exception("More than one pre-computed MSA is required")
 
+        cache_file = None
+        if self.cache_path is not None:
+            cache_file = os.path.join(
+                self.cache_path,
+                f"{self.instance}-{self._get_cache_key(release_file, aligned_files)}.npz",
+            )
+            population = self._load_from_cache(cache_file)
+
+            if population is not None:
+                LOGGER.info(f"Instance imported from cache {cache_file}")
+                self.sequences = population
+
+                return population
+
+        msa = read_fasta_file_as_list_of_pairs(release_file)
+        self.identifiers = list(pair[0] for pair in msa)
+        self.number_of_variables = len(self.identifiers)
+
         population = []
-        for msa in multiple_alignments:
+        for file in aligned_files:
+            msa = read_fasta_file_as_list_of_pairs(file)
             new_individual = MSASolution(self, msa)
             population.append(new_individual)
 
@@ -103,10 +131,155 @@ class BAliBASE(MSA):
 
         self.sequences = population
 
+        if cache_file is not None:
+            self._save_to_cache(cache_file, population)
+
         return population
 
+    def _get_cache_key(self, release_file: str, aligned_files: List[str]) -> str:
+        """Digest identifying the instance files (name, modification time and size) and the configuration of the
+        scores.
+        """
+        description = [self.CACHE_VERSION, self.instance]
+
+        for file in [release_file] + aligned_files:
+            stat = os.stat(file)
+            description.append((os.path.basename(file), stat.st_mtime_ns, stat.st_size))
+
+        description.extend(_describe(score) for score in self.score_list)
+
+        return hashlib.sha1(repr(description).encode()).hexdigest()
+
+    def _load_from_cache(self, cache_file: str) -> List[MSASolution]:
+        """Read the pre-processed alignments of a cache file.
+
+        :return: The evaluated alignments, or None if the file does not exist or can not be read.
+        """
+        if not os.path.isfile(cache_file):
+            return None
+
+        try:
+            with np.load(cache_file, allow_pickle=False) as data:
+                identifiers = data["identifiers"].tolist()
+                sequences = data["sequences"].tolist()
+                starts = data["starts"]
+                ends = data["ends"]
+                offsets = data["offsets"]
+                group_offsets = data["group_offsets"].tolist()
+                objectives = [
+                    data[f"objective_{i}"].tolist()
+                    for i in range(self.number_of_objectives)
+                ]
+        except (OSError, EOFError, KeyError, ValueError, zipfile.BadZipFile) as error:
+            LOGGER.warning(f"Ignoring the cache file {cache_file}: {error}")
+            return None
+
+        self.identifiers = identifiers
+        self.number_of_variables = len(identifiers)
+
+        population = []
+        for index in range(len(group_offsets) - 1):
+            begin, end = group_offsets[index], group_offsets[index + 1]
+            gaps_groups = GapsGroupsArray(
+                starts[begin:end], ends[begin:end], offsets[index]
+            ).to_lists()
+
+            individual = MSASolution.from_encoding(self, sequences, gaps_groups)
+            individual.objectives = [values[index] for values in objectives]
+            population.append(individual)
+
+        return population
+
+    def _save_to_cache(self, cache_file: str, population: List[MSASolution]) -> None:
+        """Write the pre-processed alignments to a cache file. The ungapped sequences, shared by all the
+        alignments, are stored once. The file is written under a temporary name and then renamed, so that
+        concurrent runs never read a partial file.
+        """
+        sequences = population[0].variables
+        if any(individual.variables != sequences for individual in population):
+            LOGGER.warning(
+                f"The alignments of {self.instance} have different sequences; they are not cached"
+            )
+            return
+
+        gaps_groups_arrays = [
+            individual.get_gaps_groups_array() for individual in population
+        ]
+
+        group_offsets = np.zeros(len(population) + 1, dtype=np.int64)
+        np.cumsum(
+            [len(gaps_groups.starts) for gaps_groups in gaps_groups_arrays],
+            out=group_offsets[1:],
+        )
+
+        arrays = {
+            "identifiers": np.array(self.identifiers),
+            "sequences": np.array(sequences),
+            "starts": np.concatenate(
+                [gaps_groups.starts for gaps_groups in gaps_groups_arrays]
+            ),
+            "ends": np.concatenate(
+                [gaps_groups.ends for gaps_groups in gaps_groups_arrays]
+            ),
+            "offsets": np.array(
+                [gaps_groups.offsets for gaps_groups in gaps_groups_arrays]
+            ),
+            "group_offsets": group_offsets,
+        }
+        # one array per score, so that integer objectives are restored as integers
+        for i in range(self.number_of_objectives):
+            arrays[f"objective_{i}"] = np.array(
+                [individual.objectives[i] for individual in population]
+            )
+
+        try:
+            os.makedirs(self.cache_path, exist_ok=True)
+            file = tempfile.NamedTemporaryFile(
+                dir=self.cache_path, suffix=".npz", delete=False
+            )
+
+            try:
+                with file:
+                    np.savez(file, **arrays)
+                os.replace(file.name, cache_file)
+            except BaseException:
+                os.unlink(file.name)
+                raise
+        except OSError as error:
+            LOGGER.warning(f"Unable to write the cache file {cache_file}: {error}")
+
     def _compute_path(self, directory: str) -> str:
         return os.path.join(self.path, directory, "RV" + self.instance[2:4] + "/")
 
     def get_name(self) -> str:
         return "BAliBASE v3.0"
+
+
+def _describe(value) -> object:
+    """Hashable description of the configuration of an object (e.g. a score and its substitution matrix)."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(_describe(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(
+            sorted((repr(key), _describe(item)) for key, item in value.items())
+        )
+
+    # public attributes and properties (private ones are caches)
+    attributes = {
+        name: item
+        for name, item in getattr(value, "__dict__", {}).items()
+        if not name.startswith("_")
+    }
+    for name in dir(type(value)):
+        if not name.startswith("_") and isinstance(
+            getattr(type(value), name), property
+        ):
+            attributes[name] = getattr(value, name)
+
+    attributes = tuple(
+        sorted((name, _describe(item)) for name, item in attributes.items())
+    )
+
+    return type(value).__module__, type(value).__qualname__, attributes
@@ -1,8 +1,10 @@
 from typing import List
 
+import numpy as np
+
 from kapylan.core.problem import MSAProblem
 from kapylan.core.solution import MSASolution
-from kapylan.problem.msa_problem.score import Score
+from kapylan.problem.msa_problem.score import FusedScores, ProfileScore, Score
 
 
 class MSA(MSAProblem):
@@ -14,6 +16,11 @@ class MSA(MSAProblem):
         self.score_list = score_list
         self.number_of_objectives = len(self.score_list)
 
+        # if every score can be derived from the column profiles, the alignment is read only once per evaluation
+        self.fused_scores = None
+        if all(isinstance(score, ProfileScore) for score in self.score_list):
+            self.fused_scores = FusedScores(self.score_list)
+
         self.sequences = []
         self.identifiers: list = []
         self.number_of_sequences = []
@@ -22,16 +29,117 @@ class MSA(MSAProblem):
         raise NotImplementedError()
 
     def evaluate(self, solution: MSASolution) -> MSASolution:
+        if self.fused_scores is not None:
+            return self.evaluate_batch([solution])[0]
+
         solution.remove_full_of_gaps_columns()
         sequences = solution.decode_alignment_as_list_of_sequences()
 
+        self.__set_objectives(
+            solution, [score.compute(sequences) for score in self.score_list]
+        )
+
+        return solution
+
+    def evaluate_batch(self, solutions: List[MSASolution]) -> List[MSASolution]:
+        """Evaluate a list of solutions. If every score can be derived from the column profiles, the columns to
+        score of all the solutions (only those modified since their last evaluation, if their column scores are
+        still valid) are joined in a single alignment and scored at once.
+        """
+        if self.fused_scores is None:
+            return super(MSA, self).evaluate_batch(solutions)
+
+        pending = []
+        for solution in solutions:
+            solution.remove_full_of_gaps_columns()
+
+            if not solution.is_valid_msa():
+                # let the scores report the unaligned sequences
+                self.fused_scores.compute(
+                    solution.decode_alignment_as_list_of_sequences()
+                )
+
+            try:
+                alignment = solution.decode_alignment_as_matrix()
+            except UnicodeEncodeError:
+                # chars that cannot be encoded as bytes are scored column by column
+                solution.invalidate_column_scores()
+                self.__set_objectives(
+                    solution,
+                    self.fused_scores.compute(
+                        solution.decode_alignment_as_list_of_sequences()
+                    ),
+                )
+                continue
+
+            columns = self.__get_columns_to_score(solution, alignment.shape[1])
+            if columns is not None:
+                alignment = alignment[:, columns]
+
+            pending.append((solution, columns, alignment))
+
+        if not pending:
+            return solutions
+
+        alignment = np.concatenate([alignment for _, _, alignment in pending], axis=1)
+        column_scores = (
+            self.fused_scores.compute_column_scores(alignment)
+            if alignment.shape[1] > 0
+            else np.empty((len(self.score_list), 0))
+        )
+
+        start = 0
+        for solution, columns, alignment in pending:
+            end = start + alignment.shape[1]
+            self.__update_column_scores(solution, columns, column_scores[:, start:end])
+            start = end
+
+            self.__set_objectives(
+                solution,
+                self.fused_scores.reduce_column_scores(
+                    solution.column_scores, solution.number_of_variables
+                ),
+            )
+
+        return solutions
+
+    def __get_columns_to_score(self, solution: MSASolution, length: int):
+        """Get the columns of a solution that must be scored.
+
+        :return: List of columns modified since the last evaluation, or None if every column must be scored.
+        """
+        column_scores = solution.column_scores
+
+        if (
+            column_scores is None
+            or solution.column_scores_key != self.fused_scores.key
+            or column_scores.shape[1] != length
+        ):
+            return None
+
+        return solution.get_dirty_columns()
+
+    def __update_column_scores(
+        self, solution: MSASolution, columns: list, column_scores: np.ndarray
+    ) -> None:
+        if columns is not None:
+            updated_column_scores = solution.column_scores
+
+            if columns:
+                # the cached array might be shared with other copies of the solution
+                updated_column_scores = updated_column_scores.copy()
+                updated_column_scores[:, columns] = column_scores
+
+            column_scores = updated_column_scores
+
+        solution.set_column_scores(column_scores, self.fused_scores.key)
+
+    def __set_objectives(self, solution: MSASolution, values: list) -> None:
         for i, score in enumerate(self.score_list):
-            solution.objectives[i] = score.compute(sequences)
+            solution.objectives[i] = values[i]
 
             if not score.is_minimization():
                 solution.objectives[i] = -solution.objectives[i]
 
-        return solution
-
     def get_name(self) -> str:
         return "Multiple Sequence Alignment problem"
@@ -8,14 +8,67 @@ import os
 import urllib.request
 from collections import Counter
 from pathlib import Path
+from typing import List, Tuple
 from urllib.error import HTTPError
 
+import numpy as np
+
 from kapylan.problem.msa_problem.substitution_matrix import SubstitutionMatrix, PAM250
 from kapylan.problem.msa_problem.tool import StrikeEx
 
 logger = logging.getLogger("pyMSA")
 
 
+def encode_alignment(align_sequences: list) -> np.ndarray:
+    """Encode a list of aligned sequences as a matrix of bytes, with one row per sequence.
+
+    :param align_sequences: List of sequences (as str) of the same length. An alignment that is already
+        encoded (e.g. by `MSASolution.decode_alignment_as_matrix`) is returned as it is.
+    :return: Array of shape (number of sequences, length of the alignment) and type uint8.
+    """
+    if isinstance(align_sequences, np.ndarray):
+        return align_sequences
+
+    length_of_sequence = len(align_sequences[0])
+    buffer = "".join(align_sequences).encode("latin-1")
+
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(
+        len(align_sequences), length_of_sequence
+    )
+
+
+def get_column_profiles(codes: np.ndarray, number_of_symbols: int) -> np.ndarray:
+    """Count how many times each symbol appears in each column of an alignment.
+
+    :param codes: Array of shape (number of sequences, length of the alignment) with the symbols encoded as
+        integers in [0, number_of_symbols).
+    :param number_of_symbols: Size of the alphabet.
+    :return: Array of shape (length of the alignment, number_of_symbols).
+    """
+    length_of_sequence = codes.shape[1]
+    offsets = codes + number_of_symbols * np.arange(length_of_sequence)
+
+    return np.bincount(
+        offsets.ravel(), minlength=length_of_sequence * number_of_symbols
+    ).reshape(length_of_sequence, number_of_symbols)
+
+
+def get_scores_column_by_column(score, align_sequences: list) -> np.ndarray:
+    """Compute the contribution of each column to a score with its `get_score_of_k_column` method.
+
+    :param score: Score scoring one column at a time.
+    :param align_sequences: List of sequences (as str) of the same length.
+    :return: Array of shape (length of the alignment,).
+    """
+    return np.array(
+        [
+            score.get_score_of_k_column([sequence[k] for sequence in align_sequences])
+            for k in range(len(align_sequences[0]))
+        ],
+        dtype=np.int64,
+    )
+
+
 class Score:
 
     __metaclass__ = ABCMeta
@@ -57,8 +110,178 @@ class Score:
         return type(self).__name__
 
 
-class Entropy(Score):
+class AlignmentProfile:
+    """Encoded alignment together with its column profiles (the number of times each symbol appears in each
+    column). It is computed once and shared by every :class:`ProfileScore` of the alignment.
+    """
+
+    def __init__(self, align_sequences: list, columns: list = None):
+        """
+        :param align_sequences: List of sequences (as str) of the same length, or the alignment encoded as a
+            matrix of bytes (see `encode_alignment`).
+        :param columns: Indexes of the columns to profile (all of them by default).
+        """
+        self.alignment = encode_alignment(align_sequences)
+        self._sequences = None
+
+        if columns is not None:
+            self.alignment = self.alignment[:, columns]
+        elif not isinstance(align_sequences, np.ndarray):
+            self._sequences = align_sequences
+
+        self.number_of_sequences, self.length_of_sequence = self.alignment.shape
+
+        # symbols are the bytes found in the alignment, in ascending order
+        present = np.bincount(self.alignment.ravel(), minlength=256) > 0
+        self.symbols = np.flatnonzero(present)
+        self.codes = (np.cumsum(present) - 1)[self.alignment]
+        self.counts = get_column_profiles(self.codes, len(self.symbols))
+
+    @property
+    def sequences(self) -> list:
+        """Aligned sequences (as str), decoded from the alignment matrix only if needed."""
+        if self._sequences is None:
+            self._sequences = [
+                row.tobytes().decode("latin-1") for row in self.alignment
+            ]
+
+        return self._sequences
+
+    def get_counts_of_char(self, char: str) -> np.ndarray:
+        """Returns the number of times a char appears in each column."""
+        index = np.searchsorted(self.symbols, ord(char))
+
+        if index < len(self.symbols) and self.symbols[index] == ord(char):
+            return self.counts[:, index]
+
+        return np.zeros(self.length_of_sequence, dtype=self.counts.dtype)
+
+    def get_scores(
+        self, substitution_matrix: SubstitutionMatrix
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Restrict a substitution matrix to the symbols of the alignment.
+
+        :param substitution_matrix: Matrix of scores such as PAM250, Blosum62, etc.
+        :return: Tuple (scores, defined) of square arrays indexed as the columns of the profiles.
+        """
+        rows = substitution_matrix.get_index_map()[self.symbols]
+        scores, defined = substitution_matrix.get_score_array()
+
+        return (
+            scores[np.ix_(rows, rows)].astype(np.int64),
+            defined[np.ix_(rows, rows)],
+        )
+
+
+class ProfileScore(Score):
+    """Class representing scores that can be computed from an :class:`AlignmentProfile`, so that several of them
+    can share a single pass over the alignment (see :class:`FusedScores`). The score of an alignment is obtained
+    from the independent contributions of its columns, which allows re-scoring only the columns that change.
+    """
+
+    __metaclass__ = ABCMeta
+
     def evaluate(self, align_sequences: list) -> float:
+        try:
+            profile = AlignmentProfile(align_sequences)
+        except UnicodeEncodeError:
+            return self._evaluate_by_columns(align_sequences)
+
+        return self.evaluate_profile(profile)
+
+    def evaluate_profile(self, profile: AlignmentProfile) -> float:
+        return self.reduce_column_scores(
+            self.get_column_scores(profile),
+            profile.number_of_sequences,
+        )
+
+    @abstractmethod
+    def get_column_scores(self, profile: AlignmentProfile) -> np.ndarray:
+        """Compute the contribution of each column of the profile to the score.
+
+        :return: Array of shape (length of the alignment,).
+        """
+        pass
+
+    def reduce_column_scores(
+        self, column_scores: np.ndarray, number_of_sequences: int
+    ) -> float:
+        """Compute the score of an alignment from the contributions of all its columns."""
+        return column_scores.sum()
+
+
+class FusedScores:
+    """Computes a list of scores of the same alignment from a single :class:`AlignmentProfile`."""
+
+    _instances = itertools.count()
+
+    def __init__(self, score_list: List[ProfileScore]):
+        self.score_list = score_list
+
+        # identifies the column scores computed by this object when they are cached elsewhere
+        self.key = "{0}-{1}".format(os.getpid(), next(self._instances))
+
+    def compute(self, align_sequences: list) -> list:
+        """Compute the scores.
+
+        :param align_sequences: List of sequences (as str).
+        :return: List with the value of each score.
+        """
+        if not all(
+            len(sequence) == len(align_sequences[0]) for sequence in align_sequences
+        ):
+            raise Exception("All the sequences in the FASTA file must be aligned!")
+
+        try:
+            profile = AlignmentProfile(align_sequences)
+        except UnicodeEncodeError:
+            return [score.evaluate(align_sequences) for score in self.score_list]
+
+        return [score.evaluate_profile(profile) for score in self.score_list]
+
+    def compute_column_scores(self, align_sequences: list, columns: list = None):
+        """Compute the contribution of each column to every score.
+
+        :param align_sequences: List of sequences (as str), or the alignment encoded as a matrix of bytes.
+        :param columns: Indexes of the columns to score (all of them by default).
+        :return: Array of shape (number of scores, number of columns).
+        """
+        if not isinstance(align_sequences, np.ndarray) and not all(
+            len(sequence) == len(align_sequences[0]) for sequence in align_sequences
+        ):
+            raise Exception("All the sequences in the FASTA file must be aligned!")
+
+        profile = AlignmentProfile(align_sequences, columns)
+        column_scores = np.empty((len(self.score_list), profile.length_of_sequence))
+
+        for i, score in enumerate(self.score_list):
+            column_scores[i] = score.get_column_scores(profile)
+
+        return column_scores
+
+    def reduce_column_scores(
+        self, column_scores: np.ndarray, number_of_sequences: int
+    ) -> list:
+        """Compute every score from the contributions of all the columns of the alignment."""
+        return [
+            score.reduce_column_scores(column_scores[i], number_of_sequences)
+            for i, score in enumerate(self.score_list)
+        ]
+
+
+class Entropy(ProfileScore):
+    def get_column_scores(self, profile: AlignmentProfile) -> np.ndarray:
+        frequencies = profile.counts / profile.number_of_sequences
+        logarithms = np.log(np.where(frequencies > 0, frequencies, 1))
+
+        return (frequencies * logarithms).sum(axis=1)
+
+    def reduce_column_scores(
+        self, column_scores: np.ndarray, number_of_sequences: int
+    ) -> float:
+        return float(column_scores.sum())
+
+    def _evaluate_by_columns(self, align_sequences: list) -> float:
         length_of_sequence = len(align_sequences[0])
         column = []
         final_score = 0
@@ -101,12 +324,28 @@ class Entropy(Score):
         return False
 
 
-class Star(Score):
+class Star(ProfileScore):
     def __init__(self, substitution_matrix: SubstitutionMatrix = PAM250()):
         super(Star, self).__init__()
         self.substitution_matrix = substitution_matrix
 
-    def evaluate(self, align_sequences: list) -> int:
+    def get_column_scores(self, profile: AlignmentProfile) -> np.ndarray:
+        scores, defined = profile.get_scores(self.substitution_matrix)
+        counts = profile.counts
+        most_frequent = self.get_most_frequent_symbols(profile.codes, counts)
+
+        if not (defined[most_frequent] | (counts == 0)).all():
+            # let the column-wise scoring report the missing pair
+            return get_scores_column_by_column(self, profile.sequences)
+
+        return (counts * scores[most_frequent]).sum(axis=1)
+
+    def reduce_column_scores(
+        self, column_scores: np.ndarray, number_of_sequences: int
+    ) -> int:
+        return int(column_scores.sum())
+
+    def _evaluate_by_columns(self, align_sequences: list) -> int:
         length_of_sequence = len(align_sequences[0])
         column = []
         final_score = 0
@@ -119,6 +358,20 @@ class Star(Score):
 
         return final_score
 
+    @staticmethod
+    def get_most_frequent_symbols(codes: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Find the most frequent symbol of each column. As in :meth:`Counter.most_common`, ties are resolved in
+        favour of the symbol that appears first in the column.
+
+        :param codes: Array of shape (number of sequences, length of the alignment) with the encoded symbols.
+        :param counts: Column profiles of the alignment (see :func:`get_column_profiles`).
+        :return: Array with the most frequent symbol of each column.
+        """
+        columns = np.arange(codes.shape[1])
+        is_most_frequent = counts[columns, codes] == counts.max(axis=1)
+
+        return codes[is_most_frequent.argmax(axis=0), columns]
+
     def get_score_of_k_column(self, column: list) -> int:
         """Compare the most frequent element of the column list with the others only one time.
 
@@ -141,12 +394,47 @@ class Star(Score):
         return False
 
 
-class SumOfPairs(Score):
-    def __init__(self, substitution_matrix: SubstitutionMatrix = PAM250()):
+class SumOfPairs(ProfileScore):
+    def __init__(
+        self,
+        substitution_matrix: SubstitutionMatrix = PAM250(),
+        use_column_profiles: bool = True,
+    ):
+        """
+        :param substitution_matrix: Matrix of scores such as PAM250, Blosum62, etc.
+        :param use_column_profiles: If True, the score of each column is computed from the number of times each
+            symbol (gaps included) appears in it, so the cost grows linearly with the number of sequences instead
+            of comparing every pair of them.
+        """
         super(SumOfPairs, self).__init__()
         self.substitution_matrix = substitution_matrix
+        self.use_column_profiles = use_column_profiles
+
+    def get_column_scores(self, profile: AlignmentProfile) -> np.ndarray:
+        scores, defined = profile.get_scores(self.substitution_matrix)
+
+        if not defined.all():
+            # let the column-wise scoring report the missing pair (if it is ever compared)
+            return get_scores_column_by_column(self, profile.sequences)
 
-    def evaluate(self, align_sequences: list) -> int:
+        if self.use_column_profiles:
+            return self.get_score_of_profiles(profile.counts, scores)
+
+        codes = profile.codes
+        column_scores = np.zeros(profile.length_of_sequence, dtype=np.int64)
+
+        # score each row against every row below it, all columns at once
+        for i in range(len(codes) - 1):
+            column_scores += scores[codes[i], codes[i + 1 :]].sum(axis=0)
+
+        return column_scores
+
+    def reduce_column_scores(
+        self, column_scores: np.ndarray, number_of_sequences: int
+    ) -> int:
+        return int(column_scores.sum())
+
+    def _evaluate_by_columns(self, align_sequences: list) -> int:
         length_of_sequence = len(align_sequences[0])
         column = []
         final_score = 0
@@ -159,6 +447,20 @@ class SumOfPairs(Score):
 
         return final_score
 
+    @staticmethod
+    def get_score_of_profiles(counts: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        """Compute the sum of pairs of a set of columns from their profiles. Every pair of different symbols a, b
+        contributes c_a * c_b * M[a, b] and every symbol a contributes c_a * (c_a - 1) / 2 * M[a, a].
+
+        :param counts: Array of shape (number of columns, number of symbols) with the count of each symbol.
+        :param scores: Square matrix with the score of each pair of symbols.
+        :return: Array with the sum of pairs of each column.
+        """
+        all_pairs = ((counts @ scores) * counts).sum(axis=1)
+        self_pairs = (counts * np.diagonal(scores)).sum(axis=1)
+
+        return (all_pairs - self_pairs) // 2
+
     def get_score_of_k_column(self, column: list) -> int:
         """Compare the each element of the column list with the others.
 
@@ -167,10 +469,32 @@ class SumOfPairs(Score):
         """
         score_of_column = 0
 
-        for char_a, char_b in self.__possible_combinations(column):
-            score_of_column += self.get_score_of_two_chars(
-                self.substitution_matrix, char_a, char_b
-            )
+        if self.use_column_profiles:
+            counts = list(Counter(column).items())
+
+            for i, (char_a, count_a) in enumerate(counts):
+                if count_a > 1:
+                    score_of_column += (
+                        count_a
+                        * (count_a - 1)
+                        // 2
+                        * self.get_score_of_two_chars(
+                            self.substitution_matrix, char_a, char_a
+                        )
+                    )
+                for char_b, count_b in counts[i + 1 :]:
+                    score_of_column += (
+                        count_a
+                        * count_b
+                        * self.get_score_of_two_chars(
+                            self.substitution_matrix, char_a, char_b
+                        )
+                    )
+        else:
+            for char_a, char_b in self.__possible_combinations(column):
+                score_of_column += self.get_score_of_two_chars(
+                    self.substitution_matrix, char_a, char_b
+                )
 
         logger.debug("Score of column: {0}".format(score_of_column))
         return score_of_column
@@ -184,7 +508,17 @@ class SumOfPairs(Score):
         return False
 
 
-class PercentageOfNonGaps(Score):
+class PercentageOfNonGaps(ProfileScore):
+    def get_column_scores(self, profile: AlignmentProfile) -> np.ndarray:
+        return profile.get_counts_of_char("-")
+
+    def reduce_column_scores(
+        self, column_scores: np.ndarray, number_of_sequences: int
+    ) -> float:
+        no_of_gaps = int(column_scores.sum())
+
+        return 100 - (no_of_gaps / (len(column_scores) * number_of_sequences) * 100)
+
     def evaluate(self, align_sequences: list) -> float:
         length_of_sequence = len(align_sequences[0])
         no_of_gaps = 0
@@ -204,8 +538,24 @@ class PercentageOfNonGaps(Score):
         return True
 
 
-class PercentageOfTotallyConservedColumns(Score):
-    def evaluate(self, align_sequences: list) -> float:
+class PercentageOfTotallyConservedColumns(ProfileScore):
+    def get_column_scores(self, profile: AlignmentProfile) -> np.ndarray:
+        return (profile.counts > 0).sum(axis=1) <= 1
+
+    def reduce_column_scores(
+        self, column_scores: np.ndarray, number_of_sequences: int
+    ) -> float:
+        no_of_conserved_columns = int(column_scores.sum())
+
+        logger.debug(
+            "Total number of conserved columns: {0} out of {1}".format(
+                no_of_conserved_columns, len(column_scores)
+            )
+        )
+
+        return no_of_conserved_columns / len(column_scores) * 100
+
+    def _evaluate_by_columns(self, align_sequences: list) -> float:
         length_sequence = len(align_sequences[0])
         no_of_conserved_columns = 0
         column = []
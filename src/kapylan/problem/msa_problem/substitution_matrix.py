@@ -1,5 +1,8 @@
 import re
 from abc import ABCMeta
+from typing import Tuple
+
+import numpy as np
 
 
 class SubstitutionMatrix:
@@ -7,41 +10,137 @@ class SubstitutionMatrix:
     __metaclass__ = ABCMeta
 
     def __init__(self, gap_penalty: int, gap_character: str):
+        self._index_map = None
+        self._scores = None
+        self._defined = None
+
         self.gap_penalty = gap_penalty
         self.gap_character = gap_character
         self.distance_matrix = dict()
 
+    # the score arrays are built from these attributes on first use, so setting any of them discards the arrays
+    # (the distance matrix must be replaced, not modified in place)
+
+    @property
+    def gap_penalty(self) -> int:
+        return self._gap_penalty
+
+    @gap_penalty.setter
+    def gap_penalty(self, gap_penalty: int) -> None:
+        self._gap_penalty = gap_penalty
+        self._clear_arrays()
+
+    @property
+    def gap_character(self) -> str:
+        return self._gap_character
+
+    @gap_character.setter
+    def gap_character(self, gap_character: str) -> None:
+        self._gap_character = gap_character
+        self._clear_arrays()
+
+    @property
+    def distance_matrix(self) -> dict:
+        return self._distance_matrix
+
+    @distance_matrix.setter
+    def distance_matrix(self, distance_matrix: dict) -> None:
+        self._distance_matrix = distance_matrix
+        self._clear_arrays()
+
     def get_distance(self, char1, char2) -> int:
         """Returns the distance between two characters.
 
         :param char1: First character.
         :param char2: Second character.
         :return: The distance value from the scoring matrix."""
+        if self._index_map is None:
+            self._build_arrays()
 
-        if char1 is self.gap_character and char2 is self.gap_character:
-            distance = 1
-        elif char1 is self.gap_character or char2 is self.gap_character:
-            distance = self.gap_penalty
-        else:
-            matrix = self.get_distance_matrix()
-            try:
-                distance = (
-                    matrix[(char1, char2)]
-                    if (char1, char2) in matrix
-                    else matrix[(char2, char1)]
-                )
-            except KeyError:
-                raise Exception(
-                    "The pair ({0},{1}) couldn't be found in the substitution matrix".format(
-                        char1, char2
-                    )
+        i = self._index_of(char1)
+        j = self._index_of(char2)
+
+        if not self._defined_rows[i][j]:
+            raise Exception(
+                "The pair ({0},{1}) couldn't be found in the substitution matrix".format(
+                    char1, char2
                 )
+            )
 
-        return distance
+        return self._score_rows[i][j]
 
     def get_distance_matrix(self) -> dict:
         return self.distance_matrix
 
+    def get_index_map(self) -> np.ndarray:
+        """Returns an array of 256 integers mapping each byte value to its row (and column) in the score array.
+        Bytes that are not in the matrix share a single row that only scores against the gap character.
+        """
+        if self._index_map is None:
+            self._build_arrays()
+
+        return self._index_map
+
+    def get_score_array(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the substitution matrix as a dense square array over its alphabet (plus the gap character and
+        unknown symbols), together with a boolean mask flagging which pairs have a score.
+
+        :return: Tuple (scores, defined)."""
+        if self._index_map is None:
+            self._build_arrays()
+
+        return self._scores, self._defined
+
+    def _index_of(self, char) -> int:
+        if char == self.gap_character:
+            return self._gap_index
+
+        return self._indices.get(char, self._unknown_index)
+
+    def _clear_arrays(self) -> None:
+        self._index_map = None
+        self._scores = None
+        self._defined = None
+
+    def _build_arrays(self) -> None:
+        matrix = self.get_distance_matrix()
+        alphabet = sorted(
+            {char for pair in matrix for char in pair if char != self.gap_character}
+        )
+        indices = {char: index for index, char in enumerate(alphabet)}
+        gap_index, unknown_index = len(alphabet), len(alphabet) + 1
+
+        dtype = np.array(list(matrix.values()) + [self.gap_penalty, 1]).dtype
+        scores = np.zeros((len(alphabet) + 2, len(alphabet) + 2), dtype=dtype)
+        defined = np.zeros(scores.shape, dtype=bool)
+
+        for (char1, char2), value in matrix.items():
+            if char1 in indices and char2 in indices:
+                scores[indices[char1], indices[char2]] = value
+                defined[indices[char1], indices[char2]] = True
+
+        # pairs are looked up as (char1, char2) first and as (char2, char1) otherwise
+        scores = np.where(defined, scores, scores.T)
+        defined = defined | defined.T
+
+        scores[gap_index, :] = scores[:, gap_index] = self.gap_penalty
+        scores[gap_index, gap_index] = 1
+        defined[gap_index, :] = defined[:, gap_index] = True
+
+        index_map = np.full(256, unknown_index, dtype=np.intp)
+        for char, index in indices.items():
+            if len(char) == 1 and ord(char) < 256:
+                index_map[ord(char)] = index
+        if len(self.gap_character) == 1 and ord(self.gap_character) < 256:
+            index_map[ord(self.gap_character)] = gap_index
+
+        self._indices = indices
+        self._gap_index, self._unknown_index = gap_index, unknown_index
+        self._score_rows = scores.tolist()
+        self._defined_rows = defined.tolist()
+
+        self._index_map, self._scores, self._defined = index_map, scores, defined
+
 
 class FileMatrix(SubstitutionMatrix):
     """Read blast/matrix from file
@@ -1,7 +1,10 @@
+import bisect
+import heapq
 from abc import ABC, abstractmethod
 from typing import Generic, List, TypeVar
 
 from kapylan.util.comparator import Comparator, DominanceComparator
+from kapylan.util.constraint_handling import overall_constraint_violation_degree
 
 S = TypeVar("S")
 
@@ -58,3 +61,476 @@ class NonDominatedSolutionsArchive(Archive[S]):
             return True
 
         return False
+
+
+class SortedFront:
+    """Bi-objective non-dominated points sorted by the first objective (so the second one decreases)."""
+
+    def __init__(self):
+        self.firsts = []
+        self.seconds = []
+        self.keys = []
+
+    def update(self, point: tuple, key) -> tuple:
+        """Add a point unless it is dominated by, or equal to, another one.
+
+        :return: Whether the point has been added and the keys of the points it dominates.
+        """
+        index = bisect.bisect_right(self.firsts, point[0])
+        if index > 0 and self.seconds[index - 1] <= point[1]:
+            return False, []
+
+        # the dominated points follow the new one: not better in the first objective and worse in the second
+        start = bisect.bisect_left(self.firsts, point[0])
+        end = start
+        while end < len(self.seconds) and self.seconds[end] >= point[1]:
+            end += 1
+
+        removed = self.keys[start:end]
+        self.firsts[start:end] = [point[0]]
+        self.seconds[start:end] = [point[1]]
+        self.keys[start:end] = [key]
+
+        return True, removed
+
+    def remove(self, point: tuple, key):
+        index = bisect.bisect_left(self.firsts, point[0])
+        if index == len(self.keys) or self.keys[index] != key:
+            raise Exception("Point not found: {0}".format(point))
+
+        del self.firsts[index]
+        del self.seconds[index]
+        del self.keys[index]
+
+
+class NDTreeNode:
+    def __init__(self, point: tuple):
+        self.points = []
+        self.keys = []
+        self.children = None
+        self.ideal = list(point)
+        self.nadir = list(point)
+
+    def is_leaf(self) -> bool:
+        return self.children is None
+
+    def is_empty(self) -> bool:
+        return len(self.points) == 0 if self.is_leaf() else len(self.children) == 0
+
+    def get_keys(self) -> list:
+        if self.is_leaf():
+            return list(self.keys)
+
+        return [key for child in self.children for key in child.get_keys()]
+
+    def update_bounds(self, point: tuple):
+        for i, value in enumerate(point):
+            if value < self.ideal[i]:
+                self.ideal[i] = value
+            if value > self.nadir[i]:
+                self.nadir[i] = value
+
+    def get_distance_to_middle(self, point: tuple) -> float:
+        return sum(
+            (value - (low + high) / 2.0) ** 2
+            for value, low, high in zip(point, self.ideal, self.nadir)
+        )
+
+
+class NDTree:
+    """Non-dominated points stored in a tree whose nodes keep bounds (ideal and nadir points) of the points below
+    them, so most of the nodes are discarded without comparing against their points, see [Jaszkiewicz2018]_.
+    Bounds are not tightened on removals, so they are conservative.
+    """
+
+    def __init__(self, max_leaf_size: int = 20, number_of_children: int = None):
+        self.max_leaf_size = max_leaf_size
+        self.number_of_children = number_of_children
+        self.root = None
+
+    def update(self, point: tuple, key) -> tuple:
+        """Add a point unless it is dominated by, or equal to, another one.
+
+        :return: Whether the point has been added and the keys of the points it dominates.
+        """
+        removed = []
+
+        if self.root is not None:
+            if not self.__update_node(self.root, point, removed):
+                return False, []
+
+            if self.root.is_empty():
+                self.root = None
+
+        if self.root is None:
+            self.root = NDTreeNode(point)
+
+        self.__insert(self.root, point, key)
+
+        return True, removed
+
+    def remove(self, point: tuple, key):
+        if self.root is None or not self.__remove_from_node(self.root, point, key):
+            raise Exception("Point not found: {0}".format(point))
+
+        if self.root.is_empty():
+            self.root = None
+
+    def __remove_from_node(self, node: NDTreeNode, point: tuple, key) -> bool:
+        if not all(
+            low <= value <= high
+            for low, value, high in zip(node.ideal, point, node.nadir)
+        ):
+            return False
+
+        if node.is_leaf():
+            if key not in node.keys:
+                return False
+
+            index = node.keys.index(key)
+            del node.points[index]
+            del node.keys[index]
+            return True
+
+        for child in node.children:
+            if self.__remove_from_node(child, point, key):
+                if child.is_empty():
+                    node.children.remove(child)
+                self.__collapse(node)
+                return True
+
+        return False
+
+    @staticmethod
+    def __collapse(node: NDTreeNode):
+        if not node.is_leaf() and len(node.children) == 1:
+            child = node.children[0]
+            node.points, node.keys, node.children = (
+                child.points,
+                child.keys,
+                child.children,
+            )
+
+    def __update_node(self, node: NDTreeNode, point: tuple, removed: list) -> bool:
+        """Remove the points of the node dominated by the given one.
+
+        :return: False if a point of the node dominates, or is equal to, the given point.
+        """
+        if all(high <= value for high, value in zip(node.nadir, point)):
+            return False
+
+        may_dominate = all(low <= value for low, value in zip(node.ideal, point))
+        may_be_dominated = all(value <= high for value, high in zip(point, node.nadir))
+
+        if all(value <= low for value, low in zip(point, node.ideal)) and list(
+            point
+        ) != list(node.ideal):
+            removed.extend(node.get_keys())
+            node.points, node.keys, node.children = [], [], None
+            return True
+
+        if not may_dominate and not may_be_dominated:
+            return True
+
+        if node.is_leaf():
+            index = 0
+            while index < len(node.points):
+                other = node.points[index]
+                if all(a <= b for a, b in zip(other, point)):
+                    return False
+
+                if all(a <= b for a, b in zip(point, other)):
+                    removed.append(node.keys[index])
+                    del node.points[index]
+                    del node.keys[index]
+                else:
+                    index += 1
+        else:
+            for child in list(node.children):
+                if not self.__update_node(child, point, removed):
+                    return False
+                if child.is_empty():
+                    node.children.remove(child)
+
+            self.__collapse(node)
+
+        return True
+
+    def __insert(self, node: NDTreeNode, point: tuple, key):
+        node.update_bounds(point)
+
+        if node.is_leaf():
+            node.points.append(point)
+            node.keys.append(key)
+
+            if len(node.points) > self.max_leaf_size:
+                self.__split(node)
+        else:
+            child = min(node.children, key=lambda c: c.get_distance_to_middle(point))
+            self.__insert(child, point, key)
+
+    def __split(self, node: NDTreeNode):
+        """Split a leaf in children grouping its points around seeds which are far from each other."""
+        points = node.points
+        number_of_children = self.number_of_children or len(points[0]) + 1
+
+        def distance(a, b):
+            return sum((x - y) ** 2 for x, y in zip(a, b))
+
+        seeds = [
+            max(
+                range(len(points)),
+                key=lambda i: sum(distance(points[i], other) for other in points),
+            )
+        ]
+        while len(seeds) < number_of_children:
+            seeds.append(
+                max(
+                    range(len(points)),
+                    key=lambda i: min(distance(points[i], points[s]) for s in seeds),
+                )
+            )
+
+        children = [NDTreeNode(points[seed]) for seed in seeds]
+        for point, key in zip(points, node.keys):
+            child = children[
+                min(range(len(seeds)), key=lambda s: distance(point, points[seeds[s]]))
+            ]
+            child.update_bounds(point)
+            child.points.append(point)
+            child.keys.append(key)
+
+        node.points, node.keys = [], []
+        node.children = [child for child in children if not child.is_empty()]
+
+
+class NDTreeArchive(Archive[S]):
+    """Non-dominated archive with the semantics of :class:`NonDominatedSolutionsArchive` (using a
+    :class:`DominanceComparator`) whose dominance checks do not compare against every member. Two-objective
+    points are kept in a sorted list and the rest in an ND-tree. Solutions are listed in insertion order.
+    """
+
+    def __init__(self, max_leaf_size: int = 20):
+        self.max_leaf_size = max_leaf_size
+        self.solutions = {}
+        self.points = {}
+        self.index = None
+        self.violation = None
+        self.number_of_insertions = 0
+        self.__solution_list = None
+        super(NDTreeArchive, self).__init__()
+
+    @property
+    def solution_list(self) -> List[S]:
+        if self.__solution_list is None:
+            self.__solution_list = list(self.solutions.values())
+
+        return self.__solution_list
+
+    @solution_list.setter
+    def solution_list(self, solution_list: List[S]):
+        self._clear()
+        self.index = None
+        self.violation = None
+
+        for solution in solution_list:
+            self.add(solution)
+
+    def add(self, solution: S) -> bool:
+        violation = overall_constraint_violation_degree(solution)
+
+        if self.violation is None or violation > self.violation:
+            # a more feasible solution dominates every member
+            self._clear()
+            self.violation = violation
+            if solution.number_of_objectives == 2:
+                self.index = SortedFront()
+            else:
+                self.index = NDTree(self.max_leaf_size)
+        elif violation < self.violation:
+            return False
+
+        key = self.number_of_insertions
+        point = tuple(solution.objectives)
+        is_added, removed = self.index.update(point, key)
+        if not is_added:
+            return False
+
+        for removed_key in removed:
+            self._remove_member(removed_key)
+        self._add_member(key, point, solution)
+        self.number_of_insertions += 1
+
+        return True
+
+    def remove(self, key: int):
+        """Remove a member given its insertion key."""
+        self.index.remove(self.points[key], key)
+        self._remove_member(key)
+
+    def size(self) -> int:
+        return len(self.solutions)
+
+    def _add_member(self, key: int, point: tuple, solution: S):
+        self.solutions[key] = solution
+        self.points[key] = point
+        self.__solution_list = None
+
+    def _remove_member(self, key: int):
+        del self.solutions[key]
+        del self.points[key]
+        self.__solution_list = None
+
+    def _clear(self):
+        self.solutions = {}
+        self.points = {}
+        self.__solution_list = None
+
+
+class CrowdingDistanceArchive(NDTreeArchive[S]):
+    """Non-dominated archive bounded to a maximum size: when it overflows, the member with the lowest crowding
+    distance (the most crowded one) is removed. Members are kept sorted by each objective, so adding or removing
+    one only updates the distances of its neighbours, unless the bounds of some objective change.
+    """
+
+    def __init__(self, maximum_size: int, max_leaf_size: int = 20):
+        self.maximum_size = maximum_size
+        self.sorted_objectives = []
+        self.distances = {}
+        self.stamps = {}
+        self.heap = []
+        # key of each member by the id of the solution, to get its distance without scanning the archive
+        self.keys = {}
+        super(CrowdingDistanceArchive, self).__init__(max_leaf_size)
+
+    def add(self, solution: S) -> bool:
+        if not super(CrowdingDistanceArchive, self).add(solution):
+            return False
+
+        key = self.number_of_insertions - 1
+        if self.size() > self.maximum_size:
+            self.remove(self.__get_most_crowded())
+
+        return key in self.solutions
+
+    def get_crowding_distance(self, solution: S) -> float:
+        key = self.keys.get(id(solution))
+        if key is None:
+            raise Exception("Solution not in the archive")
+
+        return self.distances[key]
+
+    def compute_density_estimator(self):
+        """Store the crowding distance of each member in its attributes."""
+        for key, solution in self.solutions.items():
+            solution.attributes["crowding_distance"] = self.distances[key]
+
+    def _add_member(self, key: int, point: tuple, solution: S):
+        super(CrowdingDistanceArchive, self)._add_member(key, point, solution)
+        self.keys[id(solution)] = key
+
+        if not self.sorted_objectives:
+            self.sorted_objectives = [[] for _ in point]
+
+        affected = {key}
+        is_bound = False
+        for i, values in enumerate(self.sorted_objectives):
+            entry = self.__get_entry(point, key, i)
+            position = bisect.bisect_left(values, entry)
+            values.insert(position, entry)
+
+            is_bound = is_bound or position == 0 or position == len(values) - 1
+            affected.update(self.__get_neighbours(values, position, 1))
+
+        self.__update_distances(None if is_bound else affected)
+
+    def _remove_member(self, key: int):
+        point = self.points[key]
+        if self.keys.get(id(self.solutions[key])) == key:
+            del self.keys[id(self.solutions[key])]
+        super(CrowdingDistanceArchive, self)._remove_member(key)
+        del self.distances[key]
+        del self.stamps[key]
+
+        affected = set()
+        is_bound = False
+        for i, values in enumerate(self.sorted_objectives):
+            position = bisect.bisect_left(values, self.__get_entry(point, key, i))
+            is_bound = is_bound or position == 0 or position == len(values) - 1
+            del values[position]
+
+            affected.update(self.__get_neighbours(values, position, 0))
+
+        self.__update_distances(None if is_bound else affected)
+
+    def _clear(self):
+        super(CrowdingDistanceArchive, self)._clear()
+        self.sorted_objectives = []
+        self.distances = {}
+        self.stamps = {}
+        self.heap = []
+        self.keys = {}
+
+    @staticmethod
+    def __get_entry(point: tuple, key: int, objective: int) -> tuple:
+        """Sort key of a member in the list of an objective. As in :class:`CrowdingDistance`, each objective sorts
+        the members as left by the previous one, so ties are ordered by the previous objectives and then by
+        insertion.
+        """
+        return point[objective::-1] + (key,)
+
+    @staticmethod
+    def __get_neighbours(values: list, position: int, offset: int) -> list:
+        """Keys of the members around a position, skipping `offset` elements."""
+        neighbours = []
+        if position > 0:
+            neighbours.append(values[position - 1][-1])
+        if position + offset < len(values):
+            neighbours.append(values[position + offset][-1])
+
+        return neighbours
+
+    def __update_distances(self, affected: set = None):
+        """Recompute the crowding distances of the given members, or of all of them if None."""
+        if (
+            affected is None
+            or self.size() <= 3
+            or len(self.heap) > 4 * self.size() + len(affected)
+        ):
+            # stale entries are dropped when rebuilding the heap
+            affected = self.solutions.keys()
+            self.heap = []
+
+        for key in affected:
+            self.distances[key] = self.__get_distance(key)
+            self.stamps[key] = self.stamps.get(key, -1) + 1
+            heapq.heappush(self.heap, (self.distances[key], -key, self.stamps[key]))
+
+    def __get_distance(self, key: int) -> float:
+        if self.size() <= 2:
+            return float("inf")
+
+        point = self.points[key]
+        distance = 0.0
+        for i, values in enumerate(self.sorted_objectives):
+            position = bisect.bisect_left(values, self.__get_entry(point, key, i))
+            if position == 0 or position == len(values) - 1:
+                return float("inf")
+
+            difference = values[position + 1][0] - values[position - 1][0]
+            objective_range = values[-1][0] - values[0][0]
+            if objective_range != 0:
+                difference = difference / objective_range
+            distance += difference
+
+        return distance
+
+    def __get_most_crowded(self) -> int:
+        """Key of the member with the lowest crowding distance (the newest one on ties)."""
+        while True:
+            distance, key, stamp = self.heap[0]
+            key = -key
+            if key in self.stamps and self.stamps[key] == stamp:
+                return key
+
+            heapq.heappop(self.heap)
@@ -1,13 +1,15 @@
+import heapq
 import logging
 from abc import ABC, abstractmethod
-from functools import cmp_to_key
-from typing import TypeVar
+from typing import List, TypeVar
 
+import numpy as np
 import rdflib
 from rdflib import XSD
 
 from kapylan.annotation.component_annotation import DensityEstimatorComponent
 from kapylan.annotation.ontology import ontology
+from kapylan.core.quality_indicator import HyperVolume, WFGHyperVolume
 from kapylan.util.comparator import SolutionAttributeComparator, Comparator
 
 TITAN = ontology(uri="http://www.ontologies.khaos.uma.es/titan-kaplan/")
@@ -28,6 +30,24 @@ class DensityEstimator(list, ABC):
     def sort(self, solutions: list) -> list:
         pass
 
+    def truncate(self, solutions: list, size: int) -> list:
+        """Remove, one by one, the worst solution according to the density estimator (recomputed after each
+        removal) until the list has the given size.
+
+        :param solutions: The list of solutions, with the density estimator computed.
+        :param size: Number of solutions to keep.
+        :return: The list with the remaining solutions.
+        """
+        result_list = list(solutions)
+
+        while len(result_list) > size:
+            self.sort(result_list)
+
+            del result_list[-1]
+            self.compute_density_estimator(result_list)
+
+        return result_list
+
     @classmethod
     def get_comparator(cls) -> Comparator:
         pass
@@ -60,36 +80,166 @@ class CrowdingDistance(DensityEstimator):
             front[1].attributes["crowding_distance"] = float("inf")
             return
 
-        for i in range(len(front)):
-            front[i].attributes["crowding_distance"] = 0.0
+        objectives = np.array([solution.objectives for solution in front], dtype=float)
+        distances = np.zeros(size)
 
-        number_of_objectives = front[0].number_of_objectives
+        # each objective sorts the front as left by the previous one, so ties keep that order
+        order = np.arange(size)
+        for i in range(front[0].number_of_objectives):
+            order = order[np.argsort(objectives[order, i], kind="stable")]
+            values = objectives[order, i]
+            objective_range = values[-1] - values[0]
 
-        for i in range(number_of_objectives):
-            # Sort the population by Obj n
-            front = sorted(front, key=lambda x: x.objectives[i])
-            objective_minn = front[0].objectives[i]
-            objective_maxn = front[len(front) - 1].objectives[i]
+            distance = values[2:] - values[:-2]
+            # Check if minimum and maximum are the same (in which case do nothing)
+            if objective_range != 0:
+                distance = distance / objective_range
 
-            # Set de crowding distance
-            front[0].attributes["crowding_distance"] = float("inf")
-            front[size - 1].attributes["crowding_distance"] = float("inf")
+            distances[order[1:-1]] += distance
+            distances[order[[0, -1]]] = float("inf")
 
-            for j in range(1, size - 1):
-                distance = front[j + 1].objectives[i] - front[j - 1].objectives[i]
+        for solution, distance in zip(front, distances.tolist()):
+            solution.attributes["crowding_distance"] = distance
 
-                # Check if minimum and maximum are the same (in which case do nothing)
-                if objective_maxn - objective_minn == 0:
-                    pass
-                    # LOGGER.warning('Minimum and maximum are the same!')
-                else:
-                    distance = distance / (objective_maxn - objective_minn)
+    def sort(self, solutions: list) -> list:
+        # solutions without a computed distance are sorted as if it was zero, instead of failing
+        solutions.sort(
+            key=lambda x: x.attributes.get("crowding_distance", 0.0), reverse=True
+        )
 
-                distance += front[j].attributes["crowding_distance"]
-                front[j].attributes["crowding_distance"] = distance
+    def truncate(self, solutions: list, size: int) -> list:
+        """Remove, one by one, the solution with the lowest crowding distance until the list has the given size,
+        with the same result (order included) as :meth:`DensityEstimator.truncate`. Removing an inner solution
+        only changes the distances of its neighbours, so they are the only ones recomputed and a heap gives the
+        next one to remove. If some objective has tied values, the order of the list decides the neighbours of
+        the tied solutions, so they are removed with :meth:`DensityEstimator.truncate` instead.
 
-    def sort(self, solutions: list) -> list:
-        solutions.sort(key=cmp_to_key(self.get_comparator().compare))
+        :param solutions: The list of solutions.
+        :param size: Number of solutions to keep.
+        :return: The list with the remaining solutions.
+        """
+        if len(solutions) <= size:
+            return list(solutions)
+
+        objectives = [[float(value) for value in s.objectives] for s in solutions]
+
+        sorted_objectives = np.sort(np.array(objectives), axis=0)
+        if (sorted_objectives[1:] == sorted_objectives[:-1]).any():
+            self.compute_density_estimator(solutions)
+            return super(CrowdingDistance, self).truncate(solutions, size)
+
+        alive = [True] * len(solutions)
+        remaining = len(solutions)
+        step = 0
+
+        neighbours, distances = self.__get_neighbours(objectives, alive)
+        histories = [(0, distance, None) for distance in distances]
+        stamps = [0] * len(solutions)
+        heap = [
+            (distance, _DistanceHistory(j, histories[j]), 0)
+            for j, distance in enumerate(distances)
+        ]
+        heapq.heapify(heap)
+
+        while remaining > size:
+            distance, history, stamp = heapq.heappop(heap)
+            j = history.index
+            if not alive[j] or stamp != stamps[j]:
+                continue
+
+            alive[j] = False
+            remaining -= 1
+            step += 1
+
+            if distance == float("inf") or remaining <= 2:
+                # the bounds of some objective change: every distance does
+                neighbours, distances = self.__get_neighbours(objectives, alive)
+                affected = [k for k in range(len(solutions)) if alive[k]]
+            else:
+                affected = set()
+                for previous, following, _ in neighbours:
+                    p, q = previous[j], following[j]
+                    following[p] = q
+                    previous[q] = p
+                    affected.update((p, q))
+
+                for k in affected:
+                    distances[k] = self.__get_distance(objectives, neighbours, k)
+
+            for k in affected:
+                if distances[k] != histories[k][1]:
+                    histories[k] = (step, distances[k], histories[k])
+                    stamps[k] += 1
+                    heapq.heappush(
+                        heap,
+                        (distances[k], _DistanceHistory(k, histories[k]), stamps[k]),
+                    )
+
+        # the one by one truncation leaves the list sorted as it was before the last removal
+        result = []
+        for j in range(len(solutions)):
+            if alive[j]:
+                history = histories[j] if histories[j][0] < step else histories[j][2]
+                result.append(_DistanceHistory(j, history))
+        result.sort(reverse=True)
+
+        result_list = []
+        for history in result:
+            solution = solutions[history.index]
+            solution.attributes["crowding_distance"] = distances[history.index]
+            result_list.append(solution)
+
+        return result_list
+
+    @staticmethod
+    def __get_neighbours(objectives: list, alive: list) -> tuple:
+        """Link each solution to the previous and following ones when sorting by each objective, in the same
+        order as :meth:`compute_density_estimator`.
+
+        :return: For each objective, the previous and following solutions and its range; and the distances.
+        """
+        indexes = np.flatnonzero(alive)
+        distances = [float("inf")] * len(objectives)
+
+        if len(indexes) <= 2:
+            return [], distances
+
+        values = np.array(objectives)[indexes]
+        neighbours = []
+        order = np.arange(len(indexes))
+        for i in range(values.shape[1]):
+            order = order[np.argsort(values[order, i], kind="stable")]
+            sorted_indexes = indexes[order].tolist()
+
+            previous = [-1] * len(objectives)
+            following = [-1] * len(objectives)
+            for p, q in zip(sorted_indexes[:-1], sorted_indexes[1:]):
+                following[p] = q
+                previous[q] = p
+
+            objective_range = values[order[-1], i] - values[order[0], i]
+            neighbours.append((previous, following, float(objective_range)))
+
+        for k in indexes.tolist():
+            distances[k] = CrowdingDistance.__get_distance(objectives, neighbours, k)
+
+        return neighbours, distances
+
+    @staticmethod
+    def __get_distance(objectives: list, neighbours: list, k: int) -> float:
+        distance = 0.0
+        for i, (previous, following, objective_range) in enumerate(neighbours):
+            p, q = previous[k], following[k]
+            if p == -1 or q == -1:
+                return float("inf")
+
+            difference = objectives[q][i] - objectives[p][i]
+            # Check if minimum and maximum are the same (in which case do nothing)
+            if objective_range != 0:
+                difference = difference / objective_range
+            distance += difference
+
+        return distance
 
     @classmethod
     def get_comparator(cls) -> Comparator:
@@ -97,3 +247,271 @@ class CrowdingDistance(DensityEstimator):
 
     def get_name(self) -> str:
         return "Crowding distance"
+
+
+class _DistanceHistory:
+    """Crowding distances taken by a solution along :meth:`CrowdingDistance.truncate`, as a linked list of
+    (step, distance, previous) nodes, newest first. Each removal of :meth:`DensityEstimator.truncate` sorts the
+    list by the current distances, keeping the previous order on ties, so a solution goes after another one in
+    the list if its distance was lower at the last step where they differ (or, if they never did, its index is
+    greater). Solutions going last are removed first on ties, so `a < b` means that `a` goes after `b`.
+    """
+
+    __slots__ = ("index", "node")
+
+    def __init__(self, index: int, node: tuple):
+        self.index = index
+        self.node = node
+
+    def __lt__(self, other: "_DistanceHistory") -> bool:
+        node, other_node = self.node, other.node
+
+        while node[1] == other_node[1]:
+            step = max(node[0], other_node[0])
+            if step == 0:
+                return self.index > other.index
+
+            if node[0] == step:
+                node = node[2]
+            if other_node[0] == step:
+                other_node = other_node[2]
+
+        return node[1] < other_node[1]
+
+
+def get_hypervolume(points: np.ndarray, reference_point: np.ndarray) -> float:
+    """Hypervolume dominated by a set of points (dominated ones included) and bounded by the reference point."""
+    points = points[(points <= reference_point).all(axis=1)]
+
+    if len(points) == 0:
+        return 0.0
+    elif points.shape[1] == 2:
+        return HyperVolume._hv_2d(points, reference_point)
+    elif points.shape[1] == 3:
+        return HyperVolume._hv_3d(points, reference_point)
+
+    return WFGHyperVolume(reference_point).compute(points)
+
+
+class HypervolumeContributions:
+    """Exclusive hypervolume contribution of each point of a set, i.e., the hypervolume lost when removing it.
+    Points can be removed or added afterwards: the contribution of a point `r` only changes if the box of
+    max(r, p), p being the removed or added point, is not dominated by another point, so only those points are
+    recomputed. With two objectives and no dominated points, every contribution comes from the neighbours in
+    the staircase of the front, and recomputing all of them is cheaper than finding the affected ones.
+    """
+
+    def __init__(self, points: np.ndarray, reference_point: np.ndarray):
+        self.points = np.asarray(points, dtype=float).reshape(-1, len(reference_point))
+        self.reference_point = np.asarray(reference_point, dtype=float)
+        self.is_alive = np.ones(len(self.points), dtype=bool)
+        self.contributions = self.__compute_all()
+
+    def remove(self, index: int):
+        self.is_alive[index] = False
+        self.contributions[index] = 0.0
+        self.__update(index)
+
+    def add(self, point: list) -> int:
+        """
+        :return: Index of the new point.
+        """
+        index = len(self.points)
+        self.points = np.vstack((self.points, np.asarray(point, dtype=float)))
+        self.is_alive = np.append(self.is_alive, True)
+        self.contributions = np.append(self.contributions, 0.0)
+
+        self.contributions[index] = self.__compute(index)
+        self.__update(index)
+
+        return index
+
+    def __update(self, index: int):
+        """Recompute the contributions that depend on the given point."""
+        if self.points.shape[1] == 2:
+            contributions = self.__compute_staircase()
+            if contributions is not None:
+                self.contributions = contributions
+                return
+
+        for r in self.__get_affected(index):
+            self.contributions[r] = self.__compute(r)
+
+    def __compute(self, index: int) -> float:
+        point = self.points[index]
+        alive = np.flatnonzero(self.is_alive)
+        others = self.points[alive[alive != index]]
+
+        volume = float(np.prod(np.maximum(self.reference_point - point, 0.0)))
+        if volume == 0.0 or len(others) == 0:
+            return volume
+
+        # the part of its box also dominated by other point
+        return volume - get_hypervolume(np.maximum(others, point), self.reference_point)
+
+    def __compute_all(self) -> np.ndarray:
+        contributions = None
+        if self.points.shape[1] == 2:
+            contributions = self.__compute_staircase()
+
+        if contributions is None:
+            contributions = np.zeros(len(self.points))
+            for index in np.flatnonzero(self.is_alive):
+                contributions[index] = self.__compute(index)
+
+        return contributions
+
+    def __compute_staircase(self):
+        """Contributions of a bi-objective set sorted by the first objective, where the box of each point only
+        overlaps those of its neighbours.
+
+        :return: The contributions, or None if some point is dominated by other (it takes part of the boxes).
+        """
+        alive = np.flatnonzero(self.is_alive)
+        contributions = np.zeros(len(self.points))
+
+        points = self.points[alive]
+        order = np.lexsort((points[:, 1], points[:, 0]))
+        xs, ys = points[order, 0], points[order, 1]
+
+        is_first_copy = np.ones(len(order), dtype=bool)
+        is_first_copy[1:] = (xs[1:] != xs[:-1]) | (ys[1:] != ys[:-1])
+        previous_lowest = np.concatenate(([np.inf], np.minimum.accumulate(ys)[:-1]))
+        is_staircase = is_first_copy & (ys < previous_lowest)
+
+        if not (is_staircase | ~is_first_copy).all():
+            return None
+
+        # copies of a point contribute nothing
+        is_duplicated = np.zeros(len(order), dtype=bool)
+        is_duplicated[:-1] |= ~is_first_copy[1:]
+        is_duplicated[1:] |= ~is_first_copy[1:]
+
+        staircase = np.flatnonzero(is_staircase)
+        staircase = staircase[
+            (xs[staircase] <= self.reference_point[0])
+            & (ys[staircase] <= self.reference_point[1])
+        ]
+        following_x = np.append(xs[staircase][1:], self.reference_point[0])
+        previous_y = np.insert(ys[staircase][:-1], 0, self.reference_point[1])
+        widths = following_x - xs[staircase]
+        heights = previous_y - ys[staircase]
+
+        contributions[alive[order[staircase]]] = np.where(
+            is_duplicated[staircase], 0.0, widths * heights
+        )
+
+        return contributions
+
+    def __get_affected(self, index: int) -> list:
+        """Alive points whose contribution depends on the given point."""
+        others = np.flatnonzero(self.is_alive)
+        others = others[others != index]
+        corners = np.maximum(self.points[others], self.points[index])
+
+        # [r, q] is True if point q dominates the corner of r
+        is_covered = (self.points[others][None, :, :] <= corners[:, None, :]).all(
+            axis=2
+        )
+        np.fill_diagonal(is_covered, False)
+
+        is_inside = (corners < self.reference_point).all(axis=1)
+
+        return others[is_inside & ~is_covered.any(axis=1)].tolist()
+
+
+@DensityEstimatorComponent(
+    hasImplementation=TITAN.namespace.ImplementationHypervolumeContribution,
+    label=rdflib.Literal(
+        "Hypervolume Contribution Density Estimator", datatype=XSD.string
+    ),
+)
+class HypervolumeContribution(DensityEstimator):
+    """This class implements a DensityEstimator based on the exclusive hypervolume contribution of each solution,
+    as in SMS-EMOA. If no reference point is given, the worst value of each objective in the front plus an
+    offset is used.
+    """
+
+    def __init__(self, reference_point: List[float] = None, offset: float = 1.0):
+        self.reference_point = reference_point
+        self.offset = offset
+
+        # contributions of the last list given to `compute_density_estimator`, reused if it is truncated next
+        self.__last_solutions = None
+        self.__last_contributions = None
+
+    def compute_density_estimator(self, front: list):
+        """This function computes the hypervolume contribution of every solution of the list.
+
+        :param front: The list of solutions.
+        """
+        if len(front) == 0:
+            return
+
+        contributions = self.__get_contributions(front)
+        for solution, contribution in zip(front, contributions.contributions.tolist()):
+            solution.attributes["hypervolume_contribution"] = contribution
+
+        self.__last_solutions = list(front)
+        self.__last_contributions = contributions
+
+    def sort(self, solutions: list) -> list:
+        solutions.sort(
+            key=lambda x: x.attributes.get("hypervolume_contribution", 0.0),
+            reverse=True,
+        )
+
+    def truncate(self, solutions: list, size: int) -> list:
+        """Remove, one by one, the solution with the lowest contribution (the last one on ties) until the list has
+        the given size, updating only the contributions that change after each removal.
+        """
+        if len(solutions) <= size:
+            return list(solutions)
+
+        contributions = self.__get_contributions(solutions)
+        # the removals below modify the contributions, so they can not be reused again
+        self.__last_solutions = None
+        self.__last_contributions = None
+
+        for _ in range(len(solutions) - size):
+            alive = np.flatnonzero(contributions.is_alive)
+            values = contributions.contributions[alive]
+            contributions.remove(alive[len(alive) - 1 - np.argmin(values[::-1])])
+
+        result_list = []
+        for index, solution in enumerate(solutions):
+            if contributions.is_alive[index]:
+                solution.attributes["hypervolume_contribution"] = (
+                    contributions.contributions[index]
+                )
+                result_list.append(solution)
+
+        return result_list
+
+    def __get_contributions(self, solutions: list) -> HypervolumeContributions:
+        points = np.array([solution.objectives for solution in solutions], dtype=float)
+
+        last_solutions = self.__last_solutions
+        if (
+            last_solutions is not None
+            and len(last_solutions) == len(solutions)
+            and all(a is b for a, b in zip(last_solutions, solutions))
+            and np.array_equal(points, self.__last_contributions.points)
+        ):
+            return self.__last_contributions
+
+        if self.reference_point is None:
+            reference_point = points.max(axis=0) + self.offset
+        else:
+            reference_point = np.asarray(self.reference_point, dtype=float)
+
+        return HypervolumeContributions(points, reference_point)
+
+    @classmethod
+    def get_comparator(cls) -> Comparator:
+        return SolutionAttributeComparator(
+            "hypervolume_contribution", lowest_is_best=False
+        )
+
+    def get_name(self) -> str:
+        return "Hypervolume contribution"
@@ -1,6 +1,102 @@
+import copy
+import itertools
+import multiprocessing
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 
 from kapylan.core.problem import Problem
+from kapylan.core.solution import MSASolution
+
+# problem evaluated by the current worker process of a MultiprocessEvaluator
+_worker_problem = None
+
+
+def _initialize_worker(problem: Problem) -> None:
+    global _worker_problem
+    _worker_problem = problem
+
+
+def _get_initial_state(solution) -> tuple:
+    """State of a solution before the evaluation, to find out what the evaluation changes: a copy of the
+    variables (None for MSA solutions, whose ungapped sequences are never changed) and of the attributes.
+    """
+    if isinstance(solution, MSASolution):
+        variables = None
+    else:
+        variables = copy.deepcopy(solution.variables)
+
+    return variables, solution.attributes.copy()
+
+
+def _get_result(solution, initial_state: tuple) -> tuple:
+    """Get the state of a solution set by its evaluation: objectives, constraints, changed attributes and the
+    encoding. The encoding is the gaps groups and column scores of MSA solutions (the evaluation removes the
+    columns full of gaps) or, for other solutions, the variables if the evaluation changed them (None otherwise).
+
+    :param initial_state: State of the solution before the evaluation (see `_get_initial_state`).
+    """
+    variables, attributes = initial_state
+
+    if isinstance(solution, MSASolution):
+        encoding = (
+            [gaps_group[:] for gaps_group in solution.gaps_groups],
+            solution.column_scores,
+            solution.column_scores_key,
+        )
+    elif solution.variables != variables:
+        encoding = copy.deepcopy(solution.variables)
+    else:
+        encoding = None
+
+    changed_attributes = {
+        name: value
+        for name, value in solution.attributes.items()
+        if name not in attributes or attributes[name] is not value
+    }
+    removed_attributes = [
+        name for name in attributes if name not in solution.attributes
+    ]
+
+    return (
+        solution.objectives[:],
+        solution.constraints[:],
+        (changed_attributes, removed_attributes),
+        encoding,
+    )
+
+
+def _set_result(solution, result: tuple) -> None:
+    objectives, constraints, (changed_attributes, removed_attributes), encoding = result
+
+    solution.objectives = objectives[:]
+    solution.constraints = constraints[:]
+
+    solution.attributes.update(changed_attributes)
+    for name in removed_attributes:
+        solution.attributes.pop(name, None)
+
+    if isinstance(solution, MSASolution):
+        gaps_groups, column_scores, column_scores_key = encoding
+
+        solution.gaps_groups = [gaps_group[:] for gaps_group in gaps_groups]
+        solution.set_column_scores(column_scores, column_scores_key)
+    elif encoding is not None:
+        solution.variables = copy.deepcopy(encoding)
+
+
+def _evaluate_in_worker(solution_list: list) -> list:
+    """Evaluate a list of solutions with the problem of the worker.
+
+    :return: The state of each solution set by the evaluation (see `_get_result`).
+    """
+    initial_states = [_get_initial_state(solution) for solution in solution_list]
+
+    Evaluator.evaluate_solution_list(solution_list, _worker_problem)
+
+    return [
+        _get_result(solution, initial_state)
+        for solution, initial_state in zip(solution_list, initial_states)
+    ]
 
 
 class Evaluator(ABC):
@@ -12,10 +108,167 @@ class Evaluator(ABC):
     def evaluate_solution(solution, problem: Problem) -> None:
         problem.evaluate(solution)
 
+    @staticmethod
+    def evaluate_solution_list(solution_list: list, problem: Problem) -> None:
+        problem.evaluate_batch(solution_list)
+
 
 class SequentialEvaluator(Evaluator):
     def evaluate(self, solution_list: list, problem: Problem) -> list:
+        Evaluator.evaluate_solution_list(solution_list, problem)
+
+        return solution_list
+
+
+class MultiprocessEvaluator(Evaluator):
+    """Evaluates the solutions in a pool of worker processes. The pool is created on the first evaluation and
+    kept until `close` is called (or the problem changes), so that the problem is sent to each worker only once.
+    Workers send back the state of each solution set by the evaluation: objectives, constraints, changed
+    attributes and encoding (see `_get_result`). Changes made to the problem after the pool is created are not seen by the workers.
+    """
+
+    def __init__(self, processes: int = None):
+        """
+        :param processes: Number of worker processes (by default, the number of CPUs).
+        """
+        self.processes = processes or multiprocessing.cpu_count()
+        self.pool = None
+        self.problem = None
+
+    def evaluate(self, solution_list: list, problem: Problem) -> list:
+        if not solution_list:
+            return solution_list
+
+        if self.pool is None or self.problem is not problem:
+            self.close()
+
+            self.problem = problem
+            self.pool = multiprocessing.Pool(
+                self.processes, initializer=_initialize_worker, initargs=(problem,)
+            )
+
+        # each worker evaluates its chunk of solutions as a batch
+        chunksize, extra = divmod(len(solution_list), 4 * self.processes)
+        chunksize += 1 if extra else 0
+        chunks = [
+            solution_list[i : i + chunksize]
+            for i in range(0, len(solution_list), chunksize)
+        ]
+
+        results = itertools.chain.from_iterable(
+            self.pool.map(_evaluate_in_worker, chunks, chunksize=1)
+        )
+
+        for solution, result in zip(solution_list, results):
+            _set_result(solution, result)
+
+        return solution_list
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+
+        self.pool = None
+        self.problem = None
+
+    def __getstate__(self):
+        # pools cannot be pickled; a copy of the evaluator starts its own pool
+        state = self.__dict__.copy()
+        state["pool"] = None
+        state["problem"] = None
+
+        return state
+
+    def __del__(self):
+        if self.pool is not None:
+            self.pool.terminate()
+
+
+class CachedEvaluator(Evaluator):
+    """Evaluator that skips the solutions that have already been evaluated. The results of the last `max_size`
+    evaluations (the state set by the evaluation, see `_get_result`, which is replayed on the solutions found in
+    the cache) are kept in a least recently used cache, whose key is the encoding of the solution before the
+    evaluation: the gaps groups of MSA solutions or the variables of any other solution.
+    """
+
+    def __init__(self, evaluator: Evaluator, max_size: int = 1000):
+        """
+        :param evaluator: Evaluator of the solutions that are not in the cache.
+        :param max_size: Maximum number of evaluations kept.
+        """
+        self.evaluator = evaluator
+        self.max_size = max_size
+        self.cache = OrderedDict()
+        self.problem = None
+
+        self.hits = 0
+        self.misses = 0
+
+    def evaluate(self, solution_list: list, problem: Problem) -> list:
+        if self.problem is not problem:
+            self.clear()
+            self.problem = problem
+
+        new_solutions = OrderedDict()
+        repeated_solutions = []
+        uncached_solutions = []
+
         for solution in solution_list:
-            Evaluator.evaluate_solution(solution, problem)
+            key = self.get_key(solution)
+
+            if key is None:
+                uncached_solutions.append(solution)
+            elif key in self.cache:
+                self.cache.move_to_end(key)
+                _set_result(solution, self.cache[key])
+                self.hits += 1
+            elif key in new_solutions:
+                # solutions repeated in the list are evaluated once
+                repeated_solutions.append((solution, key))
+                self.hits += 1
+            else:
+                new_solutions[key] = solution
+                self.misses += 1
+
+        initial_states = {
+            key: _get_initial_state(solution) for key, solution in new_solutions.items()
+        }
+
+        self.evaluator.evaluate(
+            list(new_solutions.values()) + uncached_solutions, problem
+        )
+
+        for key, solution in new_solutions.items():
+            self.cache[key] = _get_result(solution, initial_states[key])
+
+        for solution, key in repeated_solutions:
+            _set_result(solution, self.cache[key])
+
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
 
         return solution_list
+
+    def clear(self) -> None:
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_key(solution):
+        """Get the encoding of a solution as a hashable object, or None if it cannot be encoded."""
+        if isinstance(solution, MSASolution):
+            return tuple(tuple(gaps_group) for gaps_group in solution.gaps_groups)
+
+        key = tuple(
+            tuple(variable) if isinstance(variable, list) else variable
+            for variable in solution.variables
+        )
+
+        try:
+            hash(key)
+        except TypeError:
+            return None
+
+        return key
@@ -1,3 +1,4 @@
+import bisect
 from abc import ABC, abstractmethod
 
 from kapylan.annotation.component_annotation import RankingComponent
@@ -6,8 +7,11 @@ from kapylan.annotation.ontology import ontology
 from kapylan.util.comparator import (
     DominanceComparator,
     Comparator,
+    OverallConstraintViolationComparator,
     SolutionAttributeComparator,
 )
+from kapylan.util.constraint_handling import overall_constraint_violation_degree
+import numpy as np
 import rdflib
 from rdflib import XSD, RDFS
 
@@ -21,6 +25,23 @@ FastNonDominatedSortRankingComponent = merge_component(
 )
 
 
+def get_dominance_matrix(objectives: np.ndarray, violations: np.ndarray) -> np.ndarray:
+    """Compute which solutions dominate each other, as :class:`DominanceComparator` does: the solution with the
+    lowest overall constraint violation is better and, if both are equal, the Pareto dominance decides.
+
+    :param objectives: Array of shape (number of solutions, number of objectives).
+    :param violations: Overall constraint violation degree of each solution (zero or negative).
+    :return: Boolean array whose element [p, q] is True if solution p dominates solution q.
+    """
+    is_lower = (objectives[:, None, :] < objectives[None, :, :]).any(axis=2)
+    is_greater = (objectives[:, None, :] > objectives[None, :, :]).any(axis=2)
+
+    is_more_feasible = violations[:, None] > violations[None, :]
+    is_equally_feasible = violations[:, None] == violations[None, :]
+
+    return is_more_feasible | (is_equally_feasible & is_lower & ~is_greater)
+
+
 class Ranking(ABC):
     def __init__(self, comparator: Comparator = DominanceComparator()):
         super(Ranking, self).__init__()
@@ -68,6 +89,40 @@ class FastNonDominatedRanking(Ranking):
         :param solutions: Solution list.
         :param k: Number of individuals.
         """
+        if self.__is_dominance_comparator(self.comparator):
+            front = self.__compute_fronts_with_arrays(solutions)
+        else:
+            front = self.__compute_fronts_with_comparator(solutions)
+
+        for i, subfront in enumerate(front):
+            for q in subfront:
+                solutions[q].attributes["dominance_ranking"] = i
+
+        self.ranked_sublists = [[solutions[q] for q in subfront] for subfront in front]
+
+        if k:
+            count = 0
+            for i, front in enumerate(self.ranked_sublists):
+                count += len(front)
+                if count >= k:
+                    self.ranked_sublists = self.ranked_sublists[: i + 1]
+                    break
+
+        return self.ranked_sublists
+
+    @staticmethod
+    def __is_dominance_comparator(comparator: Comparator) -> bool:
+        return (
+            type(comparator) is DominanceComparator
+            and type(comparator.constraint_comparator)
+            is OverallConstraintViolationComparator
+        )
+
+    def __compute_fronts_with_comparator(self, solutions: list) -> list:
+        """Sort the solutions comparing every pair of them with the comparator.
+
+        :return: List of fronts, each of them with the indexes of its solutions.
+        """
         # number of solutions dominating solution ith
         dominating_ith = [0 for _ in range(len(solutions))]
 
@@ -94,25 +149,116 @@ class FastNonDominatedRanking(Ranking):
         for i in range(len(solutions)):
             if dominating_ith[i] == 0:
                 front[0].append(i)
-                solutions[i].attributes["dominance_ranking"] = 0
 
         i = 0
         while len(front[i]) != 0:
             i += 1
             for p in front[i - 1]:
-                if p <= len(ith_dominated):
-                    for q in ith_dominated[p]:
-                        dominating_ith[q] -= 1
-                        if dominating_ith[q] == 0:
-                            front[i].append(q)
-                            solutions[q].attributes["dominance_ranking"] = i
-
-        self.ranked_sublists = [[]] * i
-        for j in range(i):
-            q = [0] * len(front[j])
-            for m in range(len(front[j])):
-                q[m] = solutions[front[j][m]]
-            self.ranked_sublists[j] = q
+                for q in ith_dominated[p]:
+                    dominating_ith[q] -= 1
+                    if dominating_ith[q] == 0:
+                        front[i].append(q)
+
+        return front[:i]
+
+    def __compute_fronts_with_arrays(self, solutions: list) -> list:
+        """Sort the solutions computing the dominance relation of all the pairs at once. It gives the same fronts,
+        in the same order, as comparing them with a :class:`DominanceComparator`.
+
+        :return: List of fronts, each of them with the indexes of its solutions.
+        """
+        number_of_solutions = len(solutions)
+        self.number_of_comparisons += (
+            number_of_solutions * (number_of_solutions - 1) // 2
+        )
+
+        if number_of_solutions == 0:
+            return []
+
+        dominates = get_dominance_matrix(
+            np.array([solution.objectives for solution in solutions], dtype=float),
+            np.array(
+                [overall_constraint_violation_degree(s) for s in solutions],
+                dtype=float,
+            ),
+        )
+
+        dominating_ith = dominates.sum(axis=0)
+        front = [np.flatnonzero(dominating_ith == 0)]
+
+        while True:
+            previous_front = front[-1]
+            dominated = dominates[previous_front]
+
+            is_pending = dominating_ith > 0
+            dominating_ith = dominating_ith - dominated.sum(axis=0)
+            candidates = np.flatnonzero(is_pending & (dominating_ith == 0))
+
+            if len(candidates) == 0:
+                break
+
+            # solutions join the front when their last dominator in the previous front is visited
+            positions = np.arange(len(previous_front))[:, None]
+            last_dominator = np.where(dominated[:, candidates], positions, -1).max(
+                axis=0
+            )
+
+            front.append(candidates[np.lexsort((candidates, last_dominator))])
+
+        return [subfront.tolist() for subfront in front]
+
+    @classmethod
+    def get_comparator(cls) -> Comparator:
+        return SolutionAttributeComparator("dominance_ranking")
+
+    def get_name(self) -> str:
+        return "Fast non dominated ranking"
+
+
+@FastNonDominatedSortRankingComponent(
+    hasImplementation=TITAN.namespace.ImplementationNonDominatedSweepRanking,
+    label=rdflib.Literal("Non Dominated Sweep Ranking", datatype=XSD.string),
+)
+class NonDominatedSweepRanking(FastNonDominatedRanking):
+    """Non-dominated ranking for problems with two or three objectives. Solutions are visited in lexicographic
+    order and each one is placed, with a binary search, in the first front that has no solution dominating it
+    (Efficient Non-dominated Sort, see [Zhang2015]_). It takes O(N log N) time for two objectives and
+    O(N log^2 N) for three, and falls back to :class:`FastNonDominatedRanking` otherwise.
+
+    The fronts contain the same solutions as with :class:`FastNonDominatedRanking`, sorted by their index.
+    """
+
+    def __init__(self, comparator: Comparator = DominanceComparator()):
+        super(NonDominatedSweepRanking, self).__init__(comparator)
+
+    def compute_ranking(self, solutions: list, k: int = None):
+        """Compute ranking of solutions.
+
+        :param solutions: Solution list.
+        :param k: Number of individuals.
+        """
+        if len(solutions) == 0 or not self.__is_sweepable(solutions):
+            return super(NonDominatedSweepRanking, self).compute_ranking(solutions, k)
+
+        objectives = np.array(
+            [solution.objectives for solution in solutions], dtype=float
+        )
+        violations = np.array(
+            [overall_constraint_violation_degree(s) for s in solutions], dtype=float
+        )
+
+        # the most feasible solutions dominate the rest, so each level of violation is ranked on its own
+        ranks = np.zeros(len(solutions), dtype=np.int64)
+        offset = 0
+        for violation in np.unique(violations)[::-1]:
+            indexes = np.flatnonzero(violations == violation)
+            ranks[indexes] = offset + self.__compute_pareto_ranks(objectives[indexes])
+            offset = ranks[indexes].max() + 1
+
+        self.ranked_sublists = [[] for _ in range(offset)]
+        for solution, rank in zip(solutions, ranks.tolist()):
+            solution.attributes["dominance_ranking"] = rank
+            self.ranked_sublists[rank].append(solution)
 
         if k:
             count = 0
@@ -124,9 +270,77 @@ class FastNonDominatedRanking(Ranking):
 
         return self.ranked_sublists
 
-    @classmethod
-    def get_comparator(cls) -> Comparator:
-        return SolutionAttributeComparator("dominance_ranking")
+    def __is_sweepable(self, solutions: list) -> bool:
+        return (
+            type(self.comparator) is DominanceComparator
+            and type(self.comparator.constraint_comparator)
+            is OverallConstraintViolationComparator
+            and solutions[0].number_of_objectives in (2, 3)
+        )
 
-    def get_name(self) -> str:
-        return "Fast non dominated ranking"
+    def __compute_pareto_ranks(self, objectives: np.ndarray) -> np.ndarray:
+        """Rank the solutions by Pareto dominance only.
+
+        :param objectives: Array of shape (number of solutions, 2 or 3).
+        :return: Front index of each solution.
+        """
+        order = np.lexsort(objectives.T[::-1])
+        points = objectives[order].tolist()
+        ranks = np.zeros(len(points), dtype=np.int64)
+
+        # for each front, the points that are not dominated by another one of the same front when projecting
+        # out the first objective, sorted by the second objective (as it decreases, the third one increases)
+        fronts_second = []
+        fronts_third = []
+
+        for i, point in enumerate(points):
+            if i > 0 and point == points[i - 1]:
+                # duplicated solutions do not dominate each other
+                ranks[i] = ranks[i - 1]
+                continue
+
+            # previous points are not worse in the first objective: they dominate this point if they are not
+            # worse in the rest of them
+            low, high = 0, len(fronts_second)
+            while low < high:
+                middle = (low + high) // 2
+                self.number_of_comparisons += 1
+                if self.__is_dominated(
+                    point, fronts_second[middle], fronts_third[middle]
+                ):
+                    low = middle + 1
+                else:
+                    high = middle
+
+            if low == len(fronts_second):
+                fronts_second.append([])
+                fronts_third.append([])
+            self.__add_to_front(point, fronts_second[low], fronts_third[low])
+            ranks[i] = low
+
+        result = np.empty_like(ranks)
+        result[order] = ranks
+
+        return result
+
+    @staticmethod
+    def __is_dominated(point: list, second: list, third: list) -> bool:
+        # point with the lowest third objective among those not worse in the second one
+        index = bisect.bisect_right(second, point[1]) - 1
+        if index < 0:
+            return False
+
+        return len(point) == 2 or third[index] <= point[2]
+
+    @staticmethod
+    def __add_to_front(point: list, second: list, third: list):
+        value = point[2] if len(point) == 3 else point[1]
+        index = bisect.bisect_left(second, point[1])
+
+        # remove the points that become dominated in the projection
+        end = index
+        while end < len(second) and third[end] >= value:
+            end += 1
+
+        second[index:end] = [point[1]]
+        third[index:end] = [value]
@@ -5,13 +5,13 @@ from typing import List
 
 from kapylan.core.solution import FloatSolution, Solution
 from kapylan.problem.msa import MSA
-from kapylan.util.archive import Archive, NonDominatedSolutionsArchive
+from kapylan.util.archive import Archive, NDTreeArchive
 
 LOGGER = logging.getLogger("kaplan")
 
 
 def get_non_dominated_solutions(solutions: list) -> list:
-    archive: Archive = NonDominatedSolutionsArchive()
+    archive: Archive = NDTreeArchive()
 
     for solution in solutions:
         archive.add(solution)
@@ -1,7 +1,14 @@
+import random
 import unittest
 from kapylan.core.solution import Solution
 
-from kapylan.util.archive import Archive, NonDominatedSolutionsArchive
+from kapylan.util.archive import (
+    Archive,
+    CrowdingDistanceArchive,
+    NDTreeArchive,
+    NonDominatedSolutionsArchive,
+)
+from kapylan.util.density_estimator import CrowdingDistance
 
 
 class ArchiveTestCases(unittest.TestCase):
@@ -106,5 +113,145 @@ class NonDominatedSolutionListArchiveTestCases(unittest.TestCase):
         )
 
 
+class NDTreeArchiveTestCases(unittest.TestCase):
+    def setUp(self):
+        self.archive = NDTreeArchive()
+
+    def test_should_constructor_create_an_empty_list(self):
+        self.assertEqual(0, self.archive.size())
+        self.assertEqual([], self.archive.solution_list)
+
+    def test_should_adding_a_solution_with_equal_objectives_be_rejected(self):
+        solution1 = Solution(1, 3)
+        solution1.objectives = [1.0, 2.0, 3.0]
+        solution2 = Solution(1, 3)
+        solution2.objectives = [1.0, 2.0, 3.0]
+
+        self.assertTrue(self.archive.add(solution1))
+        self.assertFalse(self.archive.add(solution2))
+        self.assertEqual([solution1], self.archive.solution_list)
+
+    def test_should_adding_a_feasible_solution_remove_the_infeasible_ones(self):
+        solution1 = Solution(1, 2, 1)
+        solution1.objectives = [0.0, 0.0]
+        solution1.constraints[0] = -1.0
+        solution2 = Solution(1, 2, 1)
+        solution2.objectives = [1.0, 1.0]
+
+        self.archive.add(solution1)
+        self.archive.add(solution2)
+
+        self.assertEqual([solution2], self.archive.solution_list)
+
+    def test_should_add_keep_the_same_solutions_as_the_non_dominated_solutions_archive(
+        self,
+    ):
+        generator = random.Random(0)
+
+        for number_of_objectives in [1, 2, 3, 4]:
+            archive = NonDominatedSolutionsArchive()
+            tree_archive = NDTreeArchive(max_leaf_size=4)
+
+            for _ in range(200):
+                solution = Solution(1, number_of_objectives, 1)
+                solution.objectives = [
+                    generator.randint(0, 5) for _ in range(number_of_objectives)
+                ]
+                solution.constraints[0] = generator.choice([0, 0, 0, -1])
+
+                self.assertEqual(archive.add(solution), tree_archive.add(solution))
+
+            self.assertEqual(archive.solution_list, tree_archive.solution_list)
+
+
+class CrowdingDistanceArchiveTestCases(unittest.TestCase):
+    def setUp(self):
+        self.archive = CrowdingDistanceArchive(3)
+
+    def test_should_add_remove_the_most_crowded_solution_if_the_archive_is_full(self):
+        solutions = []
+        for objectives in [[0.0, 1.0], [1.0, 0.0], [0.5, 0.5], [0.4, 0.6]]:
+            solution = Solution(1, 2)
+            solution.objectives = objectives
+            solutions.append(solution)
+
+        for solution in solutions[:3]:
+            self.assertTrue(self.archive.add(solution))
+
+        self.assertFalse(self.archive.add(solutions[3]))
+        self.assertEqual(solutions[:3], self.archive.solution_list)
+
+    def test_should_crowding_distances_match_the_crowding_distance_of_the_members(
+        self,
+    ):
+        generator = random.Random(0)
+
+        for number_of_objectives in [2, 3]:
+            archive = CrowdingDistanceArchive(10)
+
+            for _ in range(100):
+                # points on a simplex are non-dominated
+                values = [generator.random() for _ in range(number_of_objectives)]
+                solution = Solution(1, number_of_objectives)
+                solution.objectives = [value / sum(values) for value in values]
+                archive.add(solution)
+
+            self.assertEqual(10, archive.size())
+
+            CrowdingDistance().compute_density_estimator(archive.solution_list)
+            for solution in archive.solution_list:
+                self.assertAlmostEqual(
+                    solution.attributes["crowding_distance"],
+                    archive.get_crowding_distance(solution),
+                )
+
+    def test_should_crowding_distances_match_the_crowding_distance_with_tied_objectives(
+        self,
+    ):
+        generator = random.Random(0)
+        # integer points with the same sum are non-dominated, and share many values
+        points = [[x, y, 6 - x - y] for x in range(7) for y in range(7) if x + y <= 6]
+
+        for maximum_size in [10, 100]:
+            generator.shuffle(points)
+            archive = CrowdingDistanceArchive(maximum_size)
+            for point in points:
+                solution = Solution(1, 3)
+                solution.objectives = point
+                archive.add(solution)
+
+            CrowdingDistance().compute_density_estimator(archive.solution_list)
+            for solution in archive.solution_list:
+                self.assertEqual(
+                    solution.attributes["crowding_distance"],
+                    archive.get_crowding_distance(solution),
+                )
+
+    def test_should_get_crowding_distance_fail_if_the_solution_is_not_a_member(
+        self,
+    ):
+        solutions = []
+        for objectives in [[0.0, 1.0], [1.0, 0.0], [0.5, 0.5], [0.6, 0.4]]:
+            solution = Solution(1, 2)
+            solution.objectives = objectives
+            solutions.append(solution)
+            self.archive.add(solution)
+
+        self.assertEqual(3, self.archive.size())
+        for solution in self.archive.solution_list:
+            self.archive.get_crowding_distance(solution)
+
+        # the most crowded solution was removed when the archive overflowed
+        (removed,) = [
+            solution
+            for solution in solutions
+            if all(solution is not member for member in self.archive.solution_list)
+        ]
+        with self.assertRaises(Exception):
+            self.archive.get_crowding_distance(removed)
+        with self.assertRaises(Exception):
+            self.archive.get_crowding_distance(Solution(1, 2))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,16 @@
+import random
 import unittest
+from unittest import mock
 from kapylan.core.solution import Solution
 
-from kapylan.util.density_estimator import CrowdingDistance
+from kapylan.util.density_estimator import (
+    CrowdingDistance,
+    DensityEstimator,
+    HypervolumeContribution,
+    HypervolumeContributions,
+    get_hypervolume,
+)
+import numpy as np
 
 
 class CrowdingDistanceTestCases(unittest.TestCase):
@@ -85,6 +94,286 @@ class CrowdingDistanceTestCases(unittest.TestCase):
         self.assertEqual(float("inf"), value_from_solution2)
         self.assertGreater(value_from_solution3, value_from_solution4)
 
+    def test_should_the_crowding_distance_of_tied_solutions_be_correctly_assigned(
+        self,
+    ):
+        solution1 = Solution(2, 2)
+        solution2 = Solution(2, 2)
+        solution3 = Solution(2, 2)
+        solution4 = Solution(2, 2)
+
+        solution1.objectives = [0.0, 1.0]
+        solution2.objectives = [0.5, 0.5]
+        solution3.objectives = [0.5, 0.5]
+        solution4.objectives = [1.0, 0.0]
+
+        solution_list = [solution1, solution2, solution3, solution4]
+
+        self.crowding.compute_density_estimator(solution_list)
+
+        self.assertEqual(
+            [float("inf"), 1.0, 1.0, float("inf")],
+            [s.attributes["crowding_distance"] for s in solution_list],
+        )
+
+    def test_should_sort_order_the_solutions_by_decreasing_crowding_distance(self):
+        solution1 = Solution(2, 2)
+        solution2 = Solution(2, 2)
+        solution3 = Solution(2, 2)
+
+        solution1.attributes["crowding_distance"] = 1.0
+        solution2.attributes["crowding_distance"] = float("inf")
+        solution3.attributes["crowding_distance"] = 1.0
+
+        solution_list = [solution1, solution2, solution3]
+        self.crowding.sort(solution_list)
+
+        self.assertEqual([solution2, solution1, solution3], solution_list)
+
+    def test_should_sort_not_fail_if_the_crowding_distance_is_not_computed(self):
+        solution1 = Solution(2, 2)
+        solution2 = Solution(2, 2)
+        solution3 = Solution(2, 2)
+
+        solution1.attributes["crowding_distance"] = -1.0
+        solution3.attributes["crowding_distance"] = 1.0
+
+        solution_list = [solution1, solution2, solution3]
+        self.crowding.sort(solution_list)
+
+        self.assertEqual(
+            [id(solution3), id(solution2), id(solution1)],
+            [id(solution) for solution in solution_list],
+        )
+
+    def test_should_truncate_keep_the_solutions_removed_one_by_one_with_the_lowest_distance(
+        self,
+    ):
+        generator = random.Random(0)
+
+        for number_of_objectives in [2, 3]:
+            solution_list = []
+            for _ in range(30):
+                solution = Solution(2, number_of_objectives)
+                solution.objectives = [
+                    generator.random() for _ in range(number_of_objectives)
+                ]
+                solution_list.append(solution)
+
+            self.crowding.compute_density_estimator(solution_list)
+            expected = DensityEstimator.truncate(self.crowding, solution_list, 10)
+            expected_distances = [s.attributes["crowding_distance"] for s in expected]
+
+            result_list = self.crowding.truncate(solution_list, 10)
+
+            self.assertEqual(list(map(id, expected)), list(map(id, result_list)))
+            self.assertEqual(
+                expected_distances,
+                [s.attributes["crowding_distance"] for s in result_list],
+            )
+
+    def test_should_truncate_break_ties_as_the_solutions_removed_one_by_one(self):
+        generator = random.Random(0)
+
+        for _ in range(50):
+            number_of_solutions = generator.randint(5, 20)
+            positions = list(range(number_of_solutions))
+            generator.shuffle(positions)
+
+            objective_lists = [
+                # evenly spaced points: tied distances, but no tied objectives
+                [[x, number_of_solutions - x] for x in positions],
+                # integer objectives: tied objectives
+                [[generator.randint(0, 5), generator.randint(0, 5)] for _ in positions],
+            ]
+
+            for objectives in objective_lists:
+                size = generator.randint(1, number_of_solutions - 1)
+                solution_list = []
+                for values in objectives:
+                    solution = Solution(2, 2)
+                    solution.objectives = values
+                    solution_list.append(solution)
+
+                self.crowding.compute_density_estimator(solution_list)
+                expected = DensityEstimator.truncate(self.crowding, solution_list, size)
+                expected_distances = [
+                    s.attributes["crowding_distance"] for s in expected
+                ]
+
+                result_list = self.crowding.truncate(solution_list, size)
+
+                self.assertEqual(list(map(id, expected)), list(map(id, result_list)))
+                self.assertEqual(
+                    expected_distances,
+                    [s.attributes["crowding_distance"] for s in result_list],
+                )
+
+    def test_should_truncate_return_a_list_with_infinite_distances_if_two_solutions_remain(
+        self,
+    ):
+        solution_list = []
+        for i in range(5):
+            solution = Solution(2, 2)
+            solution.objectives = [i, 4 - i]
+            solution_list.append(solution)
+
+        self.crowding.compute_density_estimator(solution_list)
+        result_list = self.crowding.truncate(solution_list, 2)
+
+        self.assertEqual([solution_list[0], solution_list[4]], result_list)
+        self.assertEqual(
+            [float("inf"), float("inf")],
+            [s.attributes["crowding_distance"] for s in result_list],
+        )
+
+
+class HypervolumeContributionTestCases(unittest.TestCase):
+    def setUp(self):
+        self.hypervolume_contribution = HypervolumeContribution([4.0, 4.0])
+
+    def test_should_the_contributions_of_a_bi_objective_front_be_correctly_assigned(
+        self,
+    ):
+        solution1 = Solution(2, 2)
+        solution1.objectives = [1.0, 3.0]
+        solution2 = Solution(2, 2)
+        solution2.objectives = [2.0, 2.0]
+        solution3 = Solution(2, 2)
+        solution3.objectives = [3.0, 1.0]
+
+        solution_list = [solution1, solution2, solution3]
+        self.hypervolume_contribution.compute_density_estimator(solution_list)
+
+        self.assertEqual(
+            [1.0, 1.0, 1.0],
+            [s.attributes["hypervolume_contribution"] for s in solution_list],
+        )
+
+    def test_should_sort_not_fail_if_the_contribution_is_not_computed(self):
+        solution1 = Solution(2, 2)
+        solution2 = Solution(2, 2)
+        solution3 = Solution(2, 2)
+
+        solution1.attributes["hypervolume_contribution"] = -1.0
+        solution3.attributes["hypervolume_contribution"] = 1.0
+
+        solution_list = [solution1, solution2, solution3]
+        self.hypervolume_contribution.sort(solution_list)
+
+        self.assertEqual(
+            [id(solution3), id(solution2), id(solution1)],
+            [id(solution) for solution in solution_list],
+        )
+
+    def test_should_duplicated_solutions_contribute_nothing(self):
+        solution1 = Solution(2, 2)
+        solution1.objectives = [1.0, 3.0]
+        solution2 = Solution(2, 2)
+        solution2.objectives = [1.0, 3.0]
+        solution3 = Solution(2, 2)
+        solution3.objectives = [3.0, 1.0]
+
+        solution_list = [solution1, solution2, solution3]
+        self.hypervolume_contribution.compute_density_estimator(solution_list)
+
+        self.assertEqual(
+            [0.0, 0.0, 2.0],
+            [s.attributes["hypervolume_contribution"] for s in solution_list],
+        )
+
+    def test_should_contributions_match_the_hypervolume_lost_when_removing_each_point(
+        self,
+    ):
+        generator = np.random.default_rng(0)
+
+        for number_of_objectives in [2, 3, 4]:
+            points = generator.integers(0, 4, (20, number_of_objectives)).astype(float)
+            reference_point = np.full(number_of_objectives, 4.0)
+            contributions = HypervolumeContributions(points, reference_point)
+
+            for _ in range(10):
+                alive = np.flatnonzero(contributions.is_alive)
+                hypervolume = get_hypervolume(points[alive], reference_point)
+
+                for index in alive:
+                    self.assertAlmostEqual(
+                        hypervolume
+                        - get_hypervolume(
+                            points[alive[alive != index]], reference_point
+                        ),
+                        contributions.contributions[index],
+                    )
+
+                contributions.remove(generator.choice(alive))
+
+    def test_should_add_update_the_contributions(self):
+        points = np.array([[1.0, 3.0, 2.0], [3.0, 1.0, 2.0], [2.0, 2.0, 1.0]])
+        reference_point = np.full(3, 4.0)
+
+        contributions = HypervolumeContributions(points[:2], reference_point)
+        index = contributions.add(points[2])
+
+        self.assertEqual(2, index)
+        self.assertTrue(
+            np.allclose(
+                HypervolumeContributions(points, reference_point).contributions,
+                contributions.contributions,
+            )
+        )
+
+    def test_should_truncate_keep_the_solutions_removed_one_by_one_with_the_lowest_contribution(
+        self,
+    ):
+        generator = random.Random(0)
+
+        for number_of_objectives in [2, 3]:
+            solution_list = []
+            for _ in range(20):
+                values = [generator.random() for _ in range(number_of_objectives)]
+                solution = Solution(2, number_of_objectives)
+                solution.objectives = [value / sum(values) for value in values]
+                solution_list.append(solution)
+
+            # the same reference point for every removal
+            hypervolume_contribution = HypervolumeContribution(
+                [2.0] * number_of_objectives
+            )
+            hypervolume_contribution.compute_density_estimator(solution_list)
+
+            expected = DensityEstimator.truncate(
+                hypervolume_contribution, solution_list, 8
+            )
+            result_list = hypervolume_contribution.truncate(solution_list, 8)
+
+            self.assertEqual(set(map(id, expected)), set(map(id, result_list)))
+
+    def test_should_truncate_reuse_the_contributions_of_the_same_solutions(self):
+        solution_list = []
+        for i in range(6):
+            solution = Solution(2, 2)
+            solution.objectives = [i / 5, 1 - i / 5]
+            solution_list.append(solution)
+
+        expected = HypervolumeContribution([4.0, 4.0]).truncate(solution_list, 4)
+
+        with mock.patch(
+            "kapylan.util.density_estimator.HypervolumeContributions",
+            wraps=HypervolumeContributions,
+        ) as contributions:
+            self.hypervolume_contribution.compute_density_estimator(solution_list)
+            result_list = self.hypervolume_contribution.truncate(solution_list, 4)
+
+            self.assertEqual(1, contributions.call_count)
+            self.assertEqual(list(map(id, expected)), list(map(id, result_list)))
+
+            # the contributions are computed again if the objectives change
+            self.hypervolume_contribution.compute_density_estimator(solution_list)
+            solution_list[0].objectives = [0.0, 2.0]
+            self.hypervolume_contribution.truncate(solution_list, 4)
+
+            self.assertEqual(3, contributions.call_count)
+
 
 if __name__ == "__main__":
     unittest.main()
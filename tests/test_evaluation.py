@@ -1,4 +1,7 @@
 import unittest
+from kapylan.algorithm.component.evaluation.impl.MultiprocessEvaluation import (
+    MultiprocessEvaluation,
+)
 from kapylan.algorithm.component.evaluation.impl.SequentialEvaluation import (
     SequentialEvaluation,
 )
@@ -54,6 +57,36 @@ class SequentialEvaluationTestCases(unittest.TestCase):
             self.assertEqual(1.2, problem_list[i].objectives[0])
             self.assertEqual(2.3, problem_list[i].objectives[1])
 
+    def test_should_evaluate_use_a_cache_if_it_has_a_size(self):
+        evaluation = SequentialEvaluation(self.problem, cache_size=10)
+        solution = self.problem.create_solution()
+
+        evaluation.evaluate([solution, solution])
+
+        self.assertEqual(1, evaluation.evaluator.misses)
+        self.assertEqual(1, evaluation.evaluator.hits)
+
+
+class MultiprocessEvaluationTestCases(unittest.TestCase):
+    def setUp(self):
+        self.problem = MockedProblem()
+        self.evaluation = MultiprocessEvaluation(self.problem, processes=2)
+
+    def tearDown(self):
+        self.evaluation.close()
+
+    def test_should_evaluate_a_list_of_problem_work_properly(self):
+        problem_list = [self.problem.create_solution() for _ in range(10)]
+
+        self.evaluation.evaluate(problem_list)
+
+        for i in range(10):
+            self.assertEqual(1.2, problem_list[i].objectives[0])
+            self.assertEqual(2.3, problem_list[i].objectives[1])
+
+    def test_should_get_problem_return_the_problem(self):
+        self.assertIs(self.problem, self.evaluation.get_problem())
+
 
 if __name__ == "__main__":
     unittest.main()
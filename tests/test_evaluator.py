@@ -1,7 +1,12 @@
+import copy
 import unittest
 from kapylan.core.problem import FloatProblem
-from kapylan.core.solution import FloatSolution
-from kapylan.util.evaluator import SequentialEvaluator
+from kapylan.core.solution import CompositeSolution, FloatSolution
+from kapylan.util.evaluator import (
+    CachedEvaluator,
+    MultiprocessEvaluator,
+    SequentialEvaluator,
+)
 
 
 class MockedProblem(FloatProblem):
@@ -27,6 +32,51 @@ class MockedProblem(FloatProblem):
         pass
 
 
+class MockedProblemWithState(MockedProblem):
+    def evaluate(self, solution: FloatSolution):
+        solution.objectives[0] = sum(solution.variables)
+        solution.objectives[1] = -sum(solution.variables)
+        solution.variables = [round(x) for x in solution.variables]
+        solution.attributes["evaluated"] = True
+
+        return solution
+
+
+class MockedProblemWithMemo(MockedProblem):
+    def evaluate(self, solution: FloatSolution):
+        super(MockedProblemWithMemo, self).evaluate(solution)
+        solution._memo = list(solution.variables)
+
+        return solution
+
+
+class MockedBatchProblem(MockedProblem):
+    def __init__(self):
+        super(MockedBatchProblem, self).__init__()
+        self.batch_sizes = []
+
+    def evaluate_batch(self, solutions: list) -> list:
+        self.batch_sizes.append(len(solutions))
+
+        for solution in solutions:
+            self.evaluate(solution)
+
+        return solutions
+
+
+class MockedCountingProblem(MockedProblem):
+    def __init__(self):
+        super(MockedCountingProblem, self).__init__()
+        self.evaluations = 0
+
+    def evaluate(self, solution: FloatSolution):
+        self.evaluations += 1
+        solution.objectives[0] = sum(solution.variables)
+        solution.objectives[1] = -sum(solution.variables)
+
+        return solution
+
+
 class SequentialEvaluatorTestCases(unittest.TestCase):
     def setUp(self):
         self.evaluator = SequentialEvaluator()
@@ -52,6 +102,154 @@ class SequentialEvaluatorTestCases(unittest.TestCase):
             self.assertEqual(1.2, problem_list[i].objectives[0])
             self.assertEqual(2.3, problem_list[i].objectives[1])
 
+    def test_should_evaluate_evaluate_the_list_as_a_batch(self):
+        problem = MockedBatchProblem()
+        problem_list = [problem.create_solution() for _ in range(10)]
+
+        self.evaluator.evaluate(problem_list, problem)
+
+        self.assertEqual([10], problem.batch_sizes)
+
+
+class MultiprocessEvaluatorTestCases(unittest.TestCase):
+    def setUp(self):
+        self.evaluator = MultiprocessEvaluator(processes=2)
+
+    def tearDown(self):
+        self.evaluator.close()
+
+    def test_should_evaluate_a_list_of_problem_work_properly(self):
+        problem = MockedProblem()
+        problem_list = [problem.create_solution() for _ in range(10)]
+
+        self.evaluator.evaluate(problem_list, problem)
+
+        for i in range(10):
+            self.assertEqual(1.2, problem_list[i].objectives[0])
+            self.assertEqual(2.3, problem_list[i].objectives[1])
+
+    def test_should_evaluate_update_the_state_changed_by_the_problem(self):
+        problem = MockedProblemWithState()
+        problem_list = [problem.create_solution() for _ in range(5)]
+        expected_list = [copy.deepcopy(solution) for solution in problem_list]
+
+        SequentialEvaluator().evaluate(expected_list, problem)
+        self.evaluator.evaluate(problem_list, problem)
+
+        for solution, expected in zip(problem_list, expected_list):
+            self.assertEqual(expected.objectives, solution.objectives)
+            self.assertEqual(expected.variables, solution.variables)
+            self.assertEqual({"evaluated": True}, solution.attributes)
+
+    def test_should_evaluate_not_send_back_private_attributes(self):
+        problem = MockedProblemWithMemo()
+        problem_list = [problem.create_solution() for _ in range(5)]
+        variables = [solution.variables for solution in problem_list]
+
+        self.evaluator.evaluate(problem_list, problem)
+
+        for solution, solution_variables in zip(problem_list, variables):
+            self.assertEqual([1.2, 2.3], solution.objectives)
+            self.assertFalse(hasattr(solution, "_memo"))
+            # unchanged variables are not sent back
+            self.assertIs(solution_variables, solution.variables)
+
+    def test_should_evaluate_reuse_the_pool_while_the_problem_does_not_change(self):
+        problem = MockedProblem()
+
+        self.evaluator.evaluate([problem.create_solution()], problem)
+        pool = self.evaluator.pool
+        self.evaluator.evaluate([problem.create_solution()], problem)
+
+        self.assertIs(pool, self.evaluator.pool)
+
+        self.evaluator.evaluate([problem.create_solution()], MockedProblem())
+
+        self.assertIsNot(pool, self.evaluator.pool)
+
+    def test_should_close_stop_the_pool(self):
+        problem = MockedProblem()
+        self.evaluator.evaluate([problem.create_solution()], problem)
+
+        self.evaluator.close()
+
+        self.assertIsNone(self.evaluator.pool)
+
+
+class CachedEvaluatorTestCases(unittest.TestCase):
+    def setUp(self):
+        self.problem = MockedCountingProblem()
+        self.evaluator = CachedEvaluator(SequentialEvaluator(), max_size=2)
+
+    def test_should_evaluate_replay_the_state_changed_by_the_problem(self):
+        problem = MockedProblemWithState()
+        solution = problem.create_solution()
+        same_solution = copy.deepcopy(solution)
+        same_solution.attributes["inherited"] = True
+
+        self.evaluator.evaluate([solution], problem)
+        self.evaluator.evaluate([same_solution], problem)
+
+        self.assertEqual(1, self.evaluator.hits)
+        self.assertEqual(solution.objectives, same_solution.objectives)
+        self.assertEqual(solution.variables, same_solution.variables)
+        self.assertEqual(
+            [round(x) for x in same_solution.variables], same_solution.variables
+        )
+        self.assertEqual(
+            {"evaluated": True, "inherited": True}, same_solution.attributes
+        )
+
+    def test_should_evaluate_skip_the_solutions_already_evaluated(self):
+        solution = self.problem.create_solution()
+        self.evaluator.evaluate([solution], self.problem)
+
+        same_solution = copy.deepcopy(solution)
+        same_solution.objectives = [0.0, 0.0]
+        self.evaluator.evaluate([same_solution], self.problem)
+
+        self.assertEqual(1, self.problem.evaluations)
+        self.assertEqual(solution.objectives, same_solution.objectives)
+        self.assertEqual(1, self.evaluator.hits)
+        self.assertEqual(1, self.evaluator.misses)
+
+    def test_should_evaluate_once_the_solutions_repeated_in_the_list(self):
+        solution = self.problem.create_solution()
+        solution_list = [solution, copy.deepcopy(solution), copy.deepcopy(solution)]
+
+        self.evaluator.evaluate(solution_list, self.problem)
+
+        self.assertEqual(1, self.problem.evaluations)
+        self.assertEqual(solution.objectives, solution_list[2].objectives)
+        self.assertIsNot(solution.objectives, solution_list[2].objectives)
+        self.assertEqual(2, self.evaluator.hits)
+
+    def test_should_evaluate_forget_the_least_recently_used_solutions(self):
+        solution_list = [self.problem.create_solution() for _ in range(3)]
+
+        self.evaluator.evaluate(solution_list[:2], self.problem)
+        self.evaluator.evaluate(solution_list[:1], self.problem)
+        self.evaluator.evaluate(solution_list[2:], self.problem)
+        self.evaluator.evaluate(solution_list[:2], self.problem)
+
+        self.assertEqual(4, self.problem.evaluations)
+        self.assertEqual(2, len(self.evaluator.cache))
+
+    def test_should_evaluate_clear_the_cache_if_the_problem_changes(self):
+        solution = self.problem.create_solution()
+        self.evaluator.evaluate([solution], self.problem)
+
+        problem = MockedCountingProblem()
+        self.evaluator.evaluate([solution], problem)
+
+        self.assertEqual(1, problem.evaluations)
+        self.assertEqual(0, self.evaluator.hits)
+
+    def test_should_get_key_return_none_if_the_variables_are_not_hashable(self):
+        solution = CompositeSolution([self.problem.create_solution()])
+
+        self.assertIsNone(CachedEvaluator.get_key(solution))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,79 @@
+import random
+import unittest
+
+import numpy as np
+
+from kapylan.core.gaps_groups import GapsGroupsArray
+from kapylan.core.solution import MSASolution
+from kapylan.problem.msa import MSA
+from kapylan.problem.msa_problem.score import SumOfPairs
+
+
+def random_msa_solution(
+    number_of_sequences: int, length: int, seed: int = 0
+) -> MSASolution:
+    generator = random.Random(seed)
+    msa = [
+        (
+            "seq{0}".format(i),
+            "".join(generator.choice("AC--") for _ in range(length)),
+        )
+        for i in range(number_of_sequences)
+    ]
+
+    problem = MSA([SumOfPairs()])
+    problem.identifiers = [name for name, _ in msa]
+    problem.number_of_variables = len(msa)
+
+    return MSASolution(problem, msa)
+
+
+class GapsGroupsArrayTestCases(unittest.TestCase):
+    def test_should_from_lists_and_to_lists_return_the_same_gaps_groups(self):
+        gaps_groups = [[1, 2, 5, 6], [], [0, 0, 3, 4, 7, 7], []]
+
+        self.assertEqual(
+            gaps_groups, GapsGroupsArray.from_lists(gaps_groups).to_lists()
+        )
+
+    def test_should_get_number_of_gaps_return_the_gaps_of_each_sequence(self):
+        gaps_groups_array = GapsGroupsArray.from_lists([[1, 2, 5, 6], [], [0, 3]])
+
+        self.assertEqual([4, 0, 4], gaps_groups_array.get_number_of_gaps().tolist())
+
+    def test_should_get_gaps_mask_mark_the_gaps_of_each_sequence(self):
+        gaps_groups_array = GapsGroupsArray.from_lists([[1, 2], [0, 0, 3, 3]])
+
+        self.assertEqual(
+            [[False, True, True, False], [True, False, False, True]],
+            gaps_groups_array.get_gaps_mask(4).tolist(),
+        )
+
+    def test_should_is_sorted_detect_overlapping_groups(self):
+        self.assertTrue(
+            GapsGroupsArray.from_lists([[1, 2, 4, 5], [], [0, 0]]).is_sorted()
+        )
+        self.assertFalse(GapsGroupsArray.from_lists([[1, 2, 2, 5]]).is_sorted())
+        self.assertFalse(GapsGroupsArray.from_lists([[4, 5, 1, 2]]).is_sorted())
+
+    def test_should_get_gap_columns_match_is_gap_column(self):
+        for seed in range(20):
+            solution = random_msa_solution(4, 30, seed)
+            length = solution.get_length_of_alignment()
+
+            self.assertEqual(
+                [j for j in range(length) if solution.is_gap_column(j)],
+                solution.get_gaps_groups_array().get_gap_columns(length).tolist(),
+            )
+
+    def test_should_remove_columns_remove_the_gaps_of_every_sequence(self):
+        gaps_groups_array = GapsGroupsArray.from_lists([[1, 2, 5, 5], [1, 1, 4, 5]])
+
+        self.assertEqual(
+            [[1, 1], [3, 3]],
+            gaps_groups_array.remove_columns(np.array([1, 5])).to_lists(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,253 @@
+import copy
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from kapylan.algorithm.operator.mutation.ShiftClosedGapGroupsMutation import (
+    ShiftClosedGapGroupsMutation,
+)
+from kapylan.algorithm.operator.mutation.TwoRandomAdjacentGapGroupMutation import (
+    TwoRandomAdjacentGapGroupMutation,
+)
+from kapylan.problem.BaliBASE import BAliBASE
+from kapylan.util.evaluator import (
+    CachedEvaluator,
+    MultiprocessEvaluator,
+    SequentialEvaluator,
+)
+from kapylan.problem.msa_problem.score import (
+    Entropy,
+    PercentageOfNonGaps,
+    PercentageOfTotallyConservedColumns,
+    Score,
+    Star,
+    SumOfPairs,
+)
+from kapylan.problem.msa_problem.substitution_matrix import PAM250
+
+
+class ColumnWiseSumOfPairs(Score):
+    def evaluate(self, align_sequences: list) -> int:
+        return SumOfPairs()._evaluate_by_columns(align_sequences)
+
+    @staticmethod
+    def is_minimization() -> bool:
+        return False
+
+
+class BAliBASETestCases(unittest.TestCase):
+    def setUp(self):
+        self.score_list = [
+            SumOfPairs(),
+            PercentageOfTotallyConservedColumns(),
+            Star(),
+            Entropy(),
+            PercentageOfNonGaps(),
+        ]
+        self.problem = BAliBASE("BB11001", "resources", self.score_list)
+
+    def test_should_import_instance_evaluate_the_pre_computed_alignments(self):
+        self.assertEqual(8, len(self.problem.sequences))
+        self.assertEqual(
+            [211, 20, -51, -30, 1371, -24, -14, 194],
+            [solution.objectives[0] for solution in self.problem.sequences],
+        )
+        self.assertEqual(
+            [-531, -575, -566, -541, 112, -542, -536, -529],
+            [solution.objectives[2] for solution in self.problem.sequences],
+        )
+
+    def test_should_evaluate_use_the_fused_scores_if_every_score_supports_them(self):
+        self.assertIsNotNone(self.problem.fused_scores)
+
+    def test_should_evaluate_compute_each_score_if_some_score_does_not_support_profiles(
+        self,
+    ):
+        problem = BAliBASE("BB11001", "resources", [ColumnWiseSumOfPairs(), Entropy()])
+
+        self.assertIsNone(problem.fused_scores)
+        self.assertEqual(
+            [211, 20, -51, -30, 1371, -24, -14, 194],
+            [solution.objectives[0] for solution in problem.sequences],
+        )
+
+    def test_should_evaluate_rescore_only_the_mutated_columns(self):
+        random.seed(1)
+        mutations = [
+            TwoRandomAdjacentGapGroupMutation(probability=1.0),
+            ShiftClosedGapGroupsMutation(probability=1.0),
+        ]
+
+        for solution in self.problem.sequences:
+            solution = copy.deepcopy(solution)
+
+            for mutation in mutations * 5:
+                mutation.execute(solution)
+                self.problem.evaluate(solution)
+
+                expected = copy.deepcopy(solution)
+                expected.invalidate_column_scores()
+                self.problem.evaluate(expected)
+
+                self.assertEqual(expected.objectives[:3], solution.objectives[:3])
+                self.assertAlmostEqual(expected.objectives[3], solution.objectives[3])
+                self.assertAlmostEqual(expected.objectives[4], solution.objectives[4])
+                self.assertEqual([], solution.dirty_columns)
+
+    def test_should_multiprocess_evaluator_return_the_same_objectives(self):
+        solution_list = [copy.copy(solution) for solution in self.problem.sequences]
+        for solution in solution_list:
+            solution.invalidate_column_scores()
+
+        evaluator = MultiprocessEvaluator(processes=2)
+        try:
+            evaluator.evaluate(solution_list, self.problem)
+        finally:
+            evaluator.close()
+
+        for solution, expected in zip(solution_list, self.problem.sequences):
+            self.assertEqual(expected.objectives, solution.objectives)
+            self.assertIsNotNone(solution.column_scores)
+
+    def test_should_evaluate_batch_return_the_same_objectives_as_evaluate(self):
+        random.seed(2)
+        mutation = ShiftClosedGapGroupsMutation(probability=1.0)
+        solution_list = [copy.copy(solution) for solution in self.problem.sequences]
+
+        # solutions with and without valid column scores
+        for solution in solution_list[::2]:
+            mutation.execute(solution)
+        solution_list[1].invalidate_column_scores()
+
+        expected_list = [copy.copy(solution) for solution in solution_list]
+        for solution in expected_list:
+            self.problem.evaluate(solution)
+
+        self.problem.evaluate_batch(solution_list)
+
+        for solution, expected in zip(solution_list, expected_list):
+            self.assertEqual(expected.objectives[:3], solution.objectives[:3])
+            self.assertAlmostEqual(expected.objectives[3], solution.objectives[3])
+            self.assertAlmostEqual(expected.objectives[4], solution.objectives[4])
+            self.assertEqual(expected.column_scores.shape, solution.column_scores.shape)
+
+    def test_should_cached_evaluator_restore_the_evaluated_alignment(self):
+        solution = copy.copy(self.problem.sequences[0])
+        # a full of gaps column, removed by the evaluation
+        for gaps_group in solution.gaps_groups:
+            gaps_group[:0] = [0, 0]
+            gaps_group[2:] = [bound + 1 for bound in gaps_group[2:]]
+        solution.merge_gaps_groups()
+        same_solution = copy.copy(solution)
+
+        evaluator = CachedEvaluator(SequentialEvaluator())
+        evaluator.evaluate([solution], self.problem)
+        evaluator.evaluate([same_solution], self.problem)
+
+        self.assertEqual(1, evaluator.hits)
+        self.assertEqual(
+            self.problem.sequences[0].gaps_groups, same_solution.gaps_groups
+        )
+        self.assertEqual(self.problem.sequences[0].objectives, same_solution.objectives)
+        self.assertIsNotNone(same_solution.column_scores)
+
+    def test_should_cached_instance_be_equal_to_the_imported_instance(self):
+        cache_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_path)
+
+        BAliBASE("BB11001", "resources", self.score_list, cache_path=cache_path)
+        problem = BAliBASE(
+            "BB11001", "resources", self.score_list, cache_path=cache_path
+        )
+
+        (cache_file,) = os.listdir(cache_path)
+        with np.load(os.path.join(cache_path, cache_file)) as data:
+            # the ungapped sequences are stored once for all the alignments
+            self.assertEqual(
+                self.problem.sequences[0].variables, data["sequences"].tolist()
+            )
+
+        self.assertEqual(self.problem.identifiers, problem.identifiers)
+        for expected, solution in zip(self.problem.sequences, problem.sequences):
+            self.assertEqual(expected.variables, solution.variables)
+            self.assertEqual(expected.gaps_groups, solution.gaps_groups)
+            self.assertEqual(expected.objectives, solution.objectives)
+
+        solution = problem.sequences[0]
+        problem.evaluate(solution)
+
+        self.assertEqual(self.problem.sequences[0].objectives, solution.objectives)
+
+    def test_should_corrupted_cache_file_be_rebuilt(self):
+        cache_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_path)
+
+        BAliBASE("BB11001", "resources", self.score_list, cache_path=cache_path)
+        (cache_file,) = [
+            os.path.join(cache_path, file) for file in os.listdir(cache_path)
+        ]
+        size = os.path.getsize(cache_file)
+
+        for length in [size // 2, 0]:
+            with open(cache_file, "r+b") as file:
+                file.truncate(length)
+
+            problem = BAliBASE(
+                "BB11001", "resources", self.score_list, cache_path=cache_path
+            )
+
+            self.assertEqual(
+                [solution.objectives for solution in self.problem.sequences],
+                [solution.objectives for solution in problem.sequences],
+            )
+            self.assertEqual([os.path.basename(cache_file)], os.listdir(cache_path))
+            self.assertEqual(size, os.path.getsize(cache_file))
+
+    def test_should_cache_be_invalidated_if_the_scores_change(self):
+        cache_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_path)
+
+        BAliBASE("BB11001", "resources", [SumOfPairs()], cache_path=cache_path)
+        problem = BAliBASE(
+            "BB11001",
+            "resources",
+            [SumOfPairs(substitution_matrix=PAM250(gap_penalty=-4))],
+            cache_path=cache_path,
+        )
+
+        self.assertEqual(2, len(os.listdir(cache_path)))
+        self.assertEqual(
+            BAliBASE(
+                "BB11001",
+                "resources",
+                [SumOfPairs(substitution_matrix=PAM250(gap_penalty=-4))],
+            )
+            .sequences[0]
+            .objectives,
+            problem.sequences[0].objectives,
+        )
+
+    def test_should_cache_be_invalidated_if_the_instance_files_change(self):
+        # the fasta files are read relative to the working directory
+        path = os.path.relpath(tempfile.mkdtemp())
+        cache_path = os.path.join(path, "cache")
+        self.addCleanup(shutil.rmtree, path)
+        for directory in ["bb3_aligned", "bb3_release"]:
+            shutil.copytree(
+                os.path.join("resources", directory, "RV11"),
+                os.path.join(path, directory, "RV11"),
+            )
+
+        BAliBASE("BB11001", path, [SumOfPairs()], cache_path=cache_path)
+        os.utime(os.path.join(path, "bb3_release", "RV11", "BB11001.tfa"), ns=(0, 0))
+        BAliBASE("BB11001", path, [SumOfPairs()], cache_path=cache_path)
+
+        self.assertEqual(2, len(os.listdir(cache_path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
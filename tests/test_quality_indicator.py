@@ -1,8 +1,17 @@
+import itertools
 import os
 import unittest
 import numpy as np
 
-from kapylan.core.quality_indicator import HyperVolume
+from kapylan.core.quality_indicator import (
+    EpsilonIndicator,
+    GenerationalDistance,
+    HyperVolume,
+    InvertedGenerationalDistance,
+    InvertedGenerationalDistancePlus,
+    MonteCarloHyperVolume,
+    WFGHyperVolume,
+)
 from pathlib import Path
 
 
@@ -35,6 +44,213 @@ class HyperVolumeTestCases(unittest.TestCase):
 
         self.assertAlmostEqual(0.666, value, delta=0.001)
 
+    def test_should_hypervolume_of_two_and_three_objectives_match_the_recursive_algorithm(
+        self,
+    ):
+        generator = np.random.default_rng(0)
+
+        for number_of_objectives in [2, 3]:
+            for _ in range(20):
+                front = generator.integers(0, 5, (30, number_of_objectives)).astype(
+                    float
+                )
+                hv = HyperVolume([4.5] * number_of_objectives)
+
+                self.assertAlmostEqual(hv._compute_recursive(front), hv.compute(front))
+
+    def test_should_hypervolume_of_a_four_objective_front_with_ties_match_the_dominated_cells(
+        self,
+    ):
+        generator = np.random.default_rng(0)
+        # unit cells of the grid [0, 3]^4
+        cells = np.array(list(itertools.product(range(3), repeat=4)))
+
+        for _ in range(50):
+            front = generator.integers(0, 3, (30, 4)).astype(float)
+            expected = (
+                (front[None, :, :] <= cells[:, None, :]).all(axis=2).any(axis=1).sum()
+            )
+
+            self.assertAlmostEqual(expected, HyperVolume([3.0] * 4).compute(front))
+
+    def test_should_recursive_algorithm_match_the_dominated_cells_of_a_front_with_ties(
+        self,
+    ):
+        generator = np.random.default_rng(0)
+        # unit cells of the grid [0, 3]^5
+        cells = np.array(list(itertools.product(range(3), repeat=5)))
+        hv = HyperVolume([3.0] * 5)
+
+        for _ in range(20):
+            front = generator.integers(0, 3, (30, 5)).astype(float)
+            expected = (
+                (front[None, :, :] <= cells[:, None, :]).all(axis=2).any(axis=1).sum()
+            )
+
+            self.assertAlmostEqual(expected, hv._compute_recursive(front))
+            self.assertAlmostEqual(expected, hv._compute_recursive(front[::-1]))
+
+    def test_should_hypervolume_ignore_the_points_not_dominating_the_reference_point(
+        self,
+    ):
+        front = np.array([[0.5, 0.5], [3.0, 0.0], [1.0, 1.0]])
+
+        self.assertEqual(0.25, HyperVolume([1.0, 1.0]).compute(front))
+        self.assertEqual(0.0, HyperVolume([1.0, 1.0, 1.0]).compute(np.array([])))
+
+
+class WFGHyperVolumeTestCases(unittest.TestCase):
+    def test_should_hypervolume_return_5_0(self):
+        front = np.array([[1, 0, 1], [0, 1, 0]])
+
+        self.assertEqual(5.0, WFGHyperVolume([2, 2, 2]).compute(front))
+
+    def test_should_hypervolume_match_the_recursive_algorithm(self):
+        generator = np.random.default_rng(0)
+
+        for number_of_objectives in [4, 5, 6]:
+            front = generator.random((20, number_of_objectives))
+            reference_point = [1.1] * number_of_objectives
+
+            self.assertAlmostEqual(
+                HyperVolume(reference_point)._compute_recursive(front),
+                WFGHyperVolume(reference_point).compute(front),
+            )
+
+    def test_should_hypervolume_of_a_front_with_ties_match_the_dominated_cells(self):
+        generator = np.random.default_rng(0)
+        number_of_objectives = 5
+        front = generator.integers(0, 3, (30, number_of_objectives)).astype(float)
+
+        # unit cells of the grid [0, 3]^5 dominated by some point of the front
+        cells = np.array(list(itertools.product(range(3), repeat=number_of_objectives)))
+        expected = (
+            (front[None, :, :] <= cells[:, None, :]).all(axis=2).any(axis=1).sum()
+        )
+
+        self.assertAlmostEqual(
+            expected, WFGHyperVolume([3.0] * number_of_objectives).compute(front)
+        )
+
+
+class MonteCarloHyperVolumeTestCases(unittest.TestCase):
+    def setUp(self):
+        generator = np.random.default_rng(0)
+        front = generator.random((50, 4))
+        self.front = front / np.linalg.norm(front, axis=1, keepdims=True)
+        self.reference_point = [1.1] * 4
+
+    def test_should_estimate_be_close_to_the_exact_hypervolume(self):
+        hv = MonteCarloHyperVolume(self.reference_point, seed=1)
+        value, standard_error = hv.compute_with_error(self.front)
+
+        self.assertGreater(standard_error, 0.0)
+        self.assertAlmostEqual(
+            WFGHyperVolume(self.reference_point).compute(self.front),
+            value,
+            delta=4 * standard_error,
+        )
+
+    def test_should_estimate_be_reproducible_with_the_same_seed(self):
+        self.assertEqual(
+            MonteCarloHyperVolume(self.reference_point, seed=1).compute(self.front),
+            MonteCarloHyperVolume(self.reference_point, seed=1).compute(self.front),
+        )
+
+    def test_should_estimate_be_reproducible_with_the_default_arguments(self):
+        hv = MonteCarloHyperVolume(self.reference_point)
+
+        self.assertEqual(hv.compute(self.front), hv.compute(self.front))
+        self.assertEqual(
+            hv.compute(self.front),
+            MonteCarloHyperVolume(self.reference_point).compute(self.front),
+        )
+
+    def test_should_sampling_stop_when_the_confidence_interval_is_reached(self):
+        hv = MonteCarloHyperVolume(
+            self.reference_point,
+            number_of_samples=10**6,
+            confidence_interval=0.01,
+            batch_size=1000,
+            seed=1,
+        )
+        hv.compute(self.front)
+
+        self.assertLess(hv.samples, 10**6)
+        self.assertLessEqual(1.96 * hv.standard_error, 0.01)
+
+    def test_should_estimate_be_zero_if_no_point_dominates_the_reference_point(self):
+        hv = MonteCarloHyperVolume([0.5] * 4, seed=1)
+
+        self.assertEqual((0.0, 0.0), hv.compute_with_error(np.ones((3, 4))))
+
+
+class ReferenceFrontIndicatorsTestCases(unittest.TestCase):
+    def setUp(self):
+        self.reference_front = np.loadtxt(Path("resources/reference_front/", "ZDT1.pf"))
+        self.front = np.random.default_rng(0).random((50, 2))
+
+        # distances between each reference point and each point of the front
+        self.differences = self.front[None, :, :] - self.reference_front[:, None, :]
+        self.distances = np.sqrt((self.differences**2).sum(axis=2))
+
+    def test_should_indicators_of_the_reference_front_be_zero(self):
+        for indicator in [
+            GenerationalDistance,
+            InvertedGenerationalDistance,
+            InvertedGenerationalDistancePlus,
+            EpsilonIndicator,
+        ]:
+            self.assertAlmostEqual(
+                0.0, indicator(self.reference_front).compute(self.reference_front)
+            )
+
+    def test_should_generational_distance_return_the_mean_distance_to_the_reference_front(
+        self,
+    ):
+        self.assertAlmostEqual(
+            self.distances.min(axis=0).mean(),
+            GenerationalDistance(self.reference_front).compute(self.front),
+        )
+
+    def test_should_inverted_generational_distance_return_the_mean_distance_to_the_front(
+        self,
+    ):
+        self.assertAlmostEqual(
+            self.distances.min(axis=1).mean(),
+            InvertedGenerationalDistance(self.reference_front).compute(self.front),
+        )
+
+    def test_should_inverted_generational_distance_plus_only_count_the_worse_objectives(
+        self,
+    ):
+        distances = np.sqrt((np.maximum(self.differences, 0) ** 2).sum(axis=2))
+
+        self.assertAlmostEqual(
+            distances.min(axis=1).mean(),
+            InvertedGenerationalDistancePlus(self.reference_front).compute(self.front),
+        )
+
+    def test_should_epsilon_indicator_return_the_shift_to_dominate_the_reference_front(
+        self,
+    ):
+        self.assertAlmostEqual(
+            0.1,
+            EpsilonIndicator(self.reference_front).compute(self.reference_front + 0.1),
+        )
+
+    def test_should_the_tree_be_reused_until_the_reference_front_changes(self):
+        indicator = GenerationalDistance(self.reference_front)
+        tree = indicator.get_tree()
+        indicator.compute(self.front)
+
+        self.assertIs(tree, indicator.get_tree())
+
+        indicator.reference_front = self.reference_front[:10]
+
+        self.assertIsNot(tree, indicator.get_tree())
+        self.assertEqual(10, indicator.get_tree().n)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,30 @@
+import random
 import unittest
 from kapylan.core.solution import Solution
 
-from kapylan.util.ranking import FastNonDominatedRanking
+from kapylan.util.comparator import DominanceComparator
+from kapylan.util.ranking import FastNonDominatedRanking, NonDominatedSweepRanking
+
+
+class DominanceComparatorSubclass(DominanceComparator):
+    pass
+
+
+def random_solution_list(
+    number_of_solutions: int, number_of_objectives: int, seed: int
+) -> list:
+    generator = random.Random(seed)
+    solution_list = []
+
+    for _ in range(number_of_solutions):
+        solution = Solution(2, number_of_objectives, 1)
+        solution.objectives = [
+            generator.randint(0, 5) for _ in range(number_of_objectives)
+        ]
+        solution.constraints[0] = generator.choice([0, 0, 0, -1, -2])
+        solution_list.append(solution)
+
+    return solution_list
 
 
 class FastNonDominatedRankingTestCases(unittest.TestCase):
@@ -162,6 +185,105 @@ class FastNonDominatedRankingTestCases(unittest.TestCase):
         self.assertEqual(solution, ranking[0][0])
         self.assertEqual(solution2, ranking[1][0])
 
+    def test_should_compute_ranking_return_the_same_fronts_as_comparing_every_pair(
+        self,
+    ):
+        for seed in range(20):
+            solution_list = random_solution_list(40, 1 + seed % 3, seed)
+            ranking = FastNonDominatedRanking(DominanceComparatorSubclass())
+
+            expected = ranking.compute_ranking(solution_list)
+            expected_ranks = [s.attributes["dominance_ranking"] for s in solution_list]
+            subfronts = self.ranking.compute_ranking(solution_list)
+
+            self.assertEqual(
+                [[id(s) for s in front] for front in expected],
+                [[id(s) for s in front] for front in subfronts],
+            )
+            self.assertEqual(
+                expected_ranks,
+                [s.attributes["dominance_ranking"] for s in solution_list],
+            )
+            self.assertEqual(
+                ranking.number_of_comparisons, self.ranking.number_of_comparisons
+            )
+            self.ranking.number_of_comparisons = 0
+
+    def test_should_compute_ranking_return_the_first_subfronts_containing_k_solutions(
+        self,
+    ):
+        solution_list = random_solution_list(40, 2, 0)
+        ranking = FastNonDominatedRanking(DominanceComparatorSubclass())
+
+        self.assertEqual(
+            [
+                [id(s) for s in front]
+                for front in ranking.compute_ranking(solution_list, k=10)
+            ],
+            [
+                [id(s) for s in front]
+                for front in self.ranking.compute_ranking(solution_list, k=10)
+            ],
+        )
+
+
+class NonDominatedSweepRankingTestCases(unittest.TestCase):
+    def setUp(self):
+        self.ranking = NonDominatedSweepRanking()
+
+    def test_should_compute_ranking_of_an_emtpy_solution_list_return_a_empty_list_of_subranks(
+        self,
+    ):
+        self.assertEqual(0, len(self.ranking.compute_ranking([])))
+
+    def test_should_compute_ranking_keep_duplicated_solutions_in_the_same_subfront(
+        self,
+    ):
+        solution = Solution(2, 3)
+        solution.objectives = [1, 2, 3]
+        solution2 = Solution(2, 3)
+        solution2.objectives = [1, 2, 3]
+        solution3 = Solution(2, 3)
+        solution3.objectives = [1, 2, 4]
+
+        ranking = self.ranking.compute_ranking([solution, solution2, solution3])
+
+        self.assertEqual([[solution, solution2], [solution3]], ranking)
+
+    def test_should_compute_ranking_return_the_same_subfronts_as_fast_non_dominated_ranking(
+        self,
+    ):
+        for seed in range(40):
+            solution_list = random_solution_list(40, 1 + seed % 4, seed)
+
+            expected = FastNonDominatedRanking().compute_ranking(solution_list)
+            expected_ranks = [s.attributes["dominance_ranking"] for s in solution_list]
+            subfronts = self.ranking.compute_ranking(solution_list)
+
+            self.assertEqual(
+                [sorted(id(s) for s in front) for front in expected],
+                [sorted(id(s) for s in front) for front in subfronts],
+            )
+            self.assertEqual(
+                expected_ranks,
+                [s.attributes["dominance_ranking"] for s in solution_list],
+            )
+
+    def test_should_compute_ranking_return_the_first_subfronts_containing_k_solutions(
+        self,
+    ):
+        solution_list = random_solution_list(40, 3, 0)
+
+        expected = FastNonDominatedRanking().compute_ranking(solution_list, k=10)
+
+        self.assertEqual(
+            [sorted(id(s) for s in front) for front in expected],
+            [
+                sorted(id(s) for s in front)
+                for front in self.ranking.compute_ranking(solution_list, k=10)
+            ],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,10 +1,11 @@
 import unittest
 
+from kapylan.algorithm.component.replacement.replacement import RemovalPolicyType
 from kapylan.algorithm.component.replacement.impl.RankingAndDensityEstimatorReplacement import (
     RankingAndDensityEstimatorReplacement,
 )
 from kapylan.core.solution import Solution
-from kapylan.util.density_estimator import CrowdingDistance
+from kapylan.util.density_estimator import CrowdingDistance, HypervolumeContribution
 from kapylan.util.ranking import FastNonDominatedRanking
 
 
@@ -141,6 +142,35 @@ class RankingAndDensityEstimatorReplacementTestCases(unittest.TestCase):
         for solution in result_list[5:9]:
             self.assertEqual(1, solution.attributes["dominance_ranking"])
 
+    def test_should_replacement_with_hypervolume_contributions_remove_the_lowest_contribution(
+        self,
+    ):
+        ranking = FastNonDominatedRanking()
+        density_estimator = HypervolumeContribution([6.0, 6.0])
+
+        replacement = RankingAndDensityEstimatorReplacement(
+            ranking, density_estimator, RemovalPolicyType.SEQUENTIAL
+        )
+
+        solution1 = Solution(2, 2)
+        solution1.objectives = [1, 5]
+        solution2 = Solution(2, 2)
+        solution2.objectives = [2, 4.5]
+        solution3 = Solution(2, 2)
+        solution3.objectives = [3, 3]
+        solution4 = Solution(2, 2)
+        solution4.objectives = [5, 1]
+
+        solution_list = [solution1, solution2, solution3]
+        offspring_list = [solution4]
+        result_list = replacement.replace(solution_list, offspring_list)
+
+        self.assertEqual(3, len(result_list))
+        self.assertEqual(
+            [id(solution1), id(solution3), id(solution4)],
+            [id(solution) for solution in result_list],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
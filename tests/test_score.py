@@ -0,0 +1,184 @@
+import random
+import unittest
+
+from kapylan.problem.msa_problem.score import (
+    AlignmentProfile,
+    Entropy,
+    FusedScores,
+    PercentageOfNonGaps,
+    PercentageOfTotallyConservedColumns,
+    Star,
+    SumOfPairs,
+    encode_alignment,
+)
+from kapylan.problem.msa_problem.substitution_matrix import Blosum62, PAM250
+
+
+def random_alignment(number_of_sequences: int, length: int, seed: int = 0) -> list:
+    generator = random.Random(seed)
+    symbols = "ACDEFGHIKLMNPQRSTVWY---"
+
+    return [
+        "".join(generator.choice(symbols) for _ in range(length))
+        for _ in range(number_of_sequences)
+    ]
+
+
+def score_column_by_column(score, align_sequences: list) -> float:
+    return sum(
+        score.get_score_of_k_column([sequence[k] for sequence in align_sequences])
+        for k in range(len(align_sequences[0]))
+    )
+
+
+class SumOfPairsTestCases(unittest.TestCase):
+    def test_should_compute_the_sum_of_pairs_of_a_small_alignment(self):
+        score = SumOfPairs(PAM250())
+
+        self.assertEqual(-40, score.compute(["AB-", "-BB", "A-B"]))
+
+    def test_should_compute_match_the_column_wise_score(self):
+        for substitution_matrix in [PAM250(), Blosum62(gap_penalty=-4)]:
+            score = SumOfPairs(substitution_matrix)
+
+            for seed in range(5):
+                sequences = random_alignment(12, 40, seed)
+
+                self.assertEqual(
+                    score_column_by_column(score, sequences), score.compute(sequences)
+                )
+
+    def test_should_compute_return_the_same_value_with_and_without_column_profiles(
+        self,
+    ):
+        sequences = random_alignment(200, 30)
+
+        self.assertEqual(
+            SumOfPairs(use_column_profiles=False).compute(sequences),
+            SumOfPairs(use_column_profiles=True).compute(sequences),
+        )
+
+    def test_should_get_score_of_k_column_return_the_same_value_with_and_without_column_profiles(
+        self,
+    ):
+        column = list("AAC-D--AWA")
+
+        self.assertEqual(
+            SumOfPairs(use_column_profiles=False).get_score_of_k_column(column),
+            SumOfPairs(use_column_profiles=True).get_score_of_k_column(column),
+        )
+
+    def test_should_compute_return_an_int(self):
+        score = SumOfPairs()
+
+        self.assertIsInstance(score.compute(random_alignment(4, 10)), int)
+
+    def test_should_compute_raise_an_exception_if_a_pair_is_not_in_the_matrix(self):
+        score = SumOfPairs()
+
+        with self.assertRaises(Exception):
+            score.compute(["AJ", "AA"])
+
+    def test_should_compute_ignore_unknown_symbols_that_are_only_compared_with_gaps(
+        self,
+    ):
+        score = SumOfPairs()
+
+        self.assertEqual(2 - 8, score.compute(["AJ", "A-"]))
+
+
+class StarTestCases(unittest.TestCase):
+    def test_should_compute_match_the_column_wise_score(self):
+        for substitution_matrix in [PAM250(), Blosum62(gap_penalty=-4)]:
+            score = Star(substitution_matrix)
+
+            for seed in range(5):
+                sequences = random_alignment(6, 60, seed)
+
+                self.assertEqual(
+                    score_column_by_column(score, sequences), score.compute(sequences)
+                )
+
+    def test_should_compute_compare_with_the_first_of_the_most_frequent_chars(self):
+        score = Star(PAM250())
+
+        self.assertEqual(
+            score.get_score_of_k_column(["W", "C", "C", "W"]),
+            score.compute(["W", "C", "C", "W"]),
+        )
+        self.assertEqual(17 + 17 - 8 - 8, score.compute(["W", "C", "C", "W"]))
+
+    def test_should_compute_raise_an_exception_if_a_pair_is_not_in_the_matrix(self):
+        with self.assertRaises(Exception):
+            Star().compute(["AJ", "AJ"])
+
+
+class EntropyTestCases(unittest.TestCase):
+    def test_should_compute_match_the_column_wise_score(self):
+        score = Entropy()
+
+        for seed in range(5):
+            sequences = random_alignment(10, 50, seed)
+
+            self.assertAlmostEqual(
+                score._evaluate_by_columns(sequences), score.compute(sequences)
+            )
+
+
+class PercentageOfTotallyConservedColumnsTestCases(unittest.TestCase):
+    def test_should_compute_count_the_columns_with_a_single_symbol(self):
+        score = PercentageOfTotallyConservedColumns()
+
+        self.assertEqual(75.0, score.compute(["AB-C", "AC-C"]))
+
+    def test_should_compute_match_the_column_wise_score(self):
+        score = PercentageOfTotallyConservedColumns()
+        sequences = ["AAAA", "AACA", "A-AA"]
+
+        self.assertEqual(
+            score._evaluate_by_columns(sequences), score.compute(sequences)
+        )
+
+
+class AlignmentProfileTestCases(unittest.TestCase):
+    def test_should_profile_an_encoded_alignment(self):
+        sequences = random_alignment(5, 20)
+
+        profile = AlignmentProfile(encode_alignment(sequences))
+        expected = AlignmentProfile(sequences)
+
+        self.assertEqual(expected.counts.tolist(), profile.counts.tolist())
+        self.assertEqual(sequences, profile.sequences)
+
+    def test_should_profile_a_subset_of_the_columns(self):
+        sequences = ["ACDE", "A-DW"]
+
+        profile = AlignmentProfile(sequences, [1, 3])
+
+        self.assertEqual(["CE", "-W"], profile.sequences)
+        self.assertEqual(2, profile.length_of_sequence)
+
+
+class FusedScoresTestCases(unittest.TestCase):
+    def test_should_compute_return_the_value_of_every_score(self):
+        score_list = [
+            SumOfPairs(),
+            Star(Blosum62()),
+            Entropy(),
+            PercentageOfNonGaps(),
+            PercentageOfTotallyConservedColumns(),
+        ]
+        sequences = random_alignment(8, 50)
+
+        values = FusedScores(score_list).compute(sequences)
+
+        for score, value in zip(score_list, values):
+            self.assertAlmostEqual(score.compute(sequences), value)
+
+    def test_should_compute_raise_an_exception_if_the_sequences_are_not_aligned(self):
+        with self.assertRaises(Exception):
+            FusedScores([SumOfPairs()]).compute(["AA", "A"])
+
+
+if __name__ == "__main__":
+    unittest.main()
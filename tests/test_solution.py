@@ -1,16 +1,49 @@
 import copy
+import random
 import unittest
 
+import numpy as np
+
 from kapylan.core.solution import (
     BinarySolution,
     CompositeSolution,
     FloatSolution,
     IntegerSolution,
+    MSASolution,
     Solution,
 )
+from kapylan.problem.msa import MSA
+from kapylan.problem.msa_problem.score import SumOfPairs
 from kapylan.util.checking import InvalidConditionException
 
 
+def create_msa_solution(msa: list) -> MSASolution:
+    problem = MSA([SumOfPairs()])
+    problem.identifiers = [name for name, _ in msa]
+    problem.number_of_variables = len(msa)
+
+    return MSASolution(problem, msa)
+
+
+def decode_by_insertion(encoded_sequence: str, gaps_group: list) -> str:
+    aligned_sequence = list(encoded_sequence)
+
+    for i in range(0, len(gaps_group) - 1, 2):
+        for j in range(gaps_group[i], gaps_group[i + 1] + 1):
+            aligned_sequence.insert(j, "-")
+
+    return "".join(aligned_sequence)
+
+
+def remove_full_of_gaps_columns_one_by_one(solution: MSASolution) -> None:
+    length = solution.get_length_of_alignment()
+    gap_columns = [j for j in range(length) if solution.is_gap_column(j)]
+
+    for col in reversed(gap_columns):
+        for seq_index in range(solution.number_of_variables):
+            solution.remove_gap_from_sequence(seq_index, col)
+
+
 class SolutionTestCase(unittest.TestCase):
     def test_should_default_constructor_create_a_valid_solution(self):
         solution = Solution(2, 3)
@@ -218,5 +251,296 @@ class CompositeSolutionTestCase(unittest.TestCase):
         )
 
 
+class MSASolutionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.solution = create_msa_solution(
+            [("seq1", "A--CDE-"), ("seq2", "A--C-E-"), ("seq3", "AB-CD--")]
+        )
+        self.solution.set_column_scores(np.zeros((1, 7)), "key")
+
+    def test_should_mark_dirty_columns_do_nothing_if_there_are_no_column_scores(self):
+        self.solution.invalidate_column_scores()
+        self.solution.mark_dirty_columns(1, 3)
+
+        self.assertEqual([], self.solution.dirty_columns)
+
+    def test_should_get_dirty_columns_merge_the_ranges_and_clip_them_to_the_alignment(
+        self,
+    ):
+        self.solution.mark_dirty_columns(4, 9)
+        self.solution.mark_dirty_columns(1, 2)
+        self.solution.mark_dirty_columns(2, 4)
+
+        self.assertEqual([1, 2, 3, 4, 5, 6], self.solution.get_dirty_columns())
+
+    def test_should_remove_full_of_gaps_columns_keep_the_column_scores_in_step(self):
+        self.solution.column_scores[0] = np.arange(7)
+        self.solution.mark_dirty_columns(1, 3)
+        self.solution.mark_dirty_columns(6, 6)
+
+        self.solution.remove_full_of_gaps_columns()
+
+        self.assertEqual(
+            ["A-CDE", "A-C-E", "ABCD-"],
+            self.solution.decode_alignment_as_list_of_sequences(),
+        )
+        self.assertEqual([0, 1, 3, 4, 5], list(self.solution.column_scores[0]))
+        self.assertEqual([1, 2], self.solution.get_dirty_columns())
+
+    def test_should_remove_full_of_gaps_columns_match_removing_them_one_by_one(self):
+        generator = random.Random(0)
+
+        for _ in range(50):
+            msa = [
+                (
+                    "seq{0}".format(i),
+                    "".join(generator.choice("AC---") for _ in range(25)),
+                )
+                for i in range(3)
+            ]
+            solution = create_msa_solution(msa)
+            # contiguous groups that have not been merged
+            solution.gaps_groups[0] = [
+                bound
+                for a, b in zip(*[iter(solution.gaps_groups[0])] * 2)
+                for bound in ([a, a, a + 1, b] if a < b else [a, b])
+            ]
+            solution.invalidate_gaps_index(0)
+            expected = copy.deepcopy(solution)
+
+            solution.remove_full_of_gaps_columns()
+            remove_full_of_gaps_columns_one_by_one(expected)
+
+            self.assertEqual(expected.gaps_groups, solution.gaps_groups)
+
+    def test_should_remove_full_of_gaps_columns_work_with_overlapping_groups(self):
+        solution = create_msa_solution([("seq1", "A--C"), ("seq2", "A--C")])
+        solution.gaps_groups = [[1, 2, 2, 2], [1, 2]]
+        expected = copy.deepcopy(solution)
+
+        solution.remove_full_of_gaps_columns()
+        remove_full_of_gaps_columns_one_by_one(expected)
+
+        self.assertEqual(expected.gaps_groups, solution.gaps_groups)
+
+    def test_should_map_positions_between_the_aligned_and_the_original_sequences(
+        self,
+    ):
+        generator = random.Random(0)
+
+        for _ in range(20):
+            msa = [
+                (
+                    "seq{0}".format(i),
+                    "".join(generator.choice("AC--") for _ in range(25)),
+                )
+                for i in range(3)
+            ]
+            solution = create_msa_solution(msa)
+
+            for seq_index, (_, sequence) in enumerate(msa):
+                columns_of_chars = [j for j, char in enumerate(sequence) if char != "-"]
+
+                for j, char in enumerate(sequence):
+                    self.assertEqual(
+                        char == "-", solution.is_gap_char_at_sequence(seq_index, j)
+                    )
+
+                for position, column in enumerate(columns_of_chars):
+                    self.assertEqual(
+                        column,
+                        solution.get_original_char_position_in_aligned_sequence(
+                            seq_index, position
+                        ),
+                    )
+                    self.assertEqual(
+                        position,
+                        solution.get_char_position_in_original_sequence(
+                            seq_index, column
+                        ),
+                    )
+
+                self.assertEqual(
+                    len(sequence),
+                    solution.get_original_char_position_in_aligned_sequence(
+                        seq_index, len(columns_of_chars)
+                    ),
+                )
+
+    def test_should_get_next_char_position_after_gap_return_minus_one_at_the_end(self):
+        self.assertEqual(3, self.solution.get_next_char_position_after_gap(0, 1))
+        self.assertEqual(-1, self.solution.get_next_char_position_after_gap(0, 6))
+
+    def test_should_position_mappings_follow_changes_on_the_gaps_groups(self):
+        self.assertTrue(self.solution.is_gap_char_at_sequence(1, 4))
+        self.assertEqual(2, self.solution.get_char_position_in_original_sequence(1, 5))
+
+        # the operators modify the gaps groups in place
+        self.solution.gaps_groups[1][2:4] = [5, 5]
+        self.solution.invalidate_gaps_index(1)
+
+        self.assertFalse(self.solution.is_gap_char_at_sequence(1, 4))
+        self.assertEqual(6, self.solution.get_next_char_position_after_gap(1, 5))
+        self.assertEqual(2, self.solution.get_char_position_in_original_sequence(1, 4))
+
+    def test_should_position_mappings_follow_the_methods_changing_the_gaps_groups(
+        self,
+    ):
+        generator = random.Random(0)
+        msa = [
+            ("seq{0}".format(i), "".join(generator.choice("AC--") for _ in range(25)))
+            for i in range(3)
+        ]
+        solution = create_msa_solution(msa)
+
+        for _ in range(100):
+            step = generator.randrange(4)
+            length_of_alignment = solution.get_length_of_alignment()
+
+            if step == 0:
+                for i in range(3):
+                    solution.add_gap_to_sequence_at_index(
+                        i, generator.randrange(length_of_alignment)
+                    )
+            elif step == 1:
+                solution.split_gap_column(generator.randrange(length_of_alignment))
+            elif step == 2:
+                solution.merge_gaps_groups()
+            else:
+                solution.remove_full_of_gaps_columns()
+
+            # same gaps groups, without any index built yet
+            expected = copy.copy(solution)
+            expected.gaps_groups = copy.deepcopy(solution.gaps_groups)
+
+            for i in range(3):
+                self.assertEqual(
+                    expected.get_length_of_sequence(i),
+                    solution.get_length_of_sequence(i),
+                )
+                for j in range(solution.get_length_of_sequence(i)):
+                    self.assertEqual(
+                        expected.is_gap_char_at_sequence(i, j),
+                        solution.is_gap_char_at_sequence(i, j),
+                    )
+                    self.assertEqual(
+                        expected.get_char_position_in_original_sequence(i, j),
+                        solution.get_char_position_in_original_sequence(i, j),
+                    )
+                for position in range(len(solution.variables[i])):
+                    self.assertEqual(
+                        expected.get_original_char_position_in_aligned_sequence(
+                            i, position
+                        ),
+                        solution.get_original_char_position_in_aligned_sequence(
+                            i, position
+                        ),
+                    )
+
+    def test_should_setting_the_gaps_groups_reset_the_position_mappings(self):
+        self.assertTrue(self.solution.is_gap_char_at_sequence(0, 6))
+
+        self.solution.gaps_groups = [[1, 2], [1, 2, 4, 4], [2, 2, 5, 6]]
+
+        self.assertFalse(self.solution.is_gap_char_at_sequence(0, 6))
+        self.assertEqual(6, self.solution.get_length_of_alignment())
+
+    def test_should_copy_share_the_sequences_and_copy_the_gaps_groups(self):
+        self.solution.objectives = [1.0]
+        self.solution.attributes["rank"] = 0
+
+        new_solution = copy.copy(self.solution)
+
+        self.assertIs(self.solution.variables[0], new_solution.variables[0])
+        self.assertIs(self.solution.sequences_names, new_solution.sequences_names)
+        self.assertEqual(self.solution.gaps_groups, new_solution.gaps_groups)
+        self.assertEqual([1.0], new_solution.objectives)
+        self.assertEqual({"rank": 0}, new_solution.attributes)
+
+        new_solution.gaps_groups[0].append(9)
+        new_solution.objectives[0] = 2.0
+        new_solution.attributes["rank"] = 1
+
+        self.assertEqual([1, 2, 6, 6], self.solution.gaps_groups[0])
+        self.assertEqual([1.0], self.solution.objectives)
+        self.assertEqual({"rank": 0}, self.solution.attributes)
+
+    def test_should_copy_keep_the_copy_working_on_its_own_gaps_groups(self):
+        self.assertTrue(self.solution.is_gap_char_at_sequence(0, 6))
+
+        new_solution = copy.copy(self.solution)
+        new_solution.gaps_groups[0][2:] = []
+        new_solution.invalidate_gaps_index(0)
+
+        self.assertFalse(new_solution.is_gap_char_at_sequence(0, 6))
+        self.assertTrue(self.solution.is_gap_char_at_sequence(0, 6))
+
+    def test_should_decode_alignment_as_list_of_sequences_match_inserting_the_gaps(
+        self,
+    ):
+        generator = random.Random(0)
+        gaps_groups_list = [
+            [1, 2, 3, 4, 9, 9],
+            [0, 0, 12, 14],
+            [2, 4, 1, 1],
+            [2, 4, 3, 6],
+            [],
+        ]
+
+        for _ in range(20):
+            msa = [
+                (
+                    "seq{0}".format(i),
+                    "".join(generator.choice("AC--") for _ in range(20)),
+                )
+                for i in range(3)
+            ]
+            gaps_groups_list.extend(create_msa_solution(msa).gaps_groups)
+
+        for gaps_group in gaps_groups_list:
+            solution = create_msa_solution([("seq1", "ACDEFGHIKLM")])
+            solution.gaps_groups[0] = gaps_group
+
+            self.assertEqual(
+                decode_by_insertion("ACDEFGHIKLM", gaps_group),
+                solution.decode_sequence_at_index(0),
+            )
+
+    def test_should_decode_alignment_as_matrix_return_the_bytes_of_the_alignment(
+        self,
+    ):
+        expected = np.array(
+            [list(b"A--CDE-"), list(b"A--C-E-"), list(b"AB-CD--")], dtype=np.uint8
+        )
+
+        self.assertEqual(
+            expected.tolist(), self.solution.decode_alignment_as_matrix().tolist()
+        )
+
+        out = np.zeros((3, 7), dtype=np.uint8)
+        self.assertIs(out, self.solution.decode_alignment_as_matrix(out))
+        self.assertEqual(expected.tolist(), out.tolist())
+
+        with self.assertRaises(Exception):
+            self.solution.decode_alignment_as_matrix(np.zeros((3, 6), dtype=np.uint8))
+
+    def test_should_decode_alignment_as_matrix_work_with_overlapping_groups(self):
+        self.solution.gaps_groups[0] = [1, 1, 1, 1, 6, 6]
+        self.solution.invalidate_gaps_index(0)
+
+        self.assertEqual(
+            [
+                list(sequence.encode())
+                for sequence in self.solution.decode_alignment_as_list_of_sequences()
+            ],
+            self.solution.decode_alignment_as_matrix().tolist(),
+        )
+
+    def test_should_add_gap_to_sequence_at_index_invalidate_the_column_scores(self):
+        self.solution.add_gap_to_sequence_at_index(0, 1)
+
+        self.assertIsNone(self.solution.column_scores)
+
+
 if __name__ == "__main__":
     unittest.main()
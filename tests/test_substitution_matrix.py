@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+
+from kapylan.problem.msa_problem.substitution_matrix import (
+    Blosum62,
+    FileMatrix,
+    PAM250,
+)
+
+
+def distance_from_dict(substitution_matrix, char1, char2):
+    if char1 == substitution_matrix.gap_character:
+        return 1 if char2 == char1 else substitution_matrix.gap_penalty
+    elif char2 == substitution_matrix.gap_character:
+        return substitution_matrix.gap_penalty
+
+    matrix = substitution_matrix.get_distance_matrix()
+
+    return (
+        matrix[(char1, char2)] if (char1, char2) in matrix else matrix[(char2, char1)]
+    )
+
+
+class SubstitutionMatrixTestCases(unittest.TestCase):
+    def setUp(self):
+        self.symbols = "ABCDEFGHIKLMNPQRSTVWXYZ-"
+
+    def test_should_get_distance_return_the_values_of_the_matrix(self):
+        for substitution_matrix in [PAM250(), Blosum62(gap_penalty=-4)]:
+            for char1 in self.symbols:
+                for char2 in self.symbols:
+                    self.assertEqual(
+                        distance_from_dict(substitution_matrix, char1, char2),
+                        substitution_matrix.get_distance(char1, char2),
+                    )
+
+    def test_should_get_distance_raise_an_exception_if_the_pair_is_not_in_the_matrix(
+        self,
+    ):
+        with self.assertRaises(Exception):
+            PAM250().get_distance("A", "J")
+
+    def test_should_get_distance_score_unknown_symbols_against_gaps(self):
+        self.assertEqual(-8, PAM250().get_distance("J", "-"))
+
+    def test_should_get_score_array_be_symmetric(self):
+        scores, defined = Blosum62().get_score_array()
+
+        self.assertTrue((scores == scores.T).all())
+        self.assertTrue((defined == defined.T).all())
+
+    def test_should_get_index_map_map_bytes_to_rows_of_the_score_array(self):
+        substitution_matrix = PAM250()
+        index_map = substitution_matrix.get_index_map()
+        scores, _ = substitution_matrix.get_score_array()
+
+        self.assertEqual(256, len(index_map))
+        self.assertEqual(
+            substitution_matrix.get_distance("W", "C"),
+            scores[index_map[ord("W")], index_map[ord("C")]],
+        )
+        self.assertEqual(-8, scores[index_map[ord("-")], index_map[ord("W")]])
+        self.assertEqual(index_map[ord("J")], index_map[ord("O")])
+
+    def test_should_get_distance_use_the_gap_penalty_and_matrix_set_after_the_first_use(
+        self,
+    ):
+        substitution_matrix = PAM250()
+        self.assertEqual(-8, substitution_matrix.get_distance("A", "-"))
+        self.assertEqual(2, substitution_matrix.get_distance("A", "A"))
+
+        substitution_matrix.gap_penalty = -4
+        substitution_matrix.distance_matrix = {
+            **substitution_matrix.distance_matrix,
+            ("A", "A"): 5,
+        }
+
+        self.assertEqual(-4, substitution_matrix.get_distance("A", "-"))
+        self.assertEqual(5, substitution_matrix.get_distance("A", "A"))
+        scores, _ = substitution_matrix.get_score_array()
+        index_map = substitution_matrix.get_index_map()
+        self.assertEqual(-4, scores[index_map[ord("-")], index_map[ord("A")]])
+
+
+class FileMatrixTestCases(unittest.TestCase):
+    def test_should_file_matrix_score_like_a_built_in_matrix(self):
+        symbols = "ARND"
+        pam250 = PAM250()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "PAM250")
+            with open(path, "w") as file:
+                file.write("# partial PAM250 matrix\n")
+                file.write("   " + "  ".join(symbols) + "  *\n")
+                for char1 in symbols:
+                    values = [
+                        str(pam250.get_distance(char1, char2)) for char2 in symbols
+                    ]
+                    file.write(char1 + "  " + "  ".join(values) + "  -8\n")
+
+            substitution_matrix = FileMatrix(path)
+
+        for char1 in symbols + "-":
+            for char2 in symbols + "-":
+                self.assertEqual(
+                    pam250.get_distance(char1, char2),
+                    substitution_matrix.get_distance(char1, char2),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()